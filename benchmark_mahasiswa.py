@@ -0,0 +1,530 @@
+import argparse
+import asyncio
+import builtins
+import gc
+import io
+import json
+import os
+import platform
+import random
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager, redirect_stdout
+from itertools import accumulate
+from statistics import median
+
+from tabulate import tabulate
+
+from data_nilai_mahasiswa import (
+    GENDER_OPTIONS, METHOD_OPTIONS, PROGRAM_LIST, SCHEDULE_OPTIONS, UKURAN_CHUNK, UKURAN_HALAMAN, DataMahasiswa,
+    IndeksNama, PeerRemote, PemindaiParalel, PenyimpananMahasiswa, StatistikMahasiswa, Transaksi, api_hapus,
+    api_query, api_tambah, api_ubah, buka_snapshot, delete_data, format_grid, generate_rows, jalankan_query,
+    lebar_kolom_awal, parse_kondisi, parse_query, ranking, report_data, sinkronkan, tulis_data, tulis_snapshot,
+    validasi_chunk
+)
+from server_mahasiswa import BATAS_BARIS, minta
+
+NAMA_DEPAN = [
+    "Andi", "Budi", "Citra", "Dewi", "Eka", "Fajar", "Gita", "Hari", "Indah", "Joko",
+    "Kartika", "Lestari", "Made", "Nur", "Oki", "Putri", "Rizky", "Sari", "Tono", "Wulan"
+]
+NAMA_BELAKANG = [
+    "Wijaya", "Sutrisno", "Hati", "Pertiwi", "Gunawan", "Santoso", "Pratama", "Saputra",
+    "Halim", "Nugroho", "Siregar", "Hidayat", "Kusuma", "Lubis", "Setiawan", "Utami"
+]
+
+KONSONAN = "bcdghjklmnprstwy"
+VOKAL = "aeiou"
+
+def kata_acak(rng):
+    return "".join(rng.choice(KONSONAN) + rng.choice(VOKAL) + rng.choice(["", "", "n", "r", "s"])
+                   for _ in range(rng.randint(2, 3))).capitalize()
+
+def nama_acak(rng, kosakata, kumulatif):
+    return " ".join(rng.choices(kosakata, cum_weights=kumulatif, k=rng.randint(2, 3)))
+
+def salah_ketik(rng, nama):
+    i = rng.choice([i for i, huruf in enumerate(nama) if huruf != " "])
+    return nama[:i] + rng.choice("aiueokrst") + nama[i + 1:]
+
+def buat_roster(jumlah, seed=0):
+    rng = random.Random(seed)
+    genders = list(GENDER_OPTIONS.values())
+    methods = list(METHOD_OPTIONS.values())
+    schedules = list(SCHEDULE_OPTIONS.values())
+    for i in range(jumlah):
+        yield f"MH{i + 1:07d}", {
+            "nama": f"{rng.choice(NAMA_DEPAN)} {rng.choice(NAMA_BELAKANG)}",
+            "gender": rng.choice(genders),
+            "program": rng.choice(PROGRAM_LIST),
+            "angkatan": rng.randint(2018, 2025),
+            "metode_belajar": rng.choice(methods),
+            "jadwal": rng.choice(schedules),
+            "modul_1": rng.randint(0, 100),
+            "modul_2": rng.randint(0, 100),
+            "modul_3": rng.randint(0, 100)
+        }
+
+def ukur_memori(bangun):
+    gc.collect()
+    tracemalloc.start()
+    hasil = bangun()
+    ukuran = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return hasil, ukuran
+
+def bench_memori(jumlah):
+    hasil = []
+
+    _, ukuran = ukur_memori(lambda: dict(buat_roster(jumlah)))
+    hasil.append(["dict of dict", ukuran])
+
+    _, ukuran = ukur_memori(lambda: DataMahasiswa(buat_roster(jumlah)))
+    hasil.append(["kolom (DataMahasiswa)", ukuran])
+
+    def bangun_dengan_indeks():
+        store = DataMahasiswa(buat_roster(jumlah))
+        store.indeks
+        return store
+
+    _, ukuran = ukur_memori(bangun_dengan_indeks)
+    hasil.append(["kolom + indeks", ukuran])
+    return [[nama, ukuran, ukuran / jumlah] for nama, ukuran in hasil]
+
+def ukur_waktu(fungsi):
+    mulai = time.perf_counter()
+    hasil = fungsi()
+    return hasil, time.perf_counter() - mulai
+
+def bench_startup(daftar_jumlah):
+    rows = []
+    with tempfile.TemporaryDirectory() as folder:
+        for jumlah in daftar_jumlah:
+            path_bin = os.path.join(folder, f"snapshot-{jumlah}.bin")
+            path_jsonl = os.path.join(folder, f"snapshot-{jumlah}.jsonl")
+            tulis_snapshot(path_bin, DataMahasiswa(buat_roster(jumlah)), 0)
+            with open(path_jsonl, "w", encoding="utf-8") as f:
+                for nim, data in buat_roster(jumlah):
+                    f.write(json.dumps([nim, data]) + "\n")
+
+            def buka_mmap():
+                store, _ = buka_snapshot(path_bin)
+                halaman = generate_rows(store, [store.nims[slot] for slot in range(min(20, jumlah))])
+                return store, halaman
+
+            def baca_jsonl():
+                with open(path_jsonl, encoding="utf-8") as f:
+                    return DataMahasiswa(json.loads(baris) for baris in f)
+
+            (store, _), waktu_mmap = ukur_waktu(buka_mmap)
+            nim_tengah = f"MH{jumlah // 2 + 1:07d}"
+            _, waktu_cari = ukur_waktu(lambda: generate_rows(store, [nim_tengah]))
+            _, waktu_jsonl = ukur_waktu(baca_jsonl)
+            rows.append([jumlah, waktu_mmap * 1000, waktu_cari * 1000, waktu_jsonl * 1000])
+    return rows
+
+def perintah_acak(rng, jumlah, nomor_baru):
+    nim = f"MH{rng.randint(1, jumlah):07d}"
+    pilihan = rng.random()
+    if pilihan < 0.5:
+        return f"query --where 'nim={nim}' --format jsonl"
+    if pilihan < 0.7:
+        return f"query --where 'program~{rng.choice(PROGRAM_LIST).split()[0]}' --where 'modul_1>=95' --format jsonl"
+    if pilihan < 0.8:
+        return "rank --by rata_rata --top 10 --format jsonl"
+    if pilihan < 0.95:
+        return f"update {nim} modul_{rng.randint(1, 3)}={rng.randint(0, 100)}"
+    _, data = next(buat_roster(1, seed=nomor_baru))
+    nilai = " ".join(f"'{kolom}={isi}'" for kolom, isi in data.items())
+    return f"add nim=BX{nomor_baru:07d} {nilai}"
+
+async def klien_beban(host, port, jumlah, operasi, seed, latensi, gagal):
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port, limit=BATAS_BARIS)
+    try:
+        for i in range(operasi):
+            perintah = perintah_acak(rng, jumlah, seed * operasi + i)
+            mulai = time.perf_counter()
+            jawaban = await minta(reader, writer, perintah)
+            latensi.append(time.perf_counter() - mulai)
+            if not jawaban["ok"]:
+                gagal.append(jawaban["error"])
+    finally:
+        writer.close()
+
+async def uji_beban(host, port, jumlah, klien, operasi):
+    latensi = []
+    gagal = []
+    mulai = time.perf_counter()
+    await asyncio.gather(*(klien_beban(host, port, jumlah, operasi, seed, latensi, gagal)
+                           for seed in range(klien)))
+    return latensi, gagal, time.perf_counter() - mulai
+
+def bench_server(jumlah, klien, operasi):
+    with tempfile.TemporaryDirectory() as folder:
+        penyimpanan = PenyimpananMahasiswa(folder)
+        penyimpanan.muat(buat_roster(jumlah))
+        penyimpanan.tutup()
+
+        server = subprocess.Popen(
+            [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "server_mahasiswa.py"),
+             "--port", "0"],
+            env=dict(os.environ, DATA_MAHASISWA_DIR=folder), stdout=subprocess.PIPE, text=True
+        )
+        try:
+            host, port = server.stdout.readline().split()[-1].rsplit(":", 1)
+            latensi, gagal, durasi = asyncio.run(uji_beban(host, int(port), jumlah, klien, operasi))
+        finally:
+            server.send_signal(signal.SIGINT)
+            server.wait()
+
+    latensi.sort()
+    return [[jumlah, klien, len(latensi), len(gagal), len(latensi) / durasi,
+             latensi[len(latensi) // 2] * 1000, latensi[int(len(latensi) * 0.99)] * 1000]]
+
+def ubah_acak(data_mahasiswa, jumlah_ubah, seed):
+    rng = random.Random(seed)
+    nims = list(data_mahasiswa)
+    transaksi = Transaksi(data_mahasiswa)
+    for i in range(jumlah_ubah):
+        nim = rng.choice(nims)
+        pilihan = rng.random()
+        if transaksi.record(nim) is None:
+            continue
+        if pilihan < 0.6:
+            transaksi.ubah(nim, f"modul_{rng.randint(1, 3)}", rng.randint(0, 100))
+        elif pilihan < 0.8:
+            transaksi.hapus(nim)
+        else:
+            transaksi.tambah(f"SY{seed:03d}{i:06d}", next(buat_roster(1, seed=seed * jumlah_ubah + i))[1])
+    transaksi.commit()
+
+def bench_sync(jumlah, daftar_ubah):
+    # Dua instance: server di proses lain dan store lokal dengan roster yang sama.
+    with tempfile.TemporaryDirectory() as folder:
+        penyimpanan = PenyimpananMahasiswa(folder)
+        penyimpanan.muat(buat_roster(jumlah))
+        penyimpanan.tutup()
+        ukuran_dump = sum(len(json.dumps(dict(data, nim=nim))) + 1 for nim, data in buat_roster(jumlah))
+
+        server = subprocess.Popen(
+            [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "server_mahasiswa.py"),
+             "--port", "0"],
+            env=dict(os.environ, DATA_MAHASISWA_DIR=folder), stdout=subprocess.PIPE, text=True
+        )
+        rows = []
+        try:
+            host, port = server.stdout.readline().split()[-1].rsplit(":", 1)
+            lokal = DataMahasiswa(buat_roster(jumlah))
+            peer = PeerRemote(host, int(port))
+            try:
+                _, detik = ukur_waktu(lambda: sinkronkan(lokal, peer, 'dorong'))
+                rows.append([jumlah, 0, detik * 1000, 2, 1, 0, peer.byte, ukuran_dump])
+                for seed, jumlah_ubah in enumerate(daftar_ubah, 1):
+                    ubah_acak(lokal, jumlah_ubah, seed)
+                    peer.byte = 0
+                    laporan, detik = ukur_waktu(lambda: sinkronkan(lokal, peer, 'dorong'))
+                    rows.append([jumlah, jumlah_ubah, detik * 1000, laporan["putaran"], laporan["simpul"],
+                                 laporan["dikirim"], peer.byte, ukuran_dump])
+                    if sinkronkan(lokal, peer, 'dorong')["berbeda"]:
+                        raise RuntimeError("Instance belum sama setelah sync")
+            finally:
+                peer.tutup()
+        finally:
+            server.send_signal(signal.SIGINT)
+            server.wait()
+    return rows
+
+def bench_arsip(jumlah, daftar_panas, ulang=5):
+    # Roster 8 angkatan (2018-2025); panas 0 berarti semua angkatan di memori.
+    rows = []
+    with tempfile.TemporaryDirectory() as folder:
+        penyimpanan = PenyimpananMahasiswa(folder, angkatan_panas=0)
+        penyimpanan.muat(buat_roster(jumlah))
+        penyimpanan.tutup()
+        for panas in daftar_panas:
+            penyimpanan = PenyimpananMahasiswa(folder, angkatan_panas=panas, arsip_dimuat=1)
+            _, detik_muat = ukur_waktu(lambda: penyimpanan.muat())
+            penyimpanan.tutup()
+
+            def bangun():
+                store = penyimpanan.muat()
+                store.indeks
+                store.statistik
+                return store
+
+            penyimpanan = PenyimpananMahasiswa(folder, angkatan_panas=panas, arsip_dimuat=1)
+            data_mahasiswa, memori = ukur_memori(bangun)
+            di_memori = len(data_mahasiswa)
+            try:
+                kueri = {
+                    "nama": parse_query("nama ~ wijaya"),
+                    "kriteria": parse_query("program = 'Digital Marketing' AND modul_1 < 50"),
+                }
+                waktu = {nama: ukur_ulang(lambda i: jalankan_query(data_mahasiswa, node), ulang)["median_ms"]
+                         for nama, node in kueri.items()}
+                waktu["stats"] = ukur_ulang(lambda i: StatistikMahasiswa(data_mahasiswa), ulang)["median_ms"]
+                # Bergantian 2018-2020 dengan satu angkatan arsip di memori: setiap query memuat satu segmen.
+                waktu["dingin"] = ukur_ulang(
+                    lambda i: jalankan_query(data_mahasiswa, parse_query(f"angkatan = {2018 + i % 3}")),
+                    ulang)["median_ms"]
+                waktu["hangat"] = ukur_ulang(
+                    lambda i: jalankan_query(data_mahasiswa, parse_query("angkatan = 2020")), ulang)["median_ms"]
+                arsip = os.path.join(folder, "arsip")
+                ukuran = sum(os.path.getsize(os.path.join(arsip, nama)) for nama in os.listdir(arsip)
+                             if nama.endswith(".z")) if os.path.isdir(arsip) else 0
+                rows.append([jumlah, panas, di_memori, detik_muat, memori / 2 ** 20, waktu["nama"],
+                             waktu["kriteria"], waktu["stats"], waktu["dingin"], waktu["hangat"], ukuran])
+            finally:
+                penyimpanan.tutup()
+    return rows
+
+def rss_byte():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+def selisih_rss(awal):
+    gc.collect()
+    akhir = rss_byte()
+    return None if awal is None or akhir is None else akhir - awal
+
+@contextmanager
+def masukan_skrip(masukan):
+    masukan = iter(masukan)
+    input_asli = builtins.input
+
+    def input_skrip(prompt=""):
+        try:
+            return next(masukan)
+        except StopIteration:
+            raise RuntimeError(f"Masukan skrip habis di prompt {prompt!r}") from None
+
+    builtins.input = input_skrip
+    try:
+        with redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        builtins.input = input_asli
+
+def ukur_ulang(fungsi, ulang):
+    waktu = [ukur_waktu(lambda: fungsi(i))[1] for i in range(ulang)]
+    return {"ulang": ulang, "median_ms": median(waktu) * 1000, "min_ms": min(waktu) * 1000}
+
+def bench_suite(jumlah, ulang=5, seed=0):
+    hasil = {}
+    sampel = [f"MH{nomor:07d}" for nomor in random.Random(seed).sample(range(1, jumlah + 1), min(jumlah, ulang * 3))]
+    baru = dict(next(buat_roster(1, seed=seed))[1], nim="")
+
+    gc.collect()
+    awal = rss_byte()
+    data_mahasiswa, detik = ukur_waktu(lambda: DataMahasiswa(buat_roster(jumlah, seed)))
+    hasil["bangun_store"] = {"ulang": 1, "median_ms": detik * 1000, "min_ms": detik * 1000}
+    memori = {"store_byte": selisih_rss(awal)}
+
+    awal = rss_byte()
+    _, detik = ukur_waktu(lambda: data_mahasiswa.indeks)
+    hasil["bangun_indeks"] = {"ulang": 1, "median_ms": detik * 1000, "min_ms": detik * 1000}
+    memori["indeks_byte"] = selisih_rss(awal)
+
+    hasil["generate_rows_halaman"] = ukur_ulang(
+        lambda i: generate_rows(data_mahasiswa, sampel[i::ulang][:UKURAN_HALAMAN]), ulang)
+    halaman = generate_rows(data_mahasiswa, list(data_mahasiswa.keys())[:UKURAN_HALAMAN])
+    hasil["render_halaman"] = ukur_ulang(lambda i: format_grid(halaman, lebar_kolom_awal()), ulang)
+
+    def report(masukan):
+        with masukan_skrip(masukan):
+            report_data(data_mahasiswa)
+
+    hasil["report_seluruh_halaman_1"] = ukur_ulang(lambda i: report(['1', 'q', '7']), ulang)
+    hasil["report_cari_nama"] = ukur_ulang(lambda i: report(['2', '2', 'wijaya', 'q', '7']), ulang)
+    hasil["report_cari_program"] = ukur_ulang(lambda i: report(['2', '4', '1', 'q', '7']), ulang)
+    kondisi = parse_kondisi(["program = 'Digital Marketing' AND (modul_1 < 60 OR angkatan >= 2024)"])
+    hasil["query_lanjutan"] = ukur_ulang(lambda i: api_query(data_mahasiswa, kondisi), ulang)
+    hasil["ranking_top_10"] = ukur_ulang(lambda i: ranking(data_mahasiswa, 'rata_rata', 10), ulang)
+    hasil["statistik_bangun"] = ukur_ulang(lambda i: data_mahasiswa.statistik.hitung_ulang(), 1)
+    hasil["export_csv"] = ukur_ulang(lambda i: tulis_data(data_mahasiswa, io.StringIO(), 'csv'), 1)
+    baris_import = [dict({kolom: str(nilai) for kolom, nilai in data.items()}, nim=f"IM{i:07d}")
+                    for i, (_, data) in enumerate(buat_roster(min(jumlah, UKURAN_CHUNK * 20), seed + 1))]
+    hasil["validasi_import"] = ukur_ulang(
+        lambda i: [validasi_chunk(baris_import[awal:awal + UKURAN_CHUNK], data_mahasiswa, set())
+                   for awal in range(0, len(baris_import), UKURAN_CHUNK)], 1)
+
+    hasil["tambah"] = ukur_ulang(lambda i: api_tambah(data_mahasiswa, dict(baru, nim=f"BX{i:07d}")), ulang)
+    hasil["ubah"] = ukur_ulang(lambda i: api_ubah(data_mahasiswa, sampel[i], {"modul_1": str(i)}), ulang)
+    hasil["hapus_nim"] = ukur_ulang(lambda i: api_hapus(data_mahasiswa, [sampel[ulang + i]]), ulang)
+
+    def hapus_nama(i):
+        nim = sampel[ulang * 2 + i]
+        with masukan_skrip(['2', data_mahasiswa[nim]['nama'], 'q', nim, 'y', '4']):
+            delete_data(data_mahasiswa)
+
+    hasil["hapus_nama"] = ukur_ulang(hapus_nama, ulang)
+
+    def hapus_kriteria(i):
+        with masukan_skrip(['3', '3', '2018', 'q', 'y', '4']):
+            delete_data(data_mahasiswa)
+
+    hasil["hapus_kriteria"] = ukur_ulang(hapus_kriteria, 1)
+    memori["total_byte"] = rss_byte()
+    return hasil, memori
+
+QUERY_PARALEL = [
+    "nama ~ an",
+    "nama ~ wijaya AND modul_1 >= 50",
+    "program ~ data AND (modul_2 < 40 OR angkatan >= 2024)"
+]
+
+def bench_paralel(jumlah, daftar_proses, ulang=3):
+    rows = []
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "snapshot.bin")
+        tulis_snapshot(path, DataMahasiswa(buat_roster(jumlah)), 0)
+        data_mahasiswa, _ = buka_snapshot(path)
+        for proses in daftar_proses:
+            if proses > 1:
+                data_mahasiswa.paralel = PemindaiParalel(proses)
+                # Pemanasan: proses pekerja dibuat dan snapshot dibuka sekali.
+                jalankan_query(data_mahasiswa, parse_query(QUERY_PARALEL[0]))
+            try:
+                for teks in QUERY_PARALEL:
+                    node = parse_query(teks)
+                    waktu = ukur_ulang(lambda i: jalankan_query(data_mahasiswa, node), ulang)
+                    rows.append([jumlah, proses, teks, waktu["median_ms"]])
+                waktu = ukur_ulang(lambda i: StatistikMahasiswa(data_mahasiswa), ulang)
+                rows.append([jumlah, proses, "statistik seluruh roster", waktu["median_ms"]])
+            finally:
+                if data_mahasiswa.paralel is not None:
+                    data_mahasiswa.paralel.tutup()
+                    data_mahasiswa.paralel = None
+    return rows
+
+def bench_fuzzy(jumlah, ulang=100, seed=0):
+    # Nama asli tersusun dari kosakata terbatas dengan frekuensi condong (Zipf), bukan huruf acak.
+    rng = random.Random(seed)
+    kosakata = list({kata_acak(rng) for _ in range(max(100, jumlah // 20))})
+    kumulatif = list(accumulate(1 / peringkat for peringkat in range(1, len(kosakata) + 1)))
+    daftar_nama = [nama_acak(rng, kosakata, kumulatif) for _ in range(jumlah)]
+    indeks = IndeksNama()
+
+    def bangun():
+        for i, nama in enumerate(daftar_nama):
+            indeks.tambah(f"MH{i + 1:07d}", nama)
+
+    _, detik_bangun = ukur_waktu(bangun)
+    waktu = []
+    ketemu = 0
+    for _ in range(ulang):
+        nama = rng.choice(daftar_nama)
+        hasil, detik = ukur_waktu(lambda: indeks.cari(salah_ketik(rng, nama)))
+        waktu.append(detik * 1000)
+        ketemu += any(kandidat == nama.lower() for kandidat, _ in hasil[:5])
+    waktu.sort()
+    return [[jumlah, len(indeks.nims), detik_bangun, median(waktu), waktu[int(len(waktu) * 0.99)], ketemu / ulang]]
+
+def jalankan_suite(daftar_jumlah, ulang, path_json=None, path_banding=None):
+    laporan = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "waktu": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "hasil": {}
+    }
+    for jumlah in daftar_jumlah:
+        hasil, memori = bench_suite(jumlah, ulang)
+        laporan["hasil"][str(jumlah)] = {"operasi": hasil, "memori": memori}
+
+    banding = {}
+    if path_banding:
+        with open(path_banding, encoding="utf-8") as f:
+            banding = json.load(f)["hasil"]
+    for jumlah, isi in laporan["hasil"].items():
+        lama = banding.get(jumlah, {}).get("operasi", {})
+        rows = []
+        for nama, ukuran in isi["operasi"].items():
+            row = [nama, ukuran["median_ms"], ukuran["min_ms"]]
+            if lama:
+                row.append(ukuran["median_ms"] / lama[nama]["median_ms"] if nama in lama else None)
+            rows.append(row)
+        headers = ["Operasi", "Median (ms)", "Min (ms)"] + (["vs lama (x)"] if lama else [])
+        print(f"\nSuite untuk {jumlah} mahasiswa, memori: {isi['memori']}")
+        print(tabulate(rows, headers=headers, tablefmt="grid", floatfmt=".3f"))
+
+    if path_json:
+        with open(path_json, "w", encoding="utf-8") as f:
+            json.dump(laporan, f, indent=2)
+    return laporan
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark data nilai mahasiswa")
+    parser.add_argument("--bench", default="memori",
+                        choices=["memori", "startup", "server", "suite", "paralel", "fuzzy", "sync", "arsip"])
+    parser.add_argument("--jumlah", type=int, nargs="+", default=[100_000])
+    parser.add_argument("--klien", type=int, default=100, help="Jumlah klien simultan (bench server)")
+    parser.add_argument("--operasi", type=int, default=50, help="Operasi per klien (bench server)")
+    parser.add_argument("--ulang", type=int, default=5, help="Pengulangan per operasi (bench suite/paralel/fuzzy)")
+    parser.add_argument("--proses", type=int, nargs="+", default=[1, 2, 4], help="Jumlah proses (bench paralel)")
+    parser.add_argument("--ubah", type=int, nargs="+", default=[1, 10, 100, 1000],
+                        help="Jumlah record yang diubah sebelum tiap sync (bench sync)")
+    parser.add_argument("--panas", type=int, nargs="+", default=[0, 4, 2],
+                        help="Jumlah angkatan terbaru di memori, 0 = semua (bench arsip)")
+    parser.add_argument("--json", help="Simpan hasil suite ke file JSON")
+    parser.add_argument("--banding", help="File JSON hasil suite sebelumnya untuk dibandingkan")
+    args = parser.parse_args()
+
+    if args.bench == "memori":
+        for jumlah in args.jumlah:
+            rows = bench_memori(jumlah)
+            print(f"\nMemori untuk {jumlah} mahasiswa")
+            print(tabulate(rows, headers=["Layout", "Total (byte)", "Byte/mahasiswa"],
+                           tablefmt="grid", floatfmt=".1f"))
+    elif args.bench == "paralel":
+        rows = []
+        for jumlah in args.jumlah:
+            rows += bench_paralel(jumlah, args.proses, args.ulang)
+        print(f"\nScan paralel ({os.cpu_count()} CPU)")
+        print(tabulate(rows, headers=["Jumlah", "Proses", "Operasi", "Median (ms)"], tablefmt="grid", floatfmt=".2f"))
+    elif args.bench == "fuzzy":
+        rows = []
+        for jumlah in args.jumlah:
+            rows += bench_fuzzy(jumlah, max(args.ulang, 100))
+        print("\nPencarian nama fuzzy (query dengan satu salah ketik)")
+        print(tabulate(rows, headers=["Jumlah", "Nama unik", "Bangun (detik)", "p50 (ms)", "p99 (ms)", "Top-5 tepat"],
+                       tablefmt="grid", floatfmt=".2f"))
+    elif args.bench == "sync":
+        rows = []
+        for jumlah in args.jumlah:
+            rows += bench_sync(jumlah, args.ubah)
+        print("\nSync Merkle antar dua proses (baris ubah 0 = sync pertama, termasuk membangun pohon)")
+        print(tabulate(rows, headers=["Jumlah", "Ubah", "Waktu (ms)", "Putaran", "Simpul", "Record dikirim",
+                                      "Byte", "Byte dump penuh"], tablefmt="grid", floatfmt=".2f"))
+    elif args.bench == "arsip":
+        rows = []
+        for jumlah in args.jumlah:
+            rows += bench_arsip(jumlah, args.panas, args.ulang)
+        print("\nPenyimpanan bertingkat per angkatan (median ms; dingin = query angkatan arsip yang belum dimuat)")
+        print(tabulate(rows, headers=["Jumlah", "Panas", "Di memori", "Muat (detik)", "Memori (MB)", "nama ~",
+                                      "Kriteria hapus", "Statistik", "Angkatan dingin", "Angkatan hangat",
+                                      "Arsip (byte)"], tablefmt="grid", floatfmt=".2f"))
+    elif args.bench == "suite":
+        jalankan_suite(args.jumlah, args.ulang, args.json, args.banding)
+    elif args.bench == "server":
+        rows = []
+        for jumlah in args.jumlah:
+            rows += bench_server(jumlah, args.klien, args.operasi)
+        print("\nUji beban server")
+        print(tabulate(rows, headers=["Jumlah", "Klien", "Operasi", "Gagal", "Ops/detik", "p50 (ms)", "p99 (ms)"],
+                       tablefmt="grid", floatfmt=".2f"))
+    else:
+        rows = bench_startup(args.jumlah)
+        print("\nWaktu startup snapshot")
+        print(tabulate(rows, headers=["Jumlah", "mmap + 20 baris (ms)", "Cari 1 NIM (ms)", "Parse JSONL (ms)"],
+                       tablefmt="grid", floatfmt=".2f"))
+
+if __name__ == "__main__":
+    main()
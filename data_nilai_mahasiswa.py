@@ -1,9 +1,39 @@
+import argparse
+import cProfile
+import csv
+import hashlib
+import heapq
+import io
+import json
+import math
+import mmap
+import operator
+import os
+import re
+import shlex
+import shutil
+import socket
+import struct
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import zlib
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter, OrderedDict, deque
+from collections.abc import MutableMapping
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial, wraps
+from itertools import groupby, islice, repeat
+
 from tabulate import tabulate
 
-HEADERS = [
-    "NIM", "Nama", "Gender", "Program", "Angkatan", 
-    "Metode Belajar", "Jadwal", "Modul 1", "Modul 2", "Modul 3"
-]
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 PROGRAM_LIST = [
     "Data Science & Machine Learning",
@@ -20,207 +50,3336 @@ GENDER_OPTIONS = {'1': "Laki - Laki", '2': "Perempuan"}
 METHOD_OPTIONS = {'1': "Online", '2': "On Campus"}
 SCHEDULE_OPTIONS = {'1': "Office Hours", '2': "After Hours"}
 
+class Kolom:
+    __slots__ = ('nama', 'judul', 'pilihan', 'menu', 'minimum', 'maksimum', 'digit', 'nilai', 'default',
+                 'typecode', 'petunjuk', 'pesan', 'valid', '_cepat')
+
+    def __init__(self, nama, judul, pilihan=None, minimum=None, maksimum=None, digit=None, nilai=False,
+                 default=None):
+        self.nama = nama
+        self.judul = judul
+        self.pilihan = list(pilihan) if pilihan is not None else None
+        self.minimum = minimum
+        self.maksimum = maksimum
+        self.digit = digit
+        self.nilai = nilai
+        # Dipakai untuk record yang ditulis sebelum kolom ini ada di skema.
+        if default is None:
+            default = self.pilihan[0] if self.pilihan else minimum if maksimum is not None else ""
+        self.default = default
+        self.menu = None
+        self._cepat = None
+        if self.pilihan is not None:
+            self.menu = {str(i): isi for i, isi in enumerate(self.pilihan, 1)}
+            self.typecode = 'B'
+            self.petunjuk = ""
+            self.pesan = f"{judul.capitalize()} tidak valid"
+            self._cepat = {isi: isi for isi in self.pilihan}
+            self.valid = frozenset(self.pilihan).__contains__
+        elif maksimum is not None:
+            self.typecode = 'B' if maksimum <= 0xFF else 'H'
+            if digit:
+                self.petunjuk = f" ({digit} digit)"
+                self.pesan = f"{judul} harus berupa angka {digit} digit"
+                self._cepat = {f"{angka:0{digit}d}": angka for angka in range(10 ** digit)}
+            else:
+                self.petunjuk = f" ({minimum}-{maksimum})"
+                self.pesan = f"Nilai {nama} harus angka antara {minimum} sampai {maksimum}"
+                self._cepat = {str(angka): angka for angka in range(minimum, maksimum + 1)}
+            self.valid = self._valid_angka
+        else:
+            self.typecode = None
+            self.petunjuk = ""
+            self.pesan = f"{judul} hanya boleh berisi huruf"
+            self.valid = validate_alpha_only
+
+    def _valid_angka(self, teks):
+        if teks in self._cepat:
+            return True
+        if not teks.isdecimal():
+            return False
+        if self.digit:
+            return len(teks) == self.digit
+        return self.minimum <= int(teks) <= self.maksimum
+
+    def parse_satu(self, teks):
+        if self._cepat is not None:
+            nilai = self._cepat.get(teks)
+            if nilai is not None:
+                return nilai
+        if not self.valid(teks):
+            return None
+        return int(teks) if self.maksimum is not None else teks
+
+    def parse(self, teks):
+        nilai = self.parse_satu(str(teks).strip())
+        if nilai is None:
+            raise ValueError(self.pesan)
+        return nilai
+
+    def parse_banyak(self, daftar_teks):
+        # Satu kolom sekaligus: bentuk kanonik cukup dicari di tabel lewat map (tanpa
+        # pemanggilan Python per sel), sisanya baru divalidasi satu per satu.
+        daftar_teks = strip_semua(daftar_teks)
+        if self._cepat is None:
+            return [teks if self.valid(teks) else None for teks in daftar_teks]
+        hasil = list(map(self._cepat.get, daftar_teks))
+        for i, nilai in enumerate(hasil):
+            if nilai is None:
+                hasil[i] = self.parse_satu(daftar_teks[i])
+        return hasil
+
+    def lebar(self):
+        if self.pilihan is not None:
+            return max([len(self.judul)] + [len(isi) for isi in self.pilihan])
+        if self.maksimum is not None:
+            return max(len(self.judul), self.digit or len(str(self.maksimum)))
+        return len(self.judul)
 
 def validate_alpha_only(value):
-    if not value.strip():
-        return False
-    if not value.replace(" ", "").isalpha():
-        return False
-    return True
-
-def validate_not_empty(input_str):
-    return input_str != ""
+    return value.replace(" ", "").isalpha()
+
+def strip_semua(daftar_teks):
+    try:
+        return list(map(str.strip, daftar_teks))
+    except TypeError:
+        return ["" if teks is None else str(teks).strip() for teks in daftar_teks]
+
+SKEMA = [
+    Kolom('nama', "Nama"),
+    Kolom('gender', "Gender", pilihan=GENDER_OPTIONS.values()),
+    Kolom('program', "Program", pilihan=PROGRAM_LIST),
+    Kolom('angkatan', "Angkatan", minimum=0, maksimum=9999, digit=4),
+    Kolom('metode_belajar', "Metode Belajar", pilihan=METHOD_OPTIONS.values()),
+    Kolom('jadwal', "Jadwal", pilihan=SCHEDULE_OPTIONS.values()),
+    Kolom('modul_1', "Modul 1", minimum=0, maksimum=100, nilai=True),
+    Kolom('modul_2', "Modul 2", minimum=0, maksimum=100, nilai=True),
+    Kolom('modul_3', "Modul 3", minimum=0, maksimum=100, nilai=True)
+]
+SKEMA_KOLOM = {kolom.nama: kolom for kolom in SKEMA}
+
+HEADERS = ["NIM"] + [kolom.judul for kolom in SKEMA]
+KOLOM_KODE = {kolom.nama: kolom.pilihan for kolom in SKEMA if kolom.pilihan is not None}
+KOLOM_NILAI = [kolom.nama for kolom in SKEMA if kolom.nilai]
+KOLOM_DATA = [kolom.nama for kolom in SKEMA]
+KOLOM_KATEGORI = [kolom.nama for kolom in SKEMA if kolom.typecode and not kolom.nilai]
+KOLOM_TEKS = ['nim'] + [kolom.nama for kolom in SKEMA if not kolom.typecode]
+KOLOM_ARRAY = [kolom.nama for kolom in SKEMA if kolom.typecode]
+PANJANG_NGRAM = 3
+AMBANG_FUZZY = 0.6
+AMBANG_GRAM = 0.4
+BATAS_FUZZY = 20
+KANDIDAT_FUZZY = 50
+UKURAN_BLOK_NIM = 1024
+NIM_MAKS = "\U0010ffff"
+
+def lengkapi_record(data):
+    return {kolom.nama: data[kolom.nama] if kolom.nama in data else kolom.default for kolom in SKEMA}
+
+DATA_AWAL = {
+    "MH001": {
+        "nama": "Andi Wijaya", "gender": "Laki - Laki", "program": "Data Science & Machine Learning",
+        "angkatan": 2021, "metode_belajar": "Online", "jadwal": "After Hours",
+        "modul_1": 85, "modul_2": 90, "modul_3": 88
+    },
+    "MH002": {
+        "nama": "Budi Sutresno", "gender": "Laki - Laki", "program": "Business & Data Analyst",
+        "angkatan": 2022, "metode_belajar": "On Campus", "jadwal": "Office Hours",
+        "modul_1": 78, "modul_2": 80, "modul_3": 75
+    },
+    "MH003": {
+        "nama": "Citra Hati", "gender": "Perempuan", "program": "Product Management",
+        "angkatan": 2020, "metode_belajar": "Online", "jadwal": "After Hours",
+        "modul_1": 88, "modul_2": 92, "modul_3": 90
+    },
+    "MH004": {
+        "nama": "Dewi Pertiwi", "gender": "Perempuan", "program": "Digital Marketing",
+        "angkatan": 2023, "metode_belajar": "On Campus", "jadwal": "Office Hours",
+        "modul_1": 70, "modul_2": 72, "modul_3": 68
+    },
+    "MH005": {
+        "nama": "Eka Gunting", "gender": "Laki - Laki", "program": "Fullstack Web Development",
+        "angkatan": 2024, "metode_belajar": "Online", "jadwal": "After Hours",
+        "modul_1": 90, "modul_2": 85, "modul_3": 87
+    },
+    "MH006": {
+        "nama": "Fajar Baru", "gender": "Laki - Laki", "program": "Visual & UI/UX Design",
+        "angkatan": 2021, "metode_belajar": "On Campus", "jadwal": "Office Hours",
+        "modul_1": 60, "modul_2": 65, "modul_3": 70
+    },
+    "MH007": {
+        "nama": "Gita Bandung", "gender": "Perempuan", "program": "3D & Animation",
+        "angkatan": 2025, "metode_belajar": "Online", "jadwal": "After Hours",
+        "modul_1": 95, "modul_2": 93, "modul_3": 97
+    },
+    "MH008": {
+        "nama": "Hari Pustaka", "gender": "Laki - Laki", "program": "UI/UX & Front End Development",
+        "angkatan": 2022, "metode_belajar": "On Campus", "jadwal": "Office Hours",
+        "modul_1": 75, "modul_2": 78, "modul_3": 74
+    },
+    "MH009": {
+        "nama": "Indah Wijaya", "gender": "Perempuan", "program": "Digital Marketing",
+        "angkatan": 2020, "metode_belajar": "Online", "jadwal": "After Hours",
+        "modul_1": 82, "modul_2": 88, "modul_3": 85
+    },
+    "MH010": {
+        "nama": "Joko Widodo", "gender": "Laki - Laki", "program": "Business & Data Analyst",
+        "angkatan": 2023, "metode_belajar": "On Campus", "jadwal": "Office Hours",
+        "modul_1": 68, "modul_2": 70, "modul_3": 65
+    }
+}
+DATA_AWAL = {nim: lengkapi_record(data) for nim, data in DATA_AWAL.items()}
+
+SNAPSHOT_MAGIC = b"MHSNAP01"
+SNAPSHOT_HEADER = struct.Struct("<8sQQHHI1s")
+KOLOM_SNAPSHOT_LAMA = [['angkatan', 'H'], ['gender', 'B'], ['program', 'B'], ['metode_belajar', 'B'], ['jadwal', 'B'],
+                       ['modul_1', 'B'], ['modul_2', 'B'], ['modul_3', 'B']]
+EKSTENSI_FILE = {"snapshot": ".bin", "wal": ".jsonl"}
+FILE_PERUBAHAN = "perubahan.jsonl"
+FILE_PARTISI = "partisi.json"
+FOLDER_ARSIP = "arsip"
+FILE_ARSIP = "arsip.json"
+
+DIMENSI_STATISTIK = ['program', 'angkatan', 'jadwal', 'gender', 'metode_belajar']
+NILAI_LULUS = 70
+RENTANG_DISTRIBUSI = [(0, 59), (60, 69), (70, 79), (80, 89), (90, 100)]
+KUNCI_RANKING = KOLOM_NILAI + ['rata_rata']
+
+KOLOM_FILE = ['nim'] + KOLOM_DATA
+KOLOM_ANGKA = [kolom.nama for kolom in SKEMA if kolom.maksimum is not None]
+OPERATOR_QUERY = {
+    '=': operator.eq, '!=': operator.ne, '<': operator.lt, '<=': operator.le,
+    '>': operator.gt, '>=': operator.ge, '~': None
+}
+KATA_QUERY = {'and': 'and', 'dan': 'and', 'or': 'or', 'atau': 'or'}
+TOKEN_QUERY = re.compile(
+    r"""\s*(?:(?P<kutip>"[^"]*"|'[^']*')|(?P<op><=|>=|!=|=|<|>|~)|(?P<kurung>[()])|(?P<kata>[^\s()<>=!~"']+))"""
+)
+UKURAN_CHUNK = 5000
+BATAS_UNDO = 20
+BATAS_PARALEL = 50000
+SHARD_PER_PROSES = 4
+RASIO_SCAN_PARALEL = 0.1
+RASIO_DELTA_PARALEL = 0.02
+PROSES_DEFAULT = int(os.environ.get("DATA_MAHASISWA_PROSES", "1"))
+UKURAN_HALAMAN = 20
+BATAS_CACHE_BARIS = 4096
+FANOUT_MERKLE = 16
+UKURAN_BUCKET_MERKLE = 64
+ARAH_SYNC = ('gabung', 'tarik', 'dorong')
+OP_ARSIP = ('arsip', 'pulih')
+ANGKATAN_PANAS_DEFAULT = int(os.environ.get("DATA_MAHASISWA_ANGKATAN_PANAS", "0"))
+ARSIP_DIMUAT_DEFAULT = int(os.environ.get("DATA_MAHASISWA_ARSIP_DIMUAT", "2"))
+
+FOLDER_DATA = os.environ.get(
+    "DATA_MAHASISWA_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data_mahasiswa")
+)
 
-def validate_nim(input_str, existing_nims):
-    return input_str and input_str.upper() not in existing_nims
+MODE_PROFIL = {'waktu', 'cprofile', 'tracemalloc'}
+PROFIL_DEFAULT = os.environ.get("DATA_MAHASISWA_PROFIL", "")
+FILE_PROFIL_DEFAULT = os.environ.get("DATA_MAHASISWA_PROFIL_FILE", "profil_mahasiswa.json")
+INTERVAL_PROFIL_DEFAULT = float(os.environ.get("DATA_MAHASISWA_PROFIL_INTERVAL", "60"))
+BATAS_SAMPEL_PROFIL = 10000
+INSTRUMEN = None
+
+
+class Instrumen:
+    def __init__(self, path, mode, interval=INTERVAL_PROFIL_DEFAULT):
+        self.path = path
+        self.mode = mode
+        self.interval = interval
+        self.data = {}
+        self._kunci = threading.Lock()
+        self._berhenti = threading.Event()
+        self._penjaga = None
+        self._profiler = None
+
+    def _entri(self, nama):
+        entri = self.data.get(nama)
+        if entri is None:
+            entri = self.data[nama] = {'panggil': 0, 'total': 0.0, 'waktu': deque(maxlen=BATAS_SAMPEL_PROFIL),
+                                       'dipindai': 0, 'hasil': 0}
+        return entri
+
+    def catat(self, nama, detik, hasil=None):
+        with self._kunci:
+            entri = self._entri(nama)
+            entri['panggil'] += 1
+            entri['total'] += detik
+            entri['waktu'].append(detik)
+            if hasil is not None:
+                entri['hasil'] += hasil
+
+    def hitung(self, nama, dipindai=0, hasil=0):
+        with self._kunci:
+            entri = self._entri(nama)
+            entri['dipindai'] += dipindai
+            entri['hasil'] += hasil
+
+    def ringkasan(self):
+        rows = []
+        with self._kunci:
+            for nama, entri in sorted(self.data.items()):
+                waktu = sorted(entri['waktu'])
+                rows.append({
+                    'nama': nama,
+                    'panggil': entri['panggil'],
+                    'total_ms': entri['total'] * 1000,
+                    'rata_ms': entri['total'] / entri['panggil'] * 1000 if entri['panggil'] else 0.0,
+                    'p95_ms': waktu[int(len(waktu) * 0.95)] * 1000 if waktu else 0.0,
+                    'dipindai': entri['dipindai'],
+                    'hasil': entri['hasil']
+                })
+        return rows
+
+    def simpan(self):
+        laporan = {'waktu': time.strftime("%Y-%m-%dT%H:%M:%S"), 'operasi': self.ringkasan()}
+        if 'tracemalloc' in self.mode and tracemalloc.is_tracing():
+            sekarang, puncak = tracemalloc.get_traced_memory()
+            laporan['memori'] = {
+                'sekarang_byte': sekarang,
+                'puncak_byte': puncak,
+                'teratas': [str(statistik) for statistik in tracemalloc.take_snapshot().statistics("lineno")[:20]]
+            }
+        sementara = self.path + ".tmp"
+        with open(sementara, "w", encoding="utf-8") as f:
+            json.dump(laporan, f, indent=2)
+        os.replace(sementara, self.path)
+
+    def _simpan_berkala(self):
+        while not self._berhenti.wait(self.interval):
+            self.simpan()
+
+    def mulai(self):
+        if 'cprofile' in self.mode:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        if 'tracemalloc' in self.mode:
+            tracemalloc.start()
+        if self.interval > 0:
+            self._penjaga = threading.Thread(target=self._simpan_berkala, daemon=True)
+            self._penjaga.start()
+
+    def selesai(self):
+        self._berhenti.set()
+        if self._profiler is not None:
+            self._profiler.disable()
+            self._profiler.dump_stats(os.path.splitext(self.path)[0] + ".pstats")
+        self.simpan()
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        rows = [[row['nama'], row['panggil'], row['total_ms'], row['rata_ms'], row['p95_ms'],
+                 row['dipindai'], row['hasil']] for row in self.ringkasan()]
+        print(tabulate(rows, headers=["Operasi", "Panggil", "Total (ms)", "Rata-rata (ms)", "p95 (ms)",
+                                      "Dipindai", "Hasil"], tablefmt="grid", floatfmt=".3f"),
+              file=sys.stderr)
+        print(f"Profil disimpan di {self.path}", file=sys.stderr)
+
+def aktifkan_instrumen(mode=PROFIL_DEFAULT, path=FILE_PROFIL_DEFAULT, interval=INTERVAL_PROFIL_DEFAULT):
+    global INSTRUMEN
+    mode = {'waktu' if bagian == '1' else bagian for bagian in mode.replace(" ", "").lower().split(",") if bagian}
+    if not mode:
+        return None
+    if not mode <= MODE_PROFIL:
+        raise ValueError(f"Mode profil {', '.join(sorted(mode - MODE_PROFIL))} tidak dikenal")
+    INSTRUMEN = Instrumen(path, mode, interval)
+    INSTRUMEN.mulai()
+    return INSTRUMEN
+
+def matikan_instrumen():
+    global INSTRUMEN
+    if INSTRUMEN is not None:
+        instrumen, INSTRUMEN = INSTRUMEN, None
+        instrumen.selesai()
+
+def diukur(nama, hitung_hasil=False):
+    def dekorator(fungsi):
+        @wraps(fungsi)
+        def pembungkus(*args, **kwargs):
+            if INSTRUMEN is None:
+                return fungsi(*args, **kwargs)
+            mulai = time.perf_counter()
+            hasil = fungsi(*args, **kwargs)
+            INSTRUMEN.catat(nama, time.perf_counter() - mulai, len(hasil) if hitung_hasil else None)
+            return hasil
+        return pembungkus
+    return dekorator
+
+def hitung(nama, dipindai=0, hasil=0):
+    if INSTRUMEN is not None:
+        INSTRUMEN.hitung(nama, dipindai, hasil)
+
+
+def validate_nim(input_str, data_mahasiswa):
+    return input_str and not data_mahasiswa.ada(input_str.upper())
 
 def validate_digit_range(input_str, min_val, max_val):
     return input_str.isdigit() and min_val <= int(input_str) <= max_val
 
-def validate_four_digits(input_str):
-    return input_str.isdigit() and len(input_str) == 4
-
-def validate_modul_score(input_str):
-    return input_str.isdigit() and 0 <= int(input_str) <= 100
-
 def validate_yes_no(input_str):
     return input_str.lower() in ['y', 'n']
 
-def get_table_width(rows, headers=None, tablefmt="simple", colalign=None):
-    if headers is None:
-        headers = []
-    if colalign is None:
-        colalign = ['center'] * len(headers) if headers else []
-    
-    table_str = tabulate(rows, headers=headers, tablefmt=tablefmt, colalign=colalign)
-    return max(len(line) for line in table_str.splitlines())
+@lru_cache(maxsize=256)
+def render_menu(title, menu_table, header):
+    table_str = tabulate(menu_table, headers=list(header), tablefmt="grid", colalign=("center", "center"))
+    table_width = max(len(line) for line in table_str.splitlines())
+    centered_title = f"===== {title} =====".center(table_width)
+    return "\n".join(["\n" + centered_title, table_str, "=" * table_width])
 
+@diukur("render.menu")
 def display_menu(title, menu_items, header=("No.", "Pilihan")):
-    menu_table = []
-    for i, item in enumerate(menu_items, 1):
-        menu_table.append([i, item])
-    
-    table_width = get_table_width(menu_table, headers=[header[0], header[1]], tablefmt="grid", colalign=("center", "center"))
-    
-    centered_title = f"===== {title} =====".center(table_width)
-    
-    print("\n" + centered_title)
-    print(tabulate(menu_table, headers=[header[0], header[1]], tablefmt="grid", colalign=("center", "center")))
-    print("=" * table_width)
-
-def tampilkan_data(rows):
-    if rows:
-        table_width = get_table_width(rows, headers=HEADERS, tablefmt="grid", colalign=['center'] * len(HEADERS))
-        print("\n" + "===== Data Mahasiswa =====".center(table_width))
-        print(tabulate(rows, headers=HEADERS, tablefmt="grid", colalign=['center'] * len(HEADERS)))
-    else:
+    menu_table = tuple(enumerate(menu_items, 1))
+    print(render_menu(title, menu_table, tuple(header)))
+
+def lebar_kolom_awal():
+    return [len(HEADERS[0])] + [kolom.lebar() for kolom in SKEMA]
+
+def lebar_header():
+    return [len(judul) + 2 for judul in HEADERS]
+
+def tengah(teks, lebar):
+    kiri = (lebar - len(teks)) // 2
+    return " " * kiri + teks.ljust(lebar - kiri)
+
+@lru_cache(maxsize=BATAS_CACHE_BARIS)
+def format_baris(sel, lebar):
+    return "|" + "|".join(f" {tengah(str(nilai), w)} " for nilai, w in zip(sel, lebar)) + "|"
+
+@diukur("render.tabel")
+def format_grid(rows, lebar):
+    rows = [tuple(row) for row in rows]
+    for i, kolom in enumerate(zip(*rows)):
+        lebar[i] = max(lebar[i], max(map(len, map(str, kolom))))
+    kunci = tuple(lebar)
+    garis = "+" + "+".join("-" * (w + 2) for w in lebar) + "+"
+    format_sel = format_baris if len(rows) <= BATAS_CACHE_BARIS else format_baris.__wrapped__
+    baris = [garis, format_sel(tuple(HEADERS), kunci), garis.replace("-", "=")]
+    for row in rows:
+        baris.append(format_sel(row, kunci))
+        baris.append(garis)
+    return "\n".join(baris)
+
+def tampilkan_data(rows, ukuran_halaman=UKURAN_HALAMAN):
+    rows = iter(rows)
+    berikut = list(islice(rows, ukuran_halaman))
+    if not berikut:
         print("Data tidak ditemukan berdasarkan kriteria pencarian!")
+        return
 
-def display_options(title, options):
-    menu_table = []
+    lebar = None
+    halaman = []
+    nomor = 0
+    while True:
+        if nomor == len(halaman):
+            halaman.append(berikut)
+            berikut = list(islice(rows, ukuran_halaman))
+        if lebar is None:
+            lebar = lebar_kolom_awal() if berikut else lebar_header()
+        table_str = format_grid(halaman[nomor], lebar)
+        table_width = len(table_str.splitlines()[0])
+        print("\n" + "===== Data Mahasiswa =====".center(table_width))
+        print(table_str)
+        if len(halaman) == 1 and not berikut:
+            return
 
-    if isinstance(options, dict):
-        for key, value in options.items():
-            menu_table.append([key, value])
-    else:
-        for i, option in enumerate(options, 1):
-            menu_table.append([i, option])
+        terakhir = not berikut and nomor == len(halaman) - 1
+        keterangan = f" dari {len(halaman)}" if not berikut else ""
+        print(f"Halaman {nomor + 1}{keterangan}".center(table_width))
+        pilih = input("[N] Berikutnya  [P] Sebelumnya  [Q] Selesai: ").strip().lower()
+        if pilih == 'n':
+            if terakhir:
+                print("Sudah di halaman terakhir.")
+            else:
+                nomor += 1
+        elif pilih == 'p':
+            if nomor == 0:
+                print("Sudah di halaman pertama.")
+            else:
+                nomor -= 1
+        elif pilih == 'q':
+            return
+        else:
+            print("Pilihan tidak valid! Masukkan N, P atau Q.")
 
-    headers = ["No.", "Deskripsi"]
+def tampilkan_kemiripan(data_dict, hasil, batas=5):
+    skor_nama = {}
+    for nim, skor in hasil:
+        skor_nama.setdefault(data_dict[nim]["nama"], skor)
+    daftar = [f"{nama} ({skor:.0%})" for nama, skor in islice(skor_nama.items(), batas)]
+    print("\nNama paling mirip: " + ", ".join(daftar))
 
-    table_width = get_table_width(menu_table, headers=headers, tablefmt="grid", colalign=("center", "center"))
+@diukur("render.menu")
+def display_options(title, options):
+    if isinstance(options, dict):
+        menu_table = tuple(options.items())
+    else:
+        menu_table = tuple(enumerate(options, 1))
+    print(render_menu(title, menu_table, ("No.", "Deskripsi")))
 
-    centered_title = f"===== {title} =====".center(table_width)
+@diukur("input.tunggu")
+def baca_input(prompt):
+    return input(prompt).strip()
 
-    print("\n" + centered_title)
-    print(tabulate(menu_table, headers=headers, tablefmt="grid", colalign=("center", "center")))
-    print("=" * table_width)
+@diukur("validasi.input")
+def cek_input(val, validator):
+    return validator(val)
 
-def input_valid(prompt, validator, error_msg, existing_nims=None, min_val=None, max_val=None):
+def input_valid(prompt, validator, error_msg):
     while True:
-        val = input(prompt).strip()
-        if validator == validate_nim:
-            if validate_nim(val, existing_nims):
-                return val.upper()
-        elif validator == validate_digit_range:
-            if validate_digit_range(val, min_val, max_val):
-                return val
-        elif validator(val):
+        val = baca_input(prompt)
+        if cek_input(val, validator):
             return val
         print(f"{error_msg}!")
 
 def input_pilihan(prompt, pilihan_dict):
     display_options(prompt, pilihan_dict)
     while True:
-        pilih = input("Masukkan pilihan: ").strip()
+        pilih = baca_input("Masukkan pilihan: ")
         if pilih in pilihan_dict:
             return pilihan_dict[pilih]
         print("Pilihan tidak valid!")
 
-def input_program(prompt):
-    display_options("Pilihan Program", PROGRAM_LIST)
-    return PROGRAM_LIST[int(input_valid(
-        "Masukkan nomor program pilihan: ",
-        validate_digit_range,
-        f"Masukkan nomor 1 sampai {len(PROGRAM_LIST)}",
-        min_val=1,
-        max_val=len(PROGRAM_LIST)
-    )) - 1]
-
-def input_modul(nomor):
-    return int(input_valid(
-        f"Masukkan nilai Modul {nomor} (0-100): ",
-        validate_modul_score,
-        "Nilai modul harus angka antara 0 sampai 100"
-    ))
+def input_kolom(kolom, keterangan=""):
+    spesifikasi = SKEMA_KOLOM[kolom]
+    if spesifikasi.menu is not None:
+        return input_pilihan(f"Pilih {spesifikasi.judul}{keterangan}:", spesifikasi.menu)
+    return spesifikasi.parse(input_valid(f"Masukkan {spesifikasi.judul}{keterangan}{spesifikasi.petunjuk}: ",
+                                         spesifikasi.valid, spesifikasi.pesan))
+
+def iter_rows(data_dict, nims):
+    if isinstance(data_dict, DataMahasiswa):
+        terbatas = hasattr(nims, '__len__')
+        for store, grup in data_dict.kelompok_nim(nims):
+            if store is data_dict:
+                yield from data_dict.cache_baris.iter(grup if terbatas else iter(grup))
+            else:
+                yield from (tuple(map(str, baris)) for baris in store.iter_baris(grup))
+        return
+    for nim in nims:
+        data = data_dict[nim]
+        yield [nim] + [data[kolom] for kolom in KOLOM_DATA]
 
+@diukur("render.baris", hitung_hasil=True)
 def generate_rows(data_dict, nims):
-    return [
-        [
-            nim,
-            data_dict[nim]["nama"],
-            data_dict[nim]["gender"],
-            data_dict[nim]["program"],
-            data_dict[nim]["angkatan"],
-            data_dict[nim]["metode_belajar"],
-            data_dict[nim]["jadwal"],
-            data_dict[nim]["modul_1"],
-            data_dict[nim]["modul_2"],
-            data_dict[nim]["modul_3"]
-        ] for nim in nims
-    ]
+    return list(iter_rows(data_dict, nims))
+
+def normalisasi(nilai):
+    return str(nilai).replace(" ", "").lower()
+
+def ngram(teks, n=PANJANG_NGRAM):
+    return {teks[i:i + n] for i in range(len(teks) - n + 1)}
+
+def rapikan_nama(nama):
+    return " ".join(str(nama).lower().split())
+
+def jarak_edit(a, b):
+    if len(a) < len(b):
+        a, b = b, a
+    sebelum = list(range(len(b) + 1))
+    for i, huruf_a in enumerate(a, 1):
+        sekarang = [i]
+        for j, huruf_b in enumerate(b, 1):
+            sekarang.append(min(sebelum[j] + 1, sekarang[j - 1] + 1, sebelum[j - 1] + (huruf_a != huruf_b)))
+        sebelum = sekarang
+    return sebelum[-1]
+
+def kemiripan_nama(query, nama):
+    # Query dibandingkan dengan nama lengkap dan tiap potongan kata sepanjang query,
+    # supaya "sutresno" tetap cocok dengan "budi sutrisno".
+    kata = nama.split()
+    panjang = len(query.split())
+    potongan = {nama} | {" ".join(kata[i:i + panjang]) for i in range(len(kata) - panjang + 1)}
+    return max(1 - jarak_edit(query, teks) / max(len(query), len(teks)) for teks in potongan)
+
+def kemiripan(a, b):
+    panjang = max(len(a), len(b))
+    if abs(len(a) - len(b)) > panjang * (1 - AMBANG_FUZZY):
+        return 0.0
+    return 1 - jarak_edit(a, b) / panjang
+
+class IndeksNama:
+    # Nama dipecah per kata: trigram hanya mengindeks kata unik (jauh lebih sedikit dari
+    # jumlah nama), lalu nama dicari lewat irisan posting kata yang mirip dengan tiap kata query.
+    def __init__(self):
+        self.nims = {}
+        self.kata = {}
+        self.gram = {}
+
+    def tambah(self, nim, nama):
+        nama = rapikan_nama(nama)
+        nims = self.nims.get(nama)
+        if nims is None:
+            nims = self.nims[nama] = set()
+            for kata in set(nama.split()):
+                nama_kata = self.kata.get(kata)
+                if nama_kata is None:
+                    nama_kata = self.kata[kata] = set()
+                    for gram in ngram(f"  {kata} "):
+                        self.gram.setdefault(gram, set()).add(kata)
+                nama_kata.add(nama)
+        nims.add(nim)
+
+    def hapus(self, nim, nama):
+        nama = rapikan_nama(nama)
+        nims = self.nims.get(nama)
+        if nims is None:
+            return
+        nims.discard(nim)
+        if nims:
+            return
+        del self.nims[nama]
+        for kata in set(nama.split()):
+            nama_kata = self.kata[kata]
+            nama_kata.discard(nama)
+            if not nama_kata:
+                del self.kata[kata]
+                for gram in ngram(f"  {kata} "):
+                    self.gram[gram].discard(kata)
+                    if not self.gram[gram]:
+                        del self.gram[gram]
+
+    def kata_mirip(self, kata, ambang=AMBANG_FUZZY):
+        postings = sorted((self.gram.get(gram, ()) for gram in ngram(f"  {kata} ")), key=len)
+        # Kata yang lolos harus berbagi minimal `perlu` trigram dengan query, jadi kandidat
+        # cukup diambil dari posting paling jarang; posting umum hanya dipakai untuk menghitung.
+        perlu = max(1, math.ceil(len(postings) * AMBANG_GRAM))
+        batas = len(postings) - perlu + 1
+        sama = Counter()
+        for posting in postings[:batas]:
+            sama.update(posting)
+        calon = sama.keys()
+        for posting in postings[batas:]:
+            sama.update(calon & posting)
+        kandidat = heapq.nsmallest(KANDIDAT_FUZZY, ((-jumlah, abs(len(kata_lain) - len(kata)), kata_lain)
+                                                    for kata_lain, jumlah in sama.items() if jumlah >= perlu))
+        hasil = {}
+        for _, _, kata_lain in kandidat:
+            skor = kemiripan(kata, kata_lain)
+            if skor >= ambang:
+                hasil[kata_lain] = skor
+        return hasil
+
+    def cari(self, teks, k=BATAS_FUZZY, ambang=AMBANG_FUZZY):
+        kata_query = rapikan_nama(teks).split()
+        mirip = [self.kata_mirip(kata, ambang) for kata in kata_query]
+        if not kata_query or not all(mirip):
+            return []
+        urutan = sorted(mirip, key=lambda skor_kata: sum(len(self.kata[kata]) for kata in skor_kata))
+        calon = set().union(*(self.kata[kata] for kata in urutan[0]))
+        for skor_kata in urutan[1:]:
+            calon = set().union(*(calon & self.kata[kata] for kata in skor_kata))
+        hitung("indeks.cari_nama", len(calon), min(len(calon), k))
+
+        # Skor per kata menyaring calon dengan murah; kandidat teratas lalu diurutkan ulang
+        # dengan jarak edit seluruh nama supaya urutan dan pengulangan kata ikut dihitung.
+        query = " ".join(kata_query)
+        bobot = [(len(kata) / len(query.replace(" ", "")), skor_kata) for kata, skor_kata in zip(kata_query, mirip)]
+        nol = repeat(0.0)
+        skor_awal = []
+        for nama in calon:
+            kata_nama = nama.split()
+            skor = 0.0
+            for porsi, skor_kata in bobot:
+                nilai = list(map(skor_kata.get, kata_nama, nol))
+                terbaik = max(nilai)
+                skor += porsi * terbaik
+                # Satu kata nama hanya boleh dipakai sekali, jadi "budi budi" tidak sama dengan "budi".
+                kata_nama[nilai.index(terbaik)] = None
+            skor_awal.append((-skor, abs(len(nama) - len(query)), nama))
+        hasil = []
+        for skor, _, nama in heapq.nsmallest(KANDIDAT_FUZZY, skor_awal):
+            skor = (kemiripan_nama(query, nama) - skor) / 2
+            hasil.append((-skor, len(nama), nama))
+        return [(nama, -skor) for skor, _, nama in heapq.nsmallest(k, hasil)]
+
+class IndeksNim:
+    # List terurut yang dipecah per blok: sisip/hapus hanya menggeser satu blok,
+    # lookup awalan dan rentang cukup dua bisect lalu membaca k NIM hasilnya.
+    def __init__(self, nims=()):
+        urut = sorted(nims)
+        self.blok = [urut[i:i + UKURAN_BLOK_NIM] for i in range(0, len(urut), UKURAN_BLOK_NIM)]
+        self.maks = [blok[-1] for blok in self.blok]
+        self.jumlah = len(urut)
+
+    def __len__(self):
+        return self.jumlah
+
+    def __iter__(self):
+        return (nim for blok in self.blok for nim in blok)
+
+    def tambah(self, nim):
+        if not self.blok:
+            self.blok.append([])
+            self.maks.append(nim)
+        i = min(bisect_left(self.maks, nim), len(self.blok) - 1)
+        blok = self.blok[i]
+        insort(blok, nim)
+        self.maks[i] = blok[-1]
+        self.jumlah += 1
+        if len(blok) > 2 * UKURAN_BLOK_NIM:
+            self.blok[i:i + 1] = [blok[:UKURAN_BLOK_NIM], blok[UKURAN_BLOK_NIM:]]
+            self.maks[i:i + 1] = [blok[UKURAN_BLOK_NIM - 1], blok[-1]]
+
+    def hapus(self, nim):
+        i = bisect_left(self.maks, nim)
+        blok = self.blok[i]
+        del blok[bisect_left(blok, nim)]
+        self.jumlah -= 1
+        if blok:
+            self.maks[i] = blok[-1]
+        else:
+            del self.blok[i]
+            del self.maks[i]
+
+    def posisi(self, nim, kanan=False):
+        cari = bisect_right if kanan else bisect_left
+        i = cari(self.maks, nim)
+        if i == len(self.blok):
+            return i, 0
+        return i, cari(self.blok[i], nim)
+
+    def rentang(self, node):
+        nilai = node.nilai
+        awal, akhir = (0, 0), (len(self.blok), 0)
+        if node.awalan:
+            awal, akhir = self.posisi(nilai[:-1]), self.posisi(nilai[:-1] + NIM_MAKS)
+        elif node.op == '=':
+            awal, akhir = self.posisi(nilai), self.posisi(nilai, True)
+        elif node.op in ('<', '<='):
+            akhir = self.posisi(nilai, node.op == '<=')
+        elif node.op in ('>', '>='):
+            awal = self.posisi(nilai, node.op == '>')
+        return awal, akhir
+
+    def potong(self, awal, akhir):
+        (i, a), (j, b) = awal, akhir
+        while (i, a) < (j, b):
+            if i == j:
+                yield from self.blok[i][a:b]
+                return
+            yield from self.blok[i][a:]
+            i, a = i + 1, 0
+
+    def hitung(self, awal, akhir):
+        (i, a), (j, b) = awal, akhir
+        if (i, a) >= (j, b):
+            return 0
+        if i == j:
+            return b - a
+        return len(self.blok[i]) - a + sum(map(len, self.blok[i + 1:j])) + b
+
+    def awalan(self, teks):
+        return list(self.potong(self.posisi(teks), self.posisi(teks + NIM_MAKS)))
+
+class IndeksMahasiswa:
+    def __init__(self):
+        self.kategori = {kolom: {} for kolom in KOLOM_KATEGORI}
+        self.teks = {kolom: {} for kolom in KOLOM_TEKS}
+        self.gram = {kolom: {} for kolom in KOLOM_TEKS}
+        self.fuzzy = IndeksNama()
+
+    def tambah(self, nim, data):
+        for kolom in KOLOM_KATEGORI + KOLOM_TEKS:
+            self.tambah_kolom(nim, kolom, nim if kolom == 'nim' else data.get(kolom, ""))
+
+    def hapus(self, nim, data):
+        for kolom in KOLOM_KATEGORI + KOLOM_TEKS:
+            self.hapus_kolom(nim, kolom, nim if kolom == 'nim' else data.get(kolom, ""))
+
+    def tambah_kolom(self, nim, kolom, nilai):
+        if kolom == 'nama':
+            self.fuzzy.tambah(nim, nilai)
+        nilai = normalisasi(nilai)
+        if kolom in self.kategori:
+            self.kategori[kolom].setdefault(nilai, set()).add(nim)
+        elif kolom in self.teks:
+            self.teks[kolom][nim] = nilai
+            for gram in ngram(nilai):
+                self.gram[kolom].setdefault(gram, set()).add(nim)
+
+    def hapus_kolom(self, nim, kolom, nilai):
+        if kolom == 'nama':
+            self.fuzzy.hapus(nim, nilai)
+        nilai = normalisasi(nilai)
+        if kolom in self.kategori:
+            postings = self.kategori[kolom].get(nilai)
+            if postings is not None:
+                postings.discard(nim)
+                if not postings:
+                    del self.kategori[kolom][nilai]
+        elif kolom in self.teks:
+            self.teks[kolom].pop(nim, None)
+            for gram in ngram(nilai):
+                postings = self.gram[kolom].get(gram)
+                if postings is not None:
+                    postings.discard(nim)
+                    if not postings:
+                        del self.gram[kolom][gram]
+
+    def cari(self, kolom, keyword):
+        if kolom in self.kategori:
+            hasil = set()
+            for nilai, nims in self.kategori[kolom].items():
+                if keyword in nilai:
+                    hasil |= nims
+            dipindai = len(self.kategori[kolom])
+        else:
+            teks = self.teks[kolom]
+            grams = ngram(keyword)
+            if not grams:
+                hasil = {nim for nim, nilai in teks.items() if keyword in nilai}
+                dipindai = len(teks)
+            else:
+                postings = sorted((self.gram[kolom].get(gram, set()) for gram in grams), key=len)
+                kandidat = postings[0].intersection(*postings[1:])
+                hasil = {nim for nim in kandidat if keyword in teks[nim]}
+                dipindai = len(kandidat)
+        hitung("indeks.cari", dipindai, len(hasil))
+        return hasil
+
+class RecordMahasiswa(MutableMapping):
+    __slots__ = ('_store', '_nim')
+
+    def __init__(self, store, nim):
+        self._store = store
+        self._nim = nim
+
+    def __getitem__(self, kolom):
+        return self._store.ambil(self._nim, kolom)
+
+    def __setitem__(self, kolom, nilai):
+        self._store.ubah(self._nim, kolom, nilai)
+
+    def __delitem__(self, kolom):
+        raise TypeError("Kolom data mahasiswa tidak dapat dihapus")
+
+    def __iter__(self):
+        return iter(KOLOM_DATA)
+
+    def __len__(self):
+        return len(KOLOM_DATA)
+
+class CacheBaris:
+    # Baris tabel yang sudah dirender (tuple teks) per NIM, dibatasi LRU. Mutasi hanya
+    # membuang entri NIM yang berubah.
+    def __init__(self, store, batas=BATAS_CACHE_BARIS):
+        self.store = store
+        self.batas = batas
+        self.baris = OrderedDict()
+        self.kena = 0
+        self.meleset = 0
+        self._kunci = threading.Lock()
+
+    def iter(self, nims):
+        # Hanya permintaan berukuran (halaman, hasil pencarian) yang muat di cache disimpan; scan
+        # lewat generator atau hasil yang lebih besar tidak boleh mengusir baris yang sering dibuka.
+        simpan = hasattr(nims, '__len__') and len(nims) <= self.batas
+        sumber = None
+        for nim in nims:
+            with self._kunci:
+                baris = self.baris.get(nim)
+                if baris is not None:
+                    self.baris.move_to_end(nim)
+                    self.kena += 1
+            if baris is None:
+                if sumber is None:
+                    sumber = self.store.sumber_baris()
+                slot = self.store.posisi[nim]
+                baris = (nim, *map(str, [isi[slot] if kode is None else kode[isi[slot]] for isi, kode in sumber]))
+                self.meleset += 1
+                if simpan:
+                    with self._kunci:
+                        self.baris[nim] = baris
+                        if len(self.baris) > self.batas:
+                            self.baris.popitem(last=False)
+            yield baris
+
+    def buang(self, nim):
+        with self._kunci:
+            self.baris.pop(nim, None)
+
+    def kosongkan(self):
+        with self._kunci:
+            self.baris.clear()
+
+class DataMahasiswa(MutableMapping):
+    def __init__(self, records=None):
+        self.nims = []
+        self.nama = []
+        self.kode = {kolom: list(pilihan) for kolom, pilihan in KOLOM_KODE.items()}
+        self._nomor_kode = {kolom: {nilai: i for i, nilai in enumerate(pilihan)}
+                            for kolom, pilihan in self.kode.items()}
+        self.kolom = {kolom: array(SKEMA_KOLOM[kolom].typecode) for kolom in KOLOM_ARRAY}
+        self.posisi = {}
+        self.slot_kosong = set()
+        self._indeks = None
+        self._indeks_nim = None
+        self._cache_baris = None
+        self._merkle = None
+        self._statistik = None
+        self._tampilan = {}
+        self._kunci_tampilan = threading.Lock()
+        self.pendengar = []
+        self.aliran = None
+        self.arsip = None
+        self.jurnal = deque(maxlen=BATAS_UNDO)
+        self.paralel = None
+        self.sumber = None
+        self._mmap = None
+        self.versi = 0
+        self.baca_saja = False
+        if records:
+            self.update(records)
+
+    @property
+    def indeks(self):
+        if self._indeks is None:
+            self._indeks = self._bangun_indeks()
+        return self._indeks
+
+    @property
+    def cache_baris(self):
+        if self._cache_baris is None:
+            self._cache_baris = CacheBaris(self)
+        return self._cache_baris
+
+    @property
+    def indeks_nim(self):
+        if self._indeks_nim is None:
+            self._indeks_nim = IndeksNim(self)
+        return self._indeks_nim
+
+    @diukur("indeks.bangun")
+    def _bangun_indeks(self):
+        indeks = IndeksMahasiswa()
+        for nim in self:
+            indeks.tambah(nim, self[nim])
+        return indeks
+
+    @property
+    def statistik(self):
+        if self._statistik is None:
+            self._statistik = StatistikMahasiswa(self)
+            self.pendengar.append(self._statistik.terapkan)
+        return self._statistik
+
+    def tampilan(self, jenis, **opsi):
+        kunci = (jenis, tuple(sorted(opsi.items())))
+        with self._kunci_tampilan:
+            tampilan = self._tampilan.get(kunci)
+            if tampilan is None:
+                tampilan = TAMPILAN[jenis](self, **opsi)
+                pasang_aliran(self).langganan(tampilan.terapkan)
+                self._tampilan[kunci] = tampilan
+        return tampilan
+
+    def merkle(self, kedalaman=None):
+        kedalaman = kedalaman_merkle(len(self)) if kedalaman is None else kedalaman
+        with self._kunci_tampilan:
+            pohon = self._merkle
+            if pohon is None or pohon.kedalaman != kedalaman:
+                if pohon is not None:
+                    self.pendengar.remove(pohon.terapkan)
+                pohon = PohonMerkle(self, kedalaman)
+                self.pendengar.append(pohon.terapkan)
+                self._merkle = pohon
+        return pohon
+
+    def _lepas_turunan(self):
+        # Dipanggil setelah angkatan pindah tier tanpa event; tampilan dan pohon Merkle dibangun ulang saat dipakai.
+        with self._kunci_tampilan:
+            for tampilan in self._tampilan.values():
+                self.aliran.berhenti(tampilan.terapkan)
+            self._tampilan = {}
+            if self._merkle is not None:
+                self.pendengar.remove(self._merkle.terapkan)
+                self._merkle = None
+
+    def _enkode(self, kolom, nilai):
+        if kolom not in self.kode:
+            return int(nilai)
+        nomor = self._nomor_kode[kolom].get(nilai)
+        if nomor is None:
+            nomor = len(self.kode[kolom])
+            self.kode[kolom].append(nilai)
+            self._nomor_kode[kolom][nilai] = nomor
+        return nomor
+
+    def ambil(self, nim, kolom):
+        slot = self.posisi[nim]
+        if kolom == 'nim':
+            return nim
+        if kolom == 'nama':
+            return self.nama[slot]
+        if kolom not in self.kolom:
+            raise KeyError(kolom)
+        nilai = self.kolom[kolom][slot]
+        if kolom in self.kode:
+            return self.kode[kolom][nilai]
+        return nilai
+
+    def __getitem__(self, nim):
+        if nim not in self.posisi:
+            raise KeyError(nim)
+        return RecordMahasiswa(self, nim)
+
+    def _kirim(self, events):
+        for pendengar in self.pendengar:
+            pendengar(events)
+
+    def __setitem__(self, nim, data):
+        event = self._simpan(nim, data)
+        if self.pendengar:
+            self._kirim([event])
+
+    def tambah_banyak(self, records):
+        return len(self.terapkan_batch(dict(records)))
+
+    @diukur("mutasi.batch", hitung_hasil=True)
+    def terapkan_batch(self, perubahan, jurnal=True):
+        if self.arsip is not None:
+            self.arsip.siapkan_batch(perubahan)
+        pendengar, self.pendengar = self.pendengar, []
+        events = []
+        try:
+            for nim, baru in perubahan.items():
+                lama = dict(self[nim]) if nim in self else None
+                if lama is None and baru is None:
+                    continue
+                if baru is None:
+                    del self[nim]
+                    events.append(('hapus', nim, None, lama, None))
+                else:
+                    baru = lengkapi_record(baru)
+                    self[nim] = baru
+                    events.append(('tambah', nim, None, lama, baru))
+        except Exception:
+            for _, nim, _, lama, _ in reversed(events):
+                if lama is None:
+                    del self[nim]
+                else:
+                    self[nim] = lama
+            raise
+        finally:
+            self.pendengar = pendengar
+
+        if jurnal and events:
+            self.jurnal.append([(nim, None if lama is None else tuple(lama[kolom] for kolom in KOLOM_DATA))
+                                for _, nim, _, lama, _ in events])
+        if self.pendengar and events:
+            self._kirim(events)
+        if self.arsip is not None:
+            self.arsip.batasi()
+        return events
+
+    def undo(self):
+        if not self.jurnal:
+            return 0
+        entri = self.jurnal.pop()
+        perubahan = {nim: None if lama is None else dict(zip(KOLOM_DATA, lama))
+                     for nim, lama in reversed(entri)}
+        return len(self.terapkan_batch(perubahan, jurnal=False))
+
+    def _simpan(self, nim, data):
+        if not all(kolom in data for kolom in KOLOM_DATA):
+            data = lengkapi_record(data)
+        if self.arsip is not None:
+            self.arsip.siapkan_record(nim, data["angkatan"])
+        self.versi += 1
+        slot = self.posisi.get(nim)
+        lama = dict(self[nim]) if self.pendengar and slot is not None else None
+        if slot is None:
+            self._kolom_array()
+        kode = [(isi, self._enkode(kolom, data[kolom])) for kolom, isi in self.kolom.items()]
+        if slot is None:
+            slot = len(self.nims)
+            try:
+                for isi, nilai in kode:
+                    isi.append(nilai)
+            except (OverflowError, TypeError, ValueError):
+                for isi in self.kolom.values():
+                    del isi[slot:]
+                raise
+            self.posisi[nim] = slot
+            self.nims.append(nim)
+            self.nama.append(data["nama"])
+            if self._indeks_nim is not None:
+                self._indeks_nim.tambah(nim)
+        else:
+            if self._indeks is not None:
+                self._indeks.hapus(nim, self[nim])
+            if self._cache_baris is not None:
+                self._cache_baris.buang(nim)
+            asal = [isi[slot] for isi, _ in kode]
+            try:
+                for isi, nilai in kode:
+                    isi[slot] = nilai
+            except (OverflowError, TypeError, ValueError):
+                for (isi, _), nilai in zip(kode, asal):
+                    isi[slot] = nilai
+                if self._indeks is not None:
+                    self._indeks.tambah(nim, self[nim])
+                raise
+            self.nama[slot] = data["nama"]
+        if self._indeks is not None:
+            self._indeks.tambah(nim, data)
+        if self.pendengar:
+            return ('tambah', nim, None, lama, {kolom: data[kolom] for kolom in KOLOM_DATA})
+
+    def __delitem__(self, nim):
+        if self.arsip is not None and nim not in self.posisi:
+            self.arsip.siapkan_nim([nim])
+        self.versi += 1
+        lama = dict(self[nim]) if self.pendengar else None
+        if self._indeks is not None:
+            self._indeks.hapus(nim, self[nim])
+        if self._indeks_nim is not None:
+            self._indeks_nim.hapus(nim)
+        if self._cache_baris is not None:
+            self._cache_baris.buang(nim)
+        slot = self.posisi.pop(nim)
+        self.nims[slot] = None
+        self.nama[slot] = None
+        self.slot_kosong.add(slot)
+        if len(self.slot_kosong) > 1024 and len(self.slot_kosong) * 2 > len(self.nims):
+            self._padatkan()
+        if self.pendengar:
+            self._kirim([('hapus', nim, None, lama, None)])
+
+    def _kolom_array(self):
+        for kolom, isi in self.kolom.items():
+            if isinstance(isi, memoryview):
+                salinan = array(isi.format)
+                salinan.frombytes(isi.tobytes())
+                self.kolom[kolom] = salinan
+
+    def _padatkan(self):
+        self._kolom_array()
+        hidup = [slot for slot, nim in enumerate(self.nims) if nim is not None]
+        self.nims = [self.nims[slot] for slot in hidup]
+        self.nama = [self.nama[slot] for slot in hidup]
+        for kolom, isi in self.kolom.items():
+            self.kolom[kolom] = array(isi.typecode, (isi[slot] for slot in hidup))
+        self.posisi = {nim: slot for slot, nim in enumerate(self.nims)}
+        self.slot_kosong = set()
+
+    def muat_posisi(self):
+        if not isinstance(self.posisi, dict):
+            self.posisi = {nim: slot for slot, nim in enumerate(self.nims) if nim is not None}
+
+    def salin(self):
+        # Salinan baca saja (tanpa indeks, query memindai kolom langsung) untuk pembaca yang
+        # dilayani selagi writer panjang memegang store.
+        salinan = DataMahasiswa()
+        salinan.kode = {kolom: list(pilihan) for kolom, pilihan in self.kode.items()}
+        salinan._nomor_kode = {kolom: dict(nomor) for kolom, nomor in self._nomor_kode.items()}
+        salinan.nims = list(self.nims)
+        salinan.nama = list(self.nama)
+        salinan.kolom = {kolom: array(isi.format if isinstance(isi, memoryview) else isi.typecode, bytes(isi))
+                         for kolom, isi in self.kolom.items()}
+        salinan.posisi = dict(self.posisi) if isinstance(self.posisi, dict) else None
+        salinan.muat_posisi()
+        salinan.slot_kosong = set(self.slot_kosong)
+        salinan.versi = self.versi
+        salinan.baca_saja = True
+        if self._statistik is not None:
+            salinan._statistik = self._statistik.salin(salinan)
+        if self.arsip is not None:
+            salinan.arsip = self.arsip.salin(salinan)
+        return salinan
+
+    def __contains__(self, nim):
+        return nim in self.posisi
+
+    def ada(self, nim):
+        return nim in self.posisi or (self.arsip is not None and nim in self.arsip)
+
+    def muat_nim(self, *nims):
+        if self.arsip is not None:
+            self.arsip.siapkan_nim(nims)
+
+    def semua_nim(self):
+        yield from self
+        if self.arsip is not None:
+            yield from self.arsip.semua_nim()
+
+    def kelompok_nim(self, nims):
+        if self.arsip is None or not self.arsip.segmen:
+            return [(self, nims)]
+        return self.arsip.kelompok(nims)
+
+    def __iter__(self):
+        return (nim for nim in self.nims if nim is not None)
+
+    def __len__(self):
+        return len(self.posisi)
+
+    def ubah(self, nim, kolom, nilai):
+        if self.arsip is not None:
+            self.arsip.siapkan_record(nim, nilai if kolom == 'angkatan' else None)
+        self.versi += 1
+        slot = self.posisi[nim]
+        lama = self.ambil(nim, kolom)
+        if kolom == 'nama':
+            self.nama[slot] = nilai
+        else:
+            self.kolom[kolom][slot] = self._enkode(kolom, nilai)
+        if self._indeks is not None:
+            self._indeks.hapus_kolom(nim, kolom, lama)
+            self._indeks.tambah_kolom(nim, kolom, nilai)
+        if self._cache_baris is not None:
+            self._cache_baris.buang(nim)
+        if self.pendengar:
+            self._kirim([('ubah', nim, kolom, lama, nilai)])
+
+    def sumber_baris(self):
+        return [(self.nama if kolom == 'nama' else self.kolom[kolom], self.kode.get(kolom)) for kolom in KOLOM_DATA]
+
+    def iter_baris(self, nims):
+        sumber = self.sumber_baris()
+        posisi = self.posisi
+        for nim in nims:
+            slot = posisi[nim]
+            yield [nim] + [isi[slot] if kode is None else kode[isi[slot]] for isi, kode in sumber]
+
+    def urutkan(self, nims):
+        return sorted(nims, key=self.posisi.__getitem__)
+
+    def cari(self, kolom, keyword):
+        return self.urutkan(self.indeks.cari(kolom, keyword))
+
+    @diukur("cari_nama", hitung_hasil=True)
+    def cari_nama(self, teks, k=BATAS_FUZZY):
+        return [(nim, skor) for nama, skor in self.indeks.fuzzy.cari(teks, k)
+                for nim in self.urutkan(self.indeks.fuzzy.nims[nama])]
+
+class StatistikMahasiswa:
+    def __init__(self, store, slots=None):
+        self.store = store
+        self.grup = {dimensi: {} for dimensi in DIMENSI_STATISTIK}
+        self.hitung_ulang(slots)
+
+    def _grup(self, dimensi, nilai):
+        grup = self.grup[dimensi].get(nilai)
+        if grup is None:
+            grup = {'jumlah': 0}
+            for kolom in KOLOM_NILAI:
+                grup[kolom] = [0] * (SKEMA_KOLOM[kolom].maksimum + 1)
+            self.grup[dimensi][nilai] = grup
+        return grup
+
+    @diukur("statistik.bangun")
+    def hitung_ulang(self, slots=None):
+        store = self.store
+        self.grup = {dimensi: {} for dimensi in DIMENSI_STATISTIK}
+        if slots is None and store.paralel is not None and len(store) >= BATAS_PARALEL:
+            for grup in store.paralel.statistik(store):
+                self._gabung(grup)
+        else:
+            hidup = slots if slots is not None else [slot for slot, nim in enumerate(store.nims) if nim is not None]
+            for dimensi in DIMENSI_STATISTIK:
+                if np is not None:
+                    self._hitung_numpy(dimensi, hidup)
+                    continue
+                kode = store.kolom[dimensi]
+                skor = [store.kolom[kolom] for kolom in KOLOM_NILAI]
+                for slot in hidup:
+                    grup = self._grup(dimensi, self._dekode(dimensi, kode[slot]))
+                    grup['jumlah'] += 1
+                    for kolom, isi in zip(KOLOM_NILAI, skor):
+                        grup[kolom][isi[slot]] += 1
+        # Angkatan di arsip dihitung dari ringkasan manifest, tanpa membuka segmennya.
+        if slots is None and store.arsip is not None:
+            for grup in store.arsip.statistik():
+                self._gabung(grup)
+
+    def salin(self, store):
+        salinan = StatistikMahasiswa.__new__(StatistikMahasiswa)
+        salinan.store = store
+        salinan.grup = {dimensi: {nilai: {kunci: list(isi) if isinstance(isi, list) else isi
+                                          for kunci, isi in grup.items()}
+                                  for nilai, grup in isi_dimensi.items()}
+                        for dimensi, isi_dimensi in self.grup.items()}
+        return salinan
+
+    def _gabung(self, grup):
+        for dimensi, isi in grup.items():
+            for nilai, sumber in isi.items():
+                tujuan = self._grup(dimensi, nilai)
+                tujuan['jumlah'] += sumber['jumlah']
+                for kolom in KOLOM_NILAI:
+                    tujuan[kolom] = [a + b for a, b in zip(tujuan[kolom], sumber[kolom])]
+
+    def _hitung_numpy(self, dimensi, hidup):
+        store = self.store
+        if isinstance(hidup, range):
+            hidup = np.arange(hidup.start, hidup.stop, dtype=np.intp)
+        hidup = np.asarray(hidup, dtype=np.intp)
+        kode = np.frombuffer(store.kolom[dimensi], dtype=SKEMA_KOLOM[dimensi].typecode)[hidup]
+        nilai_unik, nomor_grup = np.unique(kode, return_inverse=True)
+        jumlah = np.bincount(nomor_grup, minlength=len(nilai_unik))
+        histogram = {}
+        for kolom in KOLOM_NILAI:
+            ukuran = SKEMA_KOLOM[kolom].maksimum + 1
+            skor = np.frombuffer(store.kolom[kolom], dtype=SKEMA_KOLOM[kolom].typecode)[hidup].astype(np.intp)
+            histogram[kolom] = np.bincount(nomor_grup * ukuran + skor,
+                                           minlength=len(nilai_unik) * ukuran).reshape(-1, ukuran)
+        for i, nilai in enumerate(nilai_unik):
+            grup = self._grup(dimensi, self._dekode(dimensi, int(nilai)))
+            grup['jumlah'] += int(jumlah[i])
+            for kolom in KOLOM_NILAI:
+                grup[kolom] = histogram[kolom][i].tolist()
+
+    def _dekode(self, dimensi, kode):
+        if dimensi in self.store.kode:
+            return self.store.kode[dimensi][kode]
+        return kode
+
+    def _ubah_record(self, data, arah):
+        for dimensi in DIMENSI_STATISTIK:
+            grup = self._grup(dimensi, data[dimensi])
+            grup['jumlah'] += arah
+            for kolom in KOLOM_NILAI:
+                grup[kolom][data[kolom]] += arah
+
+    def terapkan(self, events):
+        for op, nim, kolom, lama, baru in events:
+            if op != 'ubah':
+                if lama is not None:
+                    self._ubah_record(lama, -1)
+                if baru is not None:
+                    self._ubah_record(baru, 1)
+            elif kolom in KOLOM_NILAI:
+                for dimensi in DIMENSI_STATISTIK:
+                    histogram = self._grup(dimensi, self.store.ambil(nim, dimensi))[kolom]
+                    histogram[lama] -= 1
+                    histogram[baru] += 1
+            elif kolom in self.grup:
+                data = dict(self.store[nim])
+                self._ubah_record(dict(data, **{kolom: lama}), -1)
+                self._ubah_record(data, 1)
+
+    def ringkasan(self, dimensi):
+        rows = []
+        for nilai in sorted(self.grup[dimensi], key=str):
+            grup = self.grup[dimensi][nilai]
+            if grup['jumlah'] <= 0:
+                continue
+            for kolom in KOLOM_NILAI:
+                histogram = grup[kolom]
+                total = sum(skor * jumlah for skor, jumlah in enumerate(histogram))
+                terisi = [skor for skor, jumlah in enumerate(histogram) if jumlah]
+                lulus = sum(histogram[NILAI_LULUS:])
+                rows.append([
+                    nilai, kolom.replace('_', ' ').capitalize(), grup['jumlah'],
+                    round(total / grup['jumlah'], 2), terisi[0], terisi[-1],
+                    round(lulus * 100 / grup['jumlah'], 1)
+                ] + [sum(histogram[awal:akhir + 1]) for awal, akhir in RENTANG_DISTRIBUSI])
+        return rows
+
+def header_statistik(dimensi):
+    return ([dimensi.replace('_', ' ').title(), "Modul", "Jumlah", "Rata-rata", "Min", "Max",
+             f"Lulus >= {NILAI_LULUS} (%)"] + [f"{awal}-{akhir}" for awal, akhir in RENTANG_DISTRIBUSI])
+
+def tampilkan_statistik(data_mahasiswa):
+    pilihan_dimensi = {str(i): dimensi for i, dimensi in enumerate(DIMENSI_STATISTIK, 1)}
+    display_options("Kelompokkan Berdasarkan",
+                    {k: v.replace('_', ' ').title() for k, v in pilihan_dimensi.items()})
+    pilih = input(f"\nPilih pengelompokan [1-{len(pilihan_dimensi)}]: ").strip()
+    if pilih not in pilihan_dimensi:
+        print("Pilihan tidak valid!\n")
+        return
+    dimensi = pilihan_dimensi[pilih]
+    rows = data_mahasiswa.statistik.ringkasan(dimensi)
+    if not rows:
+        print("Belum ada data mahasiswa.\n")
+        return
+    table_str = tabulate(rows, headers=header_statistik(dimensi), tablefmt="grid")
+    table_width = max(len(line) for line in table_str.splitlines())
+    print("\n" + f"===== Statistik Nilai per {dimensi.replace('_', ' ').title()} =====".center(table_width))
+    print(table_str)
+
+class KolomTeks:
+    def __init__(self, buffer, offset, lebar, jumlah):
+        self._buffer = buffer
+        self._offset = offset
+        self._lebar = lebar
+        self._jumlah = jumlah
+        self._ubah = {}
+        self._tambahan = []
+
+    def dasar(self, slot):
+        awal = self._offset + slot * self._lebar
+        return self._buffer[awal:awal + self._lebar].rstrip(b"\0").decode("utf-8")
+
+    def __getitem__(self, slot):
+        if slot >= self._jumlah:
+            return self._tambahan[slot - self._jumlah]
+        if slot in self._ubah:
+            return self._ubah[slot]
+        return self.dasar(slot)
+
+    def __setitem__(self, slot, nilai):
+        if slot >= self._jumlah:
+            self._tambahan[slot - self._jumlah] = nilai
+        else:
+            self._ubah[slot] = nilai
+
+    def append(self, nilai):
+        self._tambahan.append(nilai)
+
+    def __len__(self):
+        return self._jumlah + len(self._tambahan)
+
+    def __iter__(self):
+        return (self[slot] for slot in range(len(self)))
+
+class PosisiNim:
+    def __init__(self, nims, urut):
+        self._nims = nims
+        self._urut = urut
+        self._baru = {}
+        self._hapus = set()
+
+    def _cari_dasar(self, nim):
+        kiri, kanan = 0, len(self._urut)
+        while kiri < kanan:
+            tengah = (kiri + kanan) // 2
+            if self._nims.dasar(self._urut[tengah]) < nim:
+                kiri = tengah + 1
+            else:
+                kanan = tengah
+        if kiri < len(self._urut) and nim not in self._hapus:
+            slot = self._urut[kiri]
+            if self._nims.dasar(slot) == nim:
+                return slot
+        return None
+
+    def get(self, nim, default=None):
+        if nim in self._baru:
+            return self._baru[nim]
+        slot = self._cari_dasar(nim)
+        return default if slot is None else slot
+
+    def __getitem__(self, nim):
+        slot = self.get(nim)
+        if slot is None:
+            raise KeyError(nim)
+        return slot
+
+    def __contains__(self, nim):
+        return self.get(nim) is not None
+
+    def __setitem__(self, nim, slot):
+        self._baru[nim] = slot
+
+    def pop(self, nim):
+        if nim in self._baru:
+            return self._baru.pop(nim)
+        slot = self[nim]
+        self._hapus.add(nim)
+        return slot
+
+    def __len__(self):
+        return len(self._urut) - len(self._hapus) + len(self._baru)
+
+@diukur("io.buka_snapshot")
+def buka_snapshot(path):
+    with open(path, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    store, generasi = baca_snapshot(buffer, path)
+    store.sumber = path
+    store._mmap = buffer
+    return store, generasi
+
+def tutup_snapshot(store):
+    # Windows menolak menghapus file yang masih di-mmap; view kolom dilepas dulu supaya mmap bisa ditutup.
+    buffer, store._mmap = store._mmap, None
+    if buffer is None:
+        return
+    for isi in store.kolom.values():
+        if isinstance(isi, memoryview):
+            isi.release()
+    if isinstance(store.posisi, PosisiNim):
+        store.posisi._urut.release()
+    buffer.close()
+
+def baca_snapshot(buffer, path):
+    magic, generasi, jumlah, lebar_nim, lebar_nama, panjang_meta, urutan_byte = \
+        SNAPSHOT_HEADER.unpack_from(buffer, 0)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError(f"{path} bukan file snapshot data mahasiswa")
+    if urutan_byte.decode() != sys.byteorder[0]:
+        raise ValueError(f"{path} dibuat dengan urutan byte yang berbeda")
+    offset = SNAPSHOT_HEADER.size
+    meta = json.loads(buffer[offset:offset + panjang_meta])
+    offset += panjang_meta
+    offset += -offset % 8
+    view = memoryview(buffer)
+
+    def ambil_blok(typecode, lebar):
+        nonlocal offset
+        blok = view[offset:offset + lebar * jumlah].cast(typecode)
+        offset += lebar * jumlah
+        return blok
+
+    def ambil_teks(lebar):
+        nonlocal offset
+        kolom = KolomTeks(buffer, offset, lebar, jumlah)
+        offset += lebar * jumlah
+        return kolom
+
+    store = DataMahasiswa()
+    store.kode.update(meta["kode"])
+    store._nomor_kode = {kolom: {nilai: i for i, nilai in enumerate(pilihan)}
+                         for kolom, pilihan in store.kode.items()}
+    # Kolom yang tidak ada di snapshot (skema bertambah) diisi nilai default kolom, kolom
+    # yang sudah tidak ada di skema dilewati.
+    kolom_file = meta.get("kolom", KOLOM_SNAPSHOT_LAMA)
+    blok = {}
+    urut = ambil_blok('I', 4)
+    for kolom, typecode in kolom_file:
+        if typecode != 'B':
+            blok[kolom] = ambil_blok(typecode, array(typecode).itemsize)
+    store.nims = ambil_teks(lebar_nim)
+    store.nama = ambil_teks(lebar_nama)
+    for kolom, typecode in kolom_file:
+        if typecode == 'B':
+            blok[kolom] = ambil_blok('B', 1)
+    for kolom, isi in store.kolom.items():
+        if kolom in blok:
+            store.kolom[kolom] = blok[kolom]
+        else:
+            store.kolom[kolom] = array(isi.typecode, [store._enkode(kolom, SKEMA_KOLOM[kolom].default)]) * jumlah
+    store.posisi = PosisiNim(store.nims, urut)
+    return store, generasi
+
+@diukur("io.tulis_snapshot")
+def tulis_snapshot(path, store, generasi):
+    with open(path + ".tmp", "wb") as f:
+        isi_snapshot(f, store, generasi)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(path + ".tmp", path)
+
+def isi_snapshot(f, store, generasi):
+    hidup = [slot for slot, nim in enumerate(store.nims) if nim is not None]
+    nims = [store.nims[slot] for slot in hidup]
+    nim_byte = [nim.encode("utf-8") for nim in nims]
+    nama_byte = [store.nama[slot].encode("utf-8") for slot in hidup]
+    lebar_nim = max((len(teks) for teks in nim_byte), default=1)
+    lebar_nama = max((len(teks) for teks in nama_byte), default=1)
+    blok = {}
+    kolom_file = []
+    for kolom, isi in store.kolom.items():
+        typecode = isi.format if isinstance(isi, memoryview) else isi.typecode
+        kolom_file.append([kolom, typecode])
+        if len(hidup) == len(isi):
+            blok[kolom] = bytes(isi)
+        else:
+            blok[kolom] = array(typecode, (isi[slot] for slot in hidup)).tobytes()
+    # Kolom lebar ditulis sebelum teks supaya tetap rata, kolom 1 byte sesudahnya.
+    kolom_file.sort(key=lambda kolom: -array(kolom[1]).itemsize)
+    meta = json.dumps({"kode": store.kode, "kolom": kolom_file}, ensure_ascii=False).encode("utf-8")
+
+    f.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, generasi, len(hidup), lebar_nim, lebar_nama,
+                                 len(meta), sys.byteorder[0].encode()))
+    f.write(meta)
+    f.write(b"\0" * (-(SNAPSHOT_HEADER.size + len(meta)) % 8))
+    f.write(array('I', sorted(range(len(nims)), key=nims.__getitem__)).tobytes())
+    for kolom, typecode in kolom_file:
+        if typecode != 'B':
+            f.write(blok[kolom])
+    f.write(b"".join(teks.ljust(lebar_nim, b"\0") for teks in nim_byte))
+    f.write(b"".join(teks.ljust(lebar_nama, b"\0") for teks in nama_byte))
+    for kolom, typecode in kolom_file:
+        if typecode == 'B':
+            f.write(blok[kolom])
+
+def potong_store(store, nims):
+    slots = [store.posisi[nim] for nim in nims]
+    hasil = DataMahasiswa()
+    hasil.kode = {kolom: list(pilihan) for kolom, pilihan in store.kode.items()}
+    hasil._nomor_kode = {kolom: {nilai: i for i, nilai in enumerate(pilihan)}
+                         for kolom, pilihan in hasil.kode.items()}
+    hasil.nims = list(nims)
+    hasil.nama = [store.nama[slot] for slot in slots]
+    for kolom, isi in store.kolom.items():
+        typecode = isi.format if isinstance(isi, memoryview) else isi.typecode
+        hasil.kolom[kolom] = array(typecode, [isi[slot] for slot in slots])
+    hasil.posisi = {nim: slot for slot, nim in enumerate(hasil.nims)}
+    return hasil
+
+class PartisiNim:
+    # Shard ke-i berisi NIM dalam [batas[i - 1], batas[i]), shard pertama dan terakhir terbuka.
+    def __init__(self, batas):
+        self.batas = sorted({normalisasi(teks).upper() for teks in batas})
+
+    def __len__(self):
+        return len(self.batas) + 1
+
+    def nomor(self, nim):
+        return bisect_right(self.batas, nim.upper())
+
+    def rentang(self, nomor):
+        return (self.batas[nomor - 1] if nomor else None,
+                self.batas[nomor] if nomor < len(self.batas) else None)
+
+    def cocok(self, node):
+        bawah, atas = batas_nim(node)
+        awal = 0 if bawah is None else self.nomor(bawah)
+        akhir = len(self.batas) if atas is None else self.nomor(atas)
+        return range(awal, akhir + 1)
+
+    @diukur("partisi.bagi")
+    def bagi(self, store):
+        indeks = store.indeks_nim
+        shards = []
+        for nomor in range(len(self)):
+            bawah, atas = self.rentang(nomor)
+            awal = (0, 0) if bawah is None else indeks.posisi(bawah)
+            akhir = (len(indeks.blok), 0) if atas is None else indeks.posisi(atas)
+            shards.append(potong_store(store, list(indeks.potong(awal, akhir))))
+        return shards
+
+    def path(self, folder, nomor):
+        return os.path.join(folder, f"shard-{nomor:04d}.bin")
+
+    def simpan(self, folder, shards):
+        os.makedirs(folder, exist_ok=True)
+        for nomor, shard in enumerate(shards):
+            tulis_snapshot(self.path(folder, nomor), shard, 0)
+        with open(os.path.join(folder, FILE_PARTISI + ".tmp"), "w", encoding="utf-8") as f:
+            json.dump({"batas": self.batas}, f, ensure_ascii=False)
+        os.replace(os.path.join(folder, FILE_PARTISI + ".tmp"), os.path.join(folder, FILE_PARTISI))
+        for nama_file in os.listdir(folder):
+            if re.fullmatch(r"shard-\d{4}\.bin", nama_file) and int(nama_file[6:10]) >= len(shards):
+                os.remove(os.path.join(folder, nama_file))
+
+    def buka(self, folder, nomor):
+        return buka_snapshot(self.path(folder, nomor))[0]
+
+def muat_partisi(folder):
+    with open(os.path.join(folder, FILE_PARTISI), encoding="utf-8") as f:
+        return PartisiNim(json.load(f)["batas"])
+
+def batas_nim(node):
+    if isinstance(node, Gabungan):
+        if node.op == 'or':
+            batas = [batas_nim(anak) for anak in node.anak]
+            if any(bawah is None for bawah, _ in batas) or any(atas is None for _, atas in batas):
+                return None, None
+            return min(bawah for bawah, _ in batas), max(atas for _, atas in batas)
+        bawah, atas = None, None
+        for anak in node.anak:
+            b, a = batas_nim(anak)
+            if b is not None:
+                bawah = b if bawah is None else max(bawah, b)
+            if a is not None:
+                atas = a if atas is None else min(atas, a)
+        return bawah, atas
+    if node.kolom != 'nim' or node.op in ('~', '!='):
+        return None, None
+    if node.awalan:
+        return node.nilai[:-1], node.nilai[:-1] + NIM_MAKS
+    if node.op == '=':
+        return node.nilai, node.nilai
+    if node.op in ('<', '<='):
+        return None, node.nilai
+    return node.nilai, None
+
+def query_partisi(folder, kondisi):
+    partisi = muat_partisi(folder)
+    anak = [Predikat(*node) if isinstance(node, tuple) else node for node in kondisi]
+    node = anak[0] if len(anak) == 1 else Gabungan('and', anak)
+    for nomor in partisi.cocok(node) if anak else range(len(partisi)):
+        store = partisi.buka(folder, nomor)
+        nims = api_query(store, anak)
+        if nims:
+            yield store, nims
+
+def angkatan_hidup(store):
+    isi = store.kolom['angkatan']
+    if np is not None:
+        angkatan = np.frombuffer(isi, dtype=SKEMA_KOLOM['angkatan'].typecode)
+        if store.slot_kosong:
+            angkatan = np.delete(angkatan, list(store.slot_kosong))
+        nilai, jumlah = np.unique(angkatan, return_counts=True)
+        return dict(zip(nilai.tolist(), jumlah.tolist()))
+    return Counter(isi[slot] for slot in slot_hidup(store))
+
+def nim_angkatan(store, angkatan):
+    isi = store.kolom['angkatan']
+    if np is not None:
+        slots = np.flatnonzero(np.frombuffer(isi, dtype=SKEMA_KOLOM['angkatan'].typecode) == angkatan).tolist()
+    else:
+        slots = [slot for slot, nilai in enumerate(isi) if nilai == angkatan]
+    return [store.nims[slot] for slot in slots if slot not in store.slot_kosong]
+
+@diukur("io.tulis_segmen")
+def tulis_segmen(path, store):
+    buffer = io.BytesIO()
+    isi_snapshot(buffer, store, 0)
+    with open(path + ".tmp", "wb") as f:
+        f.write(zlib.compress(buffer.getbuffer()))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(path + ".tmp", path)
+
+@diukur("io.baca_segmen")
+def baca_segmen(path):
+    with open(path, "rb") as f:
+        return baca_snapshot(zlib.decompress(f.read()), path)[0]
+
+class ArsipAngkatan:
+    # Angkatan di luar `panas` angkatan terbaru disimpan sebagai snapshot terkompresi (satu segmen per
+    # angkatan). Query dan export membaca segmen langsung tanpa memuatnya ke store; hanya mutasi yang
+    # memuat angkatan kembali. Paling banyak `batas_dimuat` angkatan arsip berada di memori (dimuat atau
+    # cache segmen baca), sisanya dilepas mulai dari yang paling lama tidak dipakai.
+    def __init__(self, store, folder, catat=None, panas=ANGKATAN_PANAS_DEFAULT, batas_dimuat=ARSIP_DIMUAT_DEFAULT,
+                 dipakai=()):
+        self.store = store
+        self.folder = folder
+        self.catat = catat
+        self.panas = panas
+        self.batas_dimuat = batas_dimuat
+        self.segmen = {}
+        self.tersimpan = {}
+        self.dimuat = OrderedDict()
+        self.nomor = 0
+        self._cache = OrderedDict()
+        self._kunci = threading.Lock()
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, FILE_ARSIP)
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                manifest = json.load(f)
+            self.nomor = manifest["nomor"]
+            self.segmen = {int(angkatan): entri for angkatan, entri in manifest["angkatan"].items()}
+        # Angkatan yang sudah dimuat ulang (event 'pulih' di WAL) tetapi manifest-nya belum diperbarui.
+        for angkatan in set(self.segmen) & set(angkatan_hidup(store)):
+            del self.segmen[angkatan]
+        dipakai = set(dipakai) | {entri["file"] for entri in self.segmen.values()}
+        for nama_file in os.listdir(folder):
+            if re.fullmatch(r"angkatan-\d+-\d{6}\.bin\.z", nama_file) and nama_file not in dipakai:
+                os.remove(os.path.join(folder, nama_file))
+        store.pendengar.append(self.tandai)
+
+    def path(self, entri):
+        return os.path.join(self.folder, entri["file"])
+
+    def _simpan_manifest(self):
+        path = os.path.join(self.folder, FILE_ARSIP)
+        manifest = {"nomor": self.nomor, "angkatan": {str(angkatan): entri for angkatan, entri in self.segmen.items()}}
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(path + ".tmp", path)
+
+    def _catat(self, op, angkatan, entri):
+        if self.catat is not None:
+            self.catat([(op, None, 'angkatan', None, {"angkatan": angkatan, "file": entri["file"]})])
+
+    def _diam(self, fungsi, *args):
+        store = self.store
+        pendengar, store.pendengar = store.pendengar, []
+        store.arsip = None
+        try:
+            fungsi(*args)
+        finally:
+            store.pendengar = pendengar
+            store.arsip = self
+        store._lepas_turunan()
+
+    @diukur("arsip.simpan")
+    def arsipkan(self, angkatan):
+        store = self.store
+        nims = sorted(nim_angkatan(store, angkatan))
+        entri = self.tersimpan.pop(angkatan, None)
+        if self.dimuat.pop(angkatan, True) or entri is None:
+            if not nims:
+                return 0
+            segmen = potong_store(store, nims)
+            self.nomor += 1
+            entri = {"file": f"angkatan-{angkatan}-{self.nomor:06d}.bin.z", "jumlah": len(nims),
+                     "statistik": {dimensi: [[nilai, grup] for nilai, grup in isi.items() if grup['jumlah']]
+                                   for dimensi, isi in StatistikMahasiswa(segmen).grup.items()},
+                     "nims": nims}
+            tulis_segmen(self.path(entri), segmen)
+        # Urutan segmen -> manifest -> WAL -> lepas: crash di tengah hanya menyisakan angkatan di memori.
+        self.segmen[angkatan] = entri
+        self._simpan_manifest()
+        self._catat('arsip', angkatan, entri)
+
+        def lepas():
+            for nim in nims:
+                del store[nim]
+        self._diam(lepas)
+        nim_lepas = set(nims)
+        store.jurnal = deque((entri_jurnal for entri_jurnal in store.jurnal
+                              if not any(nim in nim_lepas for nim, _ in entri_jurnal)), maxlen=BATAS_UNDO)
+        return len(nims)
+
+    @diukur("arsip.muat")
+    def pulih(self, angkatan):
+        store = self.store
+        entri = self.segmen[angkatan]
+        segmen = baca_segmen(self.path(entri))
+        self._catat('pulih', angkatan, entri)
+
+        def sisipkan():
+            for baris in segmen.iter_baris(segmen):
+                store[baris[0]] = dict(zip(KOLOM_DATA, baris[1:]))
+        self._diam(sisipkan)
+        del self.segmen[angkatan]
+        self._simpan_manifest()
+        self.tersimpan[angkatan] = entri
+        self.dimuat[angkatan] = False
+        self._rapikan_cache(entri["file"])
+        return entri["jumlah"]
+
+    def tandai(self, events):
+        if not self.dimuat:
+            return
+        for op, nim, kolom, lama, baru in events:
+            if op == 'ubah':
+                daftar = [self.store.ambil(nim, 'angkatan'), lama if kolom == 'angkatan' else None]
+            else:
+                daftar = [data['angkatan'] for data in (lama, baru) if data is not None]
+            for angkatan in daftar:
+                if angkatan in self.dimuat:
+                    self.dimuat[angkatan] = True
+
+    def angkatan_nim(self, nim):
+        for angkatan, entri in self.segmen.items():
+            nims = entri["nims"]
+            i = bisect_left(nims, nim)
+            if i < len(nims) and nims[i] == nim:
+                return angkatan
+        return None
+
+    def __contains__(self, nim):
+        return self.angkatan_nim(nim) is not None
+
+    def _rapikan_cache(self, buang=None):
+        with self._kunci:
+            self._cache.pop(buang, None)
+            while self._cache and len(self._cache) > self.batas_dimuat - len(self.dimuat):
+                self._cache.popitem(last=False)
+
+    def buka(self, angkatan):
+        # Segmen dibuka hanya untuk dibaca; store utama dan manifest tidak berubah.
+        entri = self.segmen[angkatan]
+        with self._kunci:
+            segmen = self._cache.get(entri["file"])
+            if segmen is not None:
+                self._cache.move_to_end(entri["file"])
+                return segmen
+        segmen = baca_segmen(self.path(entri))
+        with self._kunci:
+            self._cache[entri["file"]] = segmen
+        self._rapikan_cache()
+        return segmen
+
+    def _ada_rentang(self, angkatan, bawah, atas):
+        nims = self.segmen[angkatan]["nims"]
+        i = 0 if bawah is None else bisect_left(nims, bawah)
+        return i < len(nims) and (atas is None or nims[i] <= atas)
+
+    def _cocok(self, node, daftar):
+        if isinstance(node, Gabungan):
+            batas = [self._cocok(anak, daftar) for anak in node.anak]
+            terbatas = [isi for isi in batas if isi is not None]
+            if node.op == 'or':
+                return set().union(*terbatas) if len(terbatas) == len(batas) else None
+            return set.intersection(*terbatas) if terbatas else None
+        if node.kolom == 'angkatan':
+            return {angkatan for angkatan in daftar if node.uji(angkatan)}
+        if node.kolom == 'nim' and node.op not in ('~', '!='):
+            bawah, atas = batas_nim(node)
+            return {angkatan for angkatan in daftar if self._ada_rentang(angkatan, bawah, atas)}
+        return None
+
+    def cocok(self, node):
+        # Predikat angkatan dan rentang NIM dicek ke manifest; predikat lain memindai semua segmen.
+        daftar = set(self.segmen)
+        hasil = None if node is None else self._cocok(node, daftar)
+        return sorted(daftar if hasil is None else hasil)
+
+    def query(self, node):
+        for angkatan in self.cocok(node):
+            segmen = self.buka(angkatan)
+            nims = list(segmen) if node is None else pindai_store(segmen, node)
+            hitung("arsip.query", dipindai=len(segmen), hasil=len(nims))
+            if nims:
+                yield segmen, nims
+
+    def kelompok(self, nims):
+        # NIM dikelompokkan berurutan per sumber: store utama atau segmen angkatan arsipnya.
+        posisi = self.store.posisi
+        for angkatan, grup in groupby(nims, lambda nim: None if nim in posisi else self.angkatan_nim(nim)):
+            yield self.store if angkatan is None else self.buka(angkatan), list(grup)
+
+    def batasi(self, batas=None, kecuali=()):
+        batas = self.batas_dimuat if batas is None else batas
+        for angkatan in list(self.dimuat):
+            if len(self.dimuat) <= batas:
+                break
+            if angkatan not in kecuali:
+                self.arsipkan(angkatan)
+
+    def siapkan(self, daftar):
+        # Angkatan lain dilepas sebelum tiap angkatan dimuat; hanya angkatan yang disentuh satu
+        # batch mutasi yang boleh melewati batas sampai batch itu selesai.
+        perlu = sorted(angkatan for angkatan in daftar if angkatan in self.segmen)
+        for angkatan in daftar:
+            if angkatan in self.dimuat:
+                self.dimuat.move_to_end(angkatan)
+        for angkatan in perlu:
+            self.batasi(self.batas_dimuat - 1, daftar)
+            self.pulih(angkatan)
+        return len(perlu)
+
+    def siapkan_nim(self, nims):
+        if self.segmen:
+            posisi = self.store.posisi
+            self.siapkan({self.angkatan_nim(nim) for nim in nims if nim not in posisi} - {None})
+
+    def siapkan_record(self, nim, angkatan):
+        if self.segmen:
+            self.siapkan_batch({nim: {'angkatan': angkatan}})
+
+    def siapkan_batch(self, perubahan):
+        if not self.segmen:
+            return
+        posisi = self.store.posisi
+        perlu = set()
+        for nim, baru in perubahan.items():
+            # Angkatan yang sudah dimuat dan ikut disentuh juga dilindungi: event-nya baru dikirim
+            # setelah batch selesai, jadi melepasnya di tengah batch membuang perubahan.
+            perlu.add(self.store.ambil(nim, 'angkatan') if nim in posisi else self.angkatan_nim(nim))
+            if baru is not None:
+                perlu.add(baru['angkatan'])
+        if perlu & set(self.segmen):
+            self.siapkan(perlu & (set(self.segmen) | set(self.dimuat)))
+
+    @diukur("arsip.rapikan")
+    def rapikan(self):
+        jumlah = angkatan_hidup(self.store)
+        semua = sorted(set(jumlah) | set(self.segmen))
+        panas = set(semua[-self.panas:]) if self.panas > 0 else set(semua)
+        for angkatan in sorted(panas & set(self.segmen)):
+            self.pulih(angkatan)
+        for angkatan in panas:
+            self.dimuat.pop(angkatan, None)
+            self.tersimpan.pop(angkatan, None)
+        for angkatan in semua:
+            if angkatan in jumlah and angkatan not in panas and angkatan not in self.dimuat:
+                self.arsipkan(angkatan)
+        while len(self.dimuat) > self.batas_dimuat:
+            self.arsipkan(next(iter(self.dimuat)))
+
+    def semua_nim(self):
+        for angkatan in sorted(self.segmen):
+            yield from self.segmen[angkatan]["nims"]
+
+    def statistik(self):
+        for entri in self.segmen.values():
+            yield {dimensi: {nilai: grup for nilai, grup in isi} for dimensi, isi in entri["statistik"].items()}
+
+    def ringkasan(self):
+        jumlah = angkatan_hidup(self.store)
+        rows = []
+        for angkatan in sorted(set(jumlah) | set(self.segmen)):
+            if angkatan in self.segmen:
+                entri = self.segmen[angkatan]
+                rows.append([angkatan, 'arsip', entri["jumlah"], os.path.getsize(self.path(entri))])
+            else:
+                rows.append([angkatan, 'dimuat' if angkatan in self.dimuat else 'panas', jumlah[angkatan], "-"])
+        return rows
+
+    def salin(self, store):
+        # Hanya untuk dibaca: manifest disalin, cache segmen dipakai bersama, tidak ada angkatan dimuat.
+        salinan = ArsipAngkatan.__new__(ArsipAngkatan)
+        salinan.__dict__.update(self.__dict__)
+        salinan.store = store
+        salinan.catat = None
+        salinan.segmen = dict(self.segmen)
+        salinan.tersimpan = {}
+        salinan.dimuat = OrderedDict()
+        return salinan
+
+    def tutup(self):
+        if self.tandai in self.store.pendengar:
+            self.store.pendengar.remove(self.tandai)
+        self.store.arsip = None
+        self._cache.clear()
+
+class Transaksi:
+    def __init__(self, data_mahasiswa):
+        self.data_mahasiswa = data_mahasiswa
+        self.perubahan = {}
+
+    def record(self, nim):
+        if nim in self.perubahan:
+            return self.perubahan[nim]
+        self.data_mahasiswa.muat_nim(nim)
+        if nim in self.data_mahasiswa:
+            return dict(self.data_mahasiswa[nim])
+        return None
+
+    def ada(self, nim):
+        # Tidak memuat angkatan arsip; commit memuat angkatan yang disentuh sekaligus.
+        if nim in self.perubahan:
+            return self.perubahan[nim] is not None
+        return self.data_mahasiswa.ada(nim)
+
+    def tambah(self, nim, data):
+        if self.ada(nim):
+            raise ValueError(f"Data dengan NIM {nim} sudah ada")
+        self.perubahan[nim] = lengkapi_record(data)
+
+    def ubah(self, nim, kolom, nilai):
+        data = self.record(nim)
+        if data is None:
+            raise ValueError(f"Data dengan NIM {nim} tidak ditemukan")
+        if kolom not in KOLOM_DATA:
+            raise ValueError(f"Kolom {kolom} tidak dikenal")
+        self.perubahan[nim] = dict(data, **{kolom: nilai})
+
+    def hapus(self, nim):
+        if not self.ada(nim):
+            raise ValueError(f"Data dengan NIM {nim} tidak ditemukan")
+        self.perubahan[nim] = None
+
+    def __len__(self):
+        return len(self.perubahan)
+
+    def commit(self):
+        events = self.data_mahasiswa.terapkan_batch(self.perubahan)
+        self.perubahan = {}
+        return len(events)
+
+    def rollback(self):
+        self.perubahan = {}
+
+def terapkan_event(data, event):
+    op, nim, kolom, lama, baru = event
+    if op == 'tambah':
+        data[nim] = dict(baru)
+    elif op == 'hapus':
+        del data[nim]
+    elif kolom in SKEMA_KOLOM:
+        data[nim][kolom] = baru
+
+def ringkas_event(event):
+    op, nim, kolom, lama, baru = event
+    if op == 'ubah':
+        if lama != baru:
+            yield {"op": 'ubah', "nim": nim, "kolom": kolom, "lama": lama, "baru": baru}
+    elif op == 'hapus' or lama is None:
+        yield {"op": op, "nim": nim, "kolom": None, "lama": lama, "baru": baru}
+    else:
+        for kolom in KOLOM_DATA:
+            if lama[kolom] != baru[kolom]:
+                yield {"op": 'ubah', "nim": nim, "kolom": kolom, "lama": lama[kolom], "baru": baru[kolom]}
+
+def _awal_baris(f, offset):
+    if offset == 0:
+        return 0
+    f.seek(offset - 1)
+    f.readline()
+    return f.tell()
+
+def baca_perubahan(path, dari=0):
+    with open(path, "rb") as f:
+        ukuran = os.fstat(f.fileno()).st_size
+        bawah, atas = 0, ukuran
+        while bawah < atas:
+            tengah = (bawah + atas) // 2
+            f.seek(_awal_baris(f, tengah))
+            baris = f.readline()
+            try:
+                lewat = json.loads(baris)["seq"] <= dari
+            except ValueError:
+                lewat = False
+            if lewat:
+                bawah = tengah + 1
+            else:
+                atas = tengah
+        f.seek(_awal_baris(f, bawah))
+        for baris in f:
+            try:
+                perubahan = json.loads(baris)
+            except ValueError:
+                break
+            if perubahan["seq"] > dari:
+                yield perubahan
+
+def seq_terakhir(path):
+    with open(path, "r+b") as f:
+        ukuran = f.seek(0, os.SEEK_END)
+        awal = ukuran
+        ekor = b""
+        while awal > 0 and ekor.count(b"\n") < 2:
+            awal = max(0, awal - 4096)
+            f.seek(awal)
+            ekor = f.read(ukuran - awal)
+        # Baris terakhir yang terpotong (crash saat menulis) dibuang.
+        akhir = ekor.rfind(b"\n") + 1
+        if awal + akhir < ukuran:
+            f.truncate(awal + akhir)
+        if not akhir:
+            return 0
+        mulai = ekor.rfind(b"\n", 0, akhir - 1) + 1
+        return json.loads(ekor[mulai:akhir])["seq"]
+
+class AliranPerubahan:
+    def __init__(self, store, path=None):
+        self.store = store
+        self.path = path
+        self.pelanggan = []
+        self.seq = 0
+        self._file = None
+        if path is not None:
+            if os.path.exists(path):
+                self.seq = seq_terakhir(path)
+            self._file = open(path, "a", encoding="utf-8")
+        store.pendengar.append(self.terbitkan)
+
+    def langganan(self, fungsi):
+        self.pelanggan.append(fungsi)
+        return fungsi
+
+    def berhenti(self, fungsi):
+        self.pelanggan.remove(fungsi)
+
+    @diukur("cdc.terbit")
+    def terbitkan(self, events):
+        waktu = round(time.time(), 3)
+        perubahan = []
+        for event in events:
+            for isi in ringkas_event(event):
+                self.seq += 1
+                perubahan.append(dict(seq=self.seq, waktu=waktu, **isi))
+        if not perubahan:
+            return
+        if self._file is not None:
+            self._file.write("".join(json.dumps(isi, ensure_ascii=False) + "\n" for isi in perubahan))
+            self._file.flush()
+        for fungsi in list(self.pelanggan):
+            fungsi(perubahan)
+
+    def tutup(self):
+        if self.terbitkan in self.store.pendengar:
+            self.store.pendengar.remove(self.terbitkan)
+        if self._file is not None:
+            os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
+
+def pasang_aliran(data_mahasiswa, path=None):
+    if data_mahasiswa.aliran is None:
+        data_mahasiswa.aliran = AliranPerubahan(data_mahasiswa, path)
+    return data_mahasiswa.aliran
+
+def slot_hidup(store):
+    return [slot for slot, nim in enumerate(store.nims) if nim is not None]
+
+class RosterProgram:
+    def __init__(self, store):
+        self.store = store
+        self.program = {}
+        program = store.kode['program']
+        isi = store.kolom['program']
+        for slot in slot_hidup(store):
+            self.program.setdefault(program[isi[slot]], set()).add(store.nims[slot])
+
+    def _pindah(self, nim, lama, baru):
+        if lama is not None:
+            anggota = self.program[lama]
+            anggota.discard(nim)
+            if not anggota:
+                del self.program[lama]
+        if baru is not None:
+            self.program.setdefault(baru, set()).add(nim)
+
+    def terapkan(self, perubahan):
+        for isi in perubahan:
+            if isi["op"] == 'tambah':
+                self._pindah(isi["nim"], None, isi["baru"]['program'])
+            elif isi["op"] == 'hapus':
+                self._pindah(isi["nim"], isi["lama"]['program'], None)
+            elif isi["kolom"] == 'program':
+                self._pindah(isi["nim"], isi["lama"], isi["baru"])
+
+    def ringkasan(self):
+        jumlah = Counter({program: len(anggota) for program, anggota in self.program.items()})
+        if self.store.arsip is not None:
+            for grup in self.store.arsip.statistik():
+                jumlah.update({program: isi['jumlah'] for program, isi in grup['program'].items()})
+        return [[program, jumlah[program]] for program in sorted(jumlah)]
+
+    def daftar(self, program=None):
+        if program is None:
+            return (self.store.urutkan(nim for anggota in self.program.values() for nim in anggota)
+                    + nim_arsip(self.store, None))
+        return (self.store.urutkan(self.program.get(program, ()))
+                + nim_arsip(self.store, Predikat('program', '=', program)))
+
+class MahasiswaBerisiko:
+    def __init__(self, store, ambang=NILAI_LULUS):
+        self.store = store
+        self.ambang = ambang
+        self.modul = {}
+        for kolom in KOLOM_NILAI:
+            isi = store.kolom[kolom]
+            if np is not None:
+                slots = np.flatnonzero(np.frombuffer(isi, dtype=SKEMA_KOLOM[kolom].typecode) < ambang).tolist()
+            else:
+                slots = [slot for slot, skor in enumerate(isi) if skor < ambang]
+            for slot in slots:
+                nim = store.nims[slot]
+                if nim is not None:
+                    self.modul.setdefault(nim, {})[kolom] = isi[slot]
+
+    def _nilai(self, nim, kolom, skor):
+        if skor < self.ambang:
+            self.modul.setdefault(nim, {})[kolom] = skor
+        elif kolom in self.modul.get(nim, ()):
+            del self.modul[nim][kolom]
+            if not self.modul[nim]:
+                del self.modul[nim]
+
+    def terapkan(self, perubahan):
+        for isi in perubahan:
+            nim = isi["nim"]
+            if isi["op"] == 'tambah':
+                for kolom in KOLOM_NILAI:
+                    self._nilai(nim, kolom, isi["baru"][kolom])
+            elif isi["op"] == 'hapus':
+                self.modul.pop(nim, None)
+            elif isi["kolom"] in KOLOM_NILAI:
+                self._nilai(nim, isi["kolom"], isi["baru"])
+
+    def daftar(self):
+        node = Gabungan('or', [Predikat(kolom, '<', self.ambang) for kolom in KOLOM_NILAI])
+        return self.store.urutkan(self.modul) + nim_arsip(self.store, node)
+
+TAMPILAN = {'roster': RosterProgram, 'berisiko': MahasiswaBerisiko}
+
+def hash_baris(baris):
+    teks = "\x1f".join(map(str, baris)).encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(teks, digest_size=8).digest(), "little")
+
+def kedalaman_merkle(jumlah):
+    kedalaman = 1
+    while FANOUT_MERKLE ** kedalaman * UKURAN_BUCKET_MERKLE < jumlah:
+        kedalaman += 1
+    return kedalaman
+
+class PohonMerkle:
+    # Daun = bucket NIM (crc32), nilai simpul = XOR hash record di bawahnya, sehingga
+    # mutasi cukup memperbarui satu jalur daun ke akar. Hash record disimpan sejajar
+    # dengan NIM di bucket supaya pertukaran bucket tidak perlu membaca ulang record.
+    def __init__(self, store, kedalaman):
+        self.store = store
+        self.kedalaman = kedalaman
+        self.tingkat = [array('Q', bytes(8 * FANOUT_MERKLE ** d)) for d in range(kedalaman + 1)]
+        self.bucket = [[] for _ in range(FANOUT_MERKLE ** kedalaman)]
+        self.hash = [array('Q') for _ in range(FANOUT_MERKLE ** kedalaman)]
+        for baris in store.iter_baris(store):
+            daun = self.daun(baris[0])
+            nilai = hash_baris(baris)
+            self._geser(daun, nilai)
+            self.bucket[daun].append(baris[0])
+            self.hash[daun].append(nilai)
+
+    def daun(self, nim):
+        return zlib.crc32(nim.encode("utf-8")) % len(self.bucket)
+
+    def _geser(self, daun, nilai):
+        for isi in reversed(self.tingkat):
+            isi[daun] ^= nilai
+            daun //= FANOUT_MERKLE
+
+    def hash_nim(self, nim):
+        return hash_baris(next(self.store.iter_baris([nim])))
+
+    def terapkan(self, events):
+        for op, nim, _, lama, _ in events:
+            daun = self.daun(nim)
+            if op == 'ubah' or lama is not None:
+                i = self.bucket[daun].index(nim)
+                self._geser(daun, self.hash[daun][i])
+                if op == 'ubah':
+                    self.hash[daun][i] = self.hash_nim(nim)
+                    self._geser(daun, self.hash[daun][i])
+                    continue
+                del self.bucket[daun][i]
+                del self.hash[daun][i]
+            if op == 'tambah':
+                nilai = self.hash_nim(nim)
+                self._geser(daun, nilai)
+                self.bucket[daun].append(nim)
+                self.hash[daun].append(nilai)
+
+    def isi_bucket(self, daftar_daun):
+        return {nim: nilai for daun in daftar_daun for nim, nilai in zip(self.bucket[daun], self.hash[daun])}
+
+class PeerLokal:
+    def __init__(self, store):
+        self.store = store
+
+    def info(self):
+        arsip = sorted(self.store.arsip.segmen) if self.store.arsip is not None else []
+        return {"jumlah": len(self.store), "kedalaman": kedalaman_merkle(len(self.store)), "arsip": arsip}
+
+    def simpul(self, kedalaman, tingkat, indeks):
+        isi = self.store.merkle(kedalaman).tingkat[tingkat]
+        return [isi[i] for i in indeks]
+
+    def bucket(self, kedalaman, daun):
+        return self.store.merkle(kedalaman).isi_bucket(daun)
+
+    def ambil(self, nims):
+        return {nim: dict(self.store[nim]) for nim in nims if nim in self.store}
+
+    def terapkan(self, perubahan):
+        return len(self.store.terapkan_batch(validasi_perubahan(perubahan)))
+
+class PeerRemote:
+    def __init__(self, host, port, timeout=60):
+        self._soket = socket.create_connection((host, port), timeout)
+        self._berkas = self._soket.makefile("rwb")
+        self.byte = 0
+
+    def _minta(self, aksi, **data):
+        baris = f"merkle {aksi} {json.dumps(data, ensure_ascii=False)}\n".encode("utf-8")
+        self._berkas.write(baris)
+        self._berkas.flush()
+        jawaban = self._berkas.readline()
+        self.byte += len(baris) + len(jawaban)
+        if not jawaban:
+            raise OSError("Koneksi ke instance lain terputus")
+        jawaban = json.loads(jawaban)
+        if not jawaban["ok"]:
+            raise ValueError(f"Instance lain menolak: {jawaban['error']}")
+        return json.loads(jawaban["keluaran"])
+
+    def info(self):
+        return self._minta("info")
+
+    def simpul(self, kedalaman, tingkat, indeks):
+        return self._minta("simpul", kedalaman=kedalaman, tingkat=tingkat, indeks=indeks)
+
+    def bucket(self, kedalaman, daun):
+        return self._minta("bucket", kedalaman=kedalaman, daun=daun)
+
+    def ambil(self, nims):
+        return self._minta("ambil", nims=nims)
+
+    def terapkan(self, perubahan):
+        return self._minta("terapkan", perubahan=perubahan)
+
+    def tutup(self):
+        self._berkas.close()
+        self._soket.close()
+
+@diukur("sync")
+def sinkronkan(store, peer, arah='gabung'):
+    if arah not in ARAH_SYNC:
+        raise ValueError(f"Arah sync harus salah satu dari {', '.join(ARAH_SYNC)}")
+    info = peer.info()
+    if info.get("arsip") or PeerLokal(store).info()["arsip"]:
+        raise ValueError("Sync membutuhkan semua angkatan di memori, jalankan kedua instance dengan --angkatan-panas 0")
+    kedalaman = max(kedalaman_merkle(len(store)), info["kedalaman"])
+    pohon = store.merkle(kedalaman)
+    laporan = {"putaran": 1, "simpul": 0, "berbeda": 0, "diterima": 0, "dikirim": 0, "konflik": []}
+
+    # Turun per tingkat, hanya anak dari simpul yang hash-nya berbeda yang diminta.
+    beda = [0]
+    for tingkat in range(kedalaman + 1):
+        indeks = beda if tingkat == 0 else [i * FANOUT_MERKLE + j for i in beda for j in range(FANOUT_MERKLE)]
+        isi = pohon.tingkat[tingkat]
+        beda = [i for i, nilai in zip(indeks, peer.simpul(kedalaman, tingkat, indeks)) if isi[i] != nilai]
+        laporan["putaran"] += 1
+        laporan["simpul"] += len(indeks)
+        if not beda:
+            return laporan
+
+    hash_remote = peer.bucket(kedalaman, beda)
+    hash_lokal = pohon.isi_bucket(beda)
+    laporan["putaran"] += 1
+    hanya_lokal = [nim for nim in hash_lokal if nim not in hash_remote]
+    hanya_remote = [nim for nim in hash_remote if nim not in hash_lokal]
+    berbeda = [nim for nim, nilai in hash_lokal.items() if nim in hash_remote and hash_remote[nim] != nilai]
+    laporan["berbeda"] = len(hanya_lokal) + len(hanya_remote) + len(berbeda)
+
+    diminta = berbeda if arah == 'dorong' else hanya_remote + berbeda
+    record_remote = validasi_perubahan(peer.ambil(diminta)) if diminta else {}
+    record_remote = {nim: data for nim, data in record_remote.items() if nim in hash_remote and data is not None}
+    laporan["putaran"] += bool(diminta)
+    for nim in berbeda:
+        if nim in record_remote:
+            lokal = store[nim]
+            laporan["konflik"] += [[nim, kolom, lokal[kolom], record_remote[nim][kolom]]
+                                   for kolom in KOLOM_NILAI if lokal[kolom] != record_remote[nim][kolom]]
+
+    perubahan_lokal = {}
+    perubahan_remote = {}
+    if arah == 'tarik':
+        perubahan_lokal = dict(record_remote, **{nim: None for nim in hanya_lokal})
+    elif arah == 'dorong':
+        perubahan_remote = {nim: dict(store[nim]) for nim in hanya_lokal + berbeda}
+        perubahan_remote.update({nim: None for nim in hanya_remote})
+    else:
+        # Record yang ada di kedua sisi tapi berbeda tidak ditimpa, hanya dilaporkan.
+        perubahan_lokal = {nim: record_remote[nim] for nim in hanya_remote if nim in record_remote}
+        perubahan_remote = {nim: dict(store[nim]) for nim in hanya_lokal}
+    if perubahan_lokal:
+        laporan["diterima"] = len(store.terapkan_batch(perubahan_lokal))
+    if perubahan_remote:
+        laporan["dikirim"] = peer.terapkan(perubahan_remote)
+        laporan["putaran"] += 1
+    return laporan
+
+class PenyimpananMahasiswa:
+    def __init__(self, folder=FOLDER_DATA, batas_fsync=64, interval_fsync=1.0, batas_kompaksi=50000,
+                 angkatan_panas=ANGKATAN_PANAS_DEFAULT, arsip_dimuat=ARSIP_DIMUAT_DEFAULT, batas_segmen=16):
+        self.folder = folder
+        self.batas_fsync = batas_fsync
+        self.interval_fsync = interval_fsync
+        self.batas_kompaksi = batas_kompaksi
+        self.batas_segmen = batas_segmen
+        self.angkatan_panas = angkatan_panas
+        self.arsip_dimuat = arsip_dimuat
+        self._log = None
+        self._generasi = 0
+        self._jumlah_log = 0
+        self._sejak_snapshot = 0
+        self._belum_fsync = 0
+        self._kunci = threading.Lock()
+        self._berhenti = threading.Event()
+        self._penjaga = None
+        self._kompaksi = None
+        self._kompaksi_tujuan = 0
+        self._kunci_kompaksi = threading.Lock()
+        self._dipetakan = None
+        self.aliran = None
+        self.arsip = None
+
+    def _path(self, jenis, generasi):
+        return os.path.join(self.folder, f"{jenis}-{generasi:08d}{EKSTENSI_FILE[jenis]}")
+
+    def _daftar(self, jenis):
+        generasi = []
+        for nama_file in os.listdir(self.folder):
+            if nama_file.startswith(jenis + "-") and nama_file.endswith(EKSTENSI_FILE[jenis]):
+                generasi.append(int(nama_file[len(jenis) + 1:-len(EKSTENSI_FILE[jenis])]))
+        return sorted(generasi)
+
+    def _baca_log(self, generasi):
+        with open(self._path("wal", generasi), encoding="utf-8") as f:
+            for baris in f:
+                try:
+                    event = json.loads(baris)
+                except json.JSONDecodeError:
+                    break
+                if isinstance(event[0], list):
+                    yield from map(tuple, event)
+                else:
+                    yield tuple(event)
+
+    def _terapkan(self, store, event):
+        op = event[0]
+        if op not in OP_ARSIP:
+            terapkan_event(store, event)
+            return None
+        angkatan, nama_file = event[4]["angkatan"], event[4]["file"]
+        if op == 'arsip':
+            for nim in nim_angkatan(store, angkatan):
+                del store[nim]
+        else:
+            segmen = baca_segmen(os.path.join(self.folder, FOLDER_ARSIP, nama_file))
+            for baris in segmen.iter_baris(segmen):
+                store[baris[0]] = dict(zip(KOLOM_DATA, baris[1:]))
+        return nama_file
+
+    def muat(self, data_awal=None):
+        os.makedirs(self.folder, exist_ok=True)
+        snapshots = self._daftar("snapshot")
+        if snapshots:
+            self._dipetakan = self._path("snapshot", snapshots[-1])
+            store, dasar = buka_snapshot(self._dipetakan)
+        else:
+            dasar = 0
+            store = DataMahasiswa(data_awal)
+            tulis_snapshot(self._path("snapshot", dasar), store, dasar)
+
+        logs = [generasi for generasi in self._daftar("wal") if generasi >= dasar]
+        segmen_wal = set()
+        diputar = 0
+        for generasi in logs:
+            for event in self._baca_log(generasi):
+                segmen_wal.add(self._terapkan(store, event))
+                diputar += 1
+        self._bersihkan(dasar)
+
+        self._generasi = max(logs[-1] + 1 if logs else dasar, dasar)
+        self._log = open(self._path("wal", self._generasi), "a", encoding="utf-8")
+        self._jumlah_log = 0
+        self._sejak_snapshot = diputar
+        # Tiap proses CLI membuka segmen WAL baru; tanpa ini segmen dan event yang diputar ulang
+        # terus menumpuk karena tidak ada satu proses pun yang mencapai batas_kompaksi sendirian.
+        if diputar >= self.batas_kompaksi or len(logs) >= self.batas_segmen:
+            self._sejak_snapshot = 0
+            self._mulai_kompaksi(self._generasi)
+        store.pendengar.append(self.catat)
+        self.aliran = pasang_aliran(store, os.path.join(self.folder, FILE_PERUBAHAN))
+        folder_arsip = os.path.join(self.folder, FOLDER_ARSIP)
+        if self.angkatan_panas > 0 or os.path.isdir(folder_arsip):
+            arsip = ArsipAngkatan(store, folder_arsip, self.catat_sinkron, self.angkatan_panas, self.arsip_dimuat,
+                                  segmen_wal)
+            store.arsip = arsip
+            arsip.rapikan()
+            if self.angkatan_panas <= 0:
+                arsip.tutup()
+            else:
+                self.arsip = arsip
+
+        self._penjaga = threading.Thread(target=self._fsync_berkala, daemon=True)
+        self._penjaga.start()
+        return store
+
+    @diukur("io.wal")
+    def catat(self, events):
+        with self._kunci:
+            baris = events[0] if len(events) == 1 else events
+            self._log.write(json.dumps(baris, ensure_ascii=False) + "\n")
+            self._log.flush()
+            self._belum_fsync += len(events)
+            self._jumlah_log += len(events)
+            self._sejak_snapshot += len(events)
+            if self._belum_fsync >= self.batas_fsync:
+                self._fsync()
+            if self._sejak_snapshot >= self.batas_kompaksi:
+                self._rotasi()
+
+    def catat_sinkron(self, events):
+        # Event pindah tier harus sudah di disk sebelum manifest arsip berubah.
+        self.catat(events)
+        with self._kunci:
+            self._fsync()
+
+    def _fsync(self):
+        if self._belum_fsync:
+            os.fsync(self._log.fileno())
+            self._belum_fsync = 0
+
+    def _fsync_berkala(self):
+        while not self._berhenti.wait(self.interval_fsync):
+            with self._kunci:
+                if self._log is not None:
+                    self._fsync()
+
+    def _rotasi(self):
+        self._fsync()
+        self._log.close()
+        self._generasi += 1
+        self._log = open(self._path("wal", self._generasi), "a", encoding="utf-8")
+        self._jumlah_log = 0
+        self._sejak_snapshot = 0
+        self._mulai_kompaksi(self._generasi)
+
+    def _mulai_kompaksi(self, generasi):
+        # Rotasi saat kompaksi masih berjalan tidak dibuang; thread yang sama menyusul ke generasi terbaru.
+        with self._kunci_kompaksi:
+            self._kompaksi_tujuan = max(self._kompaksi_tujuan, generasi)
+            if self._kompaksi is None:
+                self._kompaksi = threading.Thread(target=self._kompaksi_berjalan)
+                self._kompaksi.start()
+
+    def _kompaksi_berjalan(self):
+        selesai = 0
+        while True:
+            with self._kunci_kompaksi:
+                generasi = self._kompaksi_tujuan
+                if generasi <= selesai:
+                    self._kompaksi = None
+                    return
+            try:
+                self._kompaksi_ke(generasi)
+            except BaseException:
+                with self._kunci_kompaksi:
+                    self._kompaksi = None
+                raise
+            selesai = generasi
+
+    def _kompaksi_ke(self, generasi):
+        dasar = max(g for g in self._daftar("snapshot") if g < generasi)
+        store, _ = buka_snapshot(self._path("snapshot", dasar))
+        try:
+            for generasi_log in self._daftar("wal"):
+                if dasar <= generasi_log < generasi:
+                    for event in self._baca_log(generasi_log):
+                        self._terapkan(store, event)
+            tulis_snapshot(self._path("snapshot", generasi), store, generasi)
+        finally:
+            tutup_snapshot(store)
+        self._bersihkan(generasi)
+
+    def _bersihkan(self, generasi):
+        for jenis in ("snapshot", "wal"):
+            for generasi_lama in self._daftar(jenis):
+                path = self._path(jenis, generasi_lama)
+                # Snapshot yang masih di-mmap store aktif baru dihapus saat folder dibuka berikutnya.
+                if generasi_lama < generasi and path != self._dipetakan:
+                    os.remove(path)
+
+    def tutup(self):
+        # Angkatan yang dimuat untuk query dikembalikan ke arsip (tanpa tulis ulang jika tidak berubah),
+        # supaya start berikutnya tidak perlu memuat lalu mengarsipkannya lagi.
+        if self.arsip is not None:
+            for angkatan in list(self.arsip.dimuat):
+                self.arsip.arsipkan(angkatan)
+            self.arsip.tutup()
+            self.arsip = None
+        self._berhenti.set()
+        kompaksi = self._kompaksi
+        if kompaksi is not None:
+            kompaksi.join()
+        if self.aliran is not None:
+            self.aliran.tutup()
+            self.aliran = None
+        with self._kunci:
+            if self._log is not None:
+                self._fsync()
+                self._log.close()
+                self._log = None
+                if self._jumlah_log == 0:
+                    os.remove(self._path("wal", self._generasi))
+
+def format_file(path):
+    return 'jsonl' if path.lower().endswith(('.jsonl', '.json')) else 'csv'
+
+def baca_file_mahasiswa(path):
+    with open(path, encoding="utf-8", newline="") as f:
+        if format_file(path) == 'jsonl':
+            for baris in f:
+                if not baris.strip():
+                    continue
+                try:
+                    data = json.loads(baris)
+                except ValueError:
+                    data = None
+                # Baris yang bukan objek JSON diteruskan apa adanya supaya ditolak validasi_chunk.
+                yield data if isinstance(data, dict) else baris.rstrip("\r\n")
+        else:
+            yield from csv.DictReader(f)
+
+def parse_kolom(kolom, teks):
+    if kolom not in SKEMA_KOLOM:
+        raise ValueError(f"Kolom {kolom} tidak dikenal")
+    return SKEMA_KOLOM[kolom].parse(teks)
+
+@diukur("validasi.chunk", hitung_hasil=True)
+def validasi_chunk(chunk, data_mahasiswa, nim_file):
+    if not chunk:
+        return []
+    if not all(isinstance(baris, dict) for baris in chunk):
+        objek = iter(validasi_chunk([baris for baris in chunk if isinstance(baris, dict)], data_mahasiswa, nim_file))
+        return [next(objek) if isinstance(baris, dict) else (None, "Baris bukan objek JSON yang valid")
+                for baris in chunk]
+    # Baris dipecah menjadi kolom sekali (itemgetter di C), lalu tiap kolom divalidasi sekaligus.
+    try:
+        kolom_mentah = list(zip(*map(operator.itemgetter(*KOLOM_FILE), chunk)))
+    except KeyError:
+        kolom_mentah = list(zip(*([baris.get(kolom) for kolom in KOLOM_FILE] for baris in chunk)))
+    alasan = [None] * len(chunk)
+    kolom_nilai = []
+    for kolom, mentah in reversed(list(zip(SKEMA, kolom_mentah[1:]))):
+        nilai = kolom.parse_banyak(mentah)
+        if None in nilai:
+            for i, isi in enumerate(nilai):
+                if isi is None:
+                    alasan[i] = kolom.pesan
+        kolom_nilai.append(nilai)
+    kolom_nilai.reverse()
+
+    hasil = []
+    for nim, record, gagal in zip(strip_semua(kolom_mentah[0]), zip(*kolom_nilai), alasan):
+        nim = nim.upper()
+        if not nim or nim in nim_file or data_mahasiswa.ada(nim):
+            hasil.append((None, "NIM kosong atau sudah ada"))
+        elif gagal is not None:
+            hasil.append((None, gagal))
+        else:
+            nim_file.add(nim)
+            hasil.append(((nim, dict(zip(KOLOM_DATA, record))), None))
+    return hasil
+
+def validasi_baris(baris, data_mahasiswa, nim_file):
+    return validasi_chunk([baris], data_mahasiswa, nim_file)[0]
+
+def validasi_record(nim, data):
+    if not isinstance(nim, str) or not nim or nim != nim.strip().upper():
+        raise ValueError(f"NIM {nim!r} tidak valid")
+    if not isinstance(data, dict):
+        raise ValueError(f"Record {nim} tidak valid")
+    try:
+        return {kolom.nama: kolom.parse(data.get(kolom.nama, kolom.default)) for kolom in SKEMA}
+    except ValueError as e:
+        raise ValueError(f"Record {nim}: {e}") from None
+
+def validasi_perubahan(perubahan):
+    # Record dari instance lain divalidasi seluruhnya sebelum satu pun diterapkan.
+    if not isinstance(perubahan, dict):
+        raise ValueError("Perubahan harus berupa objek NIM -> record")
+    return {nim: None if data is None else validasi_record(nim, data) for nim, data in perubahan.items()}
+
+@diukur("io.import")
+def import_data(data_mahasiswa, path, path_tolak=None):
+    if path_tolak is None:
+        path_tolak = os.path.splitext(path)[0] + "_tolak" + os.path.splitext(path)[1]
+    diterima = []
+    ditolak = 0
+    nim_file = set()
+    baris_file = baca_file_mahasiswa(path)
+
+    with open(path_tolak, "w", encoding="utf-8", newline="") as f_tolak:
+        penulis_csv = None
+        if format_file(path_tolak) == 'csv':
+            penulis_csv = csv.DictWriter(f_tolak, fieldnames=KOLOM_FILE + ['alasan'], extrasaction='ignore')
+            penulis_csv.writeheader()
+        while True:
+            chunk = list(islice(baris_file, UKURAN_CHUNK))
+            if not chunk:
+                break
+            for baris, (hasil, alasan) in zip(chunk, validasi_chunk(chunk, data_mahasiswa, nim_file)):
+                if hasil is not None:
+                    diterima.append(hasil)
+                    continue
+                ditolak += 1
+                baris = dict(baris, alasan=alasan) if isinstance(baris, dict) else {'baris': baris, 'alasan': alasan}
+                if penulis_csv is not None:
+                    penulis_csv.writerow(baris)
+                else:
+                    f_tolak.write(json.dumps(baris, ensure_ascii=False) + "\n")
+
+    if not ditolak:
+        os.remove(path_tolak)
+    return data_mahasiswa.tambah_banyak(diterima), ditolak, path_tolak
+
+@diukur("io.export")
+def tulis_data(data_mahasiswa, f, format_data, nims=None):
+    jumlah = 0
+    penulis_csv = None
+    if format_data == 'csv':
+        penulis_csv = csv.writer(f)
+        penulis_csv.writerow(KOLOM_FILE)
+    for store, grup in data_mahasiswa.kelompok_nim(data_mahasiswa.semua_nim() if nims is None else nims):
+        for baris in store.iter_baris(grup):
+            if penulis_csv is not None:
+                penulis_csv.writerow(baris)
+            else:
+                f.write(json.dumps(dict(zip(KOLOM_DATA, baris[1:]), nim=baris[0]), ensure_ascii=False) + "\n")
+            jumlah += 1
+    return jumlah
+
+def export_data(data_mahasiswa, path, nims=None):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        return tulis_data(data_mahasiswa, f, format_file(path), nims)
+
+def api_tambah(data_mahasiswa, nilai):
+    hasil, alasan = validasi_baris(nilai, data_mahasiswa, set())
+    if hasil is None:
+        raise ValueError(alasan)
+    nim, data = hasil
+    data_mahasiswa[nim] = data
+    return nim
+
+def api_ubah(data_mahasiswa, nim, perubahan):
+    nim = nim.upper()
+    data_mahasiswa.muat_nim(nim)
+    if nim not in data_mahasiswa:
+        raise ValueError(f"Data dengan NIM {nim} tidak ditemukan")
+    transaksi = Transaksi(data_mahasiswa)
+    for kolom, teks in perubahan.items():
+        transaksi.ubah(nim, kolom, parse_kolom(kolom, teks))
+    transaksi.commit()
+    return nim
+
+def api_hapus(data_mahasiswa, nims):
+    transaksi = Transaksi(data_mahasiswa)
+    for nim in nims:
+        transaksi.hapus(nim.upper())
+    return transaksi.commit()
+
+class Predikat:
+    __slots__ = ('kolom', 'op', 'nilai', 'kunci', 'awalan')
+
+    def __init__(self, kolom, op, nilai):
+        if kolom not in KOLOM_FILE:
+            raise ValueError(f"Kolom {kolom} tidak dikenal")
+        if op not in OPERATOR_QUERY:
+            raise ValueError(f"Operator {op} tidak dikenal")
+        if kolom in KOLOM_ANGKA and op != '~':
+            if not str(nilai).strip().isdigit():
+                raise ValueError(f"Nilai untuk {kolom} harus berupa angka")
+            nilai = int(nilai)
+        elif kolom == 'nim' and op != '~':
+            nilai = normalisasi(nilai).upper()
+        elif op in ('<', '<=', '>', '>='):
+            raise ValueError(f"Operator {op} hanya untuk nim, angkatan, dan modul")
+        self.kolom = kolom
+        self.op = op
+        self.nilai = nilai
+        self.kunci = normalisasi(nilai)
+        # nim=MH2023* berarti semua NIM dengan awalan MH2023.
+        self.awalan = kolom == 'nim' and op in ('=', '!=') and nilai.endswith('*')
+
+    def uji(self, nilai):
+        if self.op == '~':
+            return self.kunci in normalisasi(nilai)
+        if self.kolom == 'nim':
+            nim = str(nilai).upper()
+            if self.awalan:
+                return nim.startswith(self.nilai[:-1]) == (self.op == '=')
+            return OPERATOR_QUERY[self.op](nim, self.nilai)
+        if self.kolom in KOLOM_ANGKA:
+            return OPERATOR_QUERY[self.op](nilai, self.nilai)
+        return OPERATOR_QUERY[self.op](normalisasi(nilai), self.kunci)
+
+    def __repr__(self):
+        return f"{self.kolom} {self.op} {self.nilai!r}"
+
+class Gabungan:
+    __slots__ = ('op', 'anak')
+
+    def __init__(self, op, anak):
+        self.op = op
+        self.anak = anak
+
+    def __repr__(self):
+        return "(" + f" {self.op.upper()} ".join(map(repr, self.anak)) + ")"
+
+def token_query(teks):
+    posisi = 0
+    token = []
+    teks = teks.strip()
+    while posisi < len(teks):
+        cocok = TOKEN_QUERY.match(teks, posisi)
+        if not cocok or cocok.end() == posisi:
+            raise ValueError(f"Query tidak valid di dekat '{teks[posisi:]}'")
+        posisi = cocok.end()
+        jenis = cocok.lastgroup
+        nilai = cocok.group(jenis)
+        if jenis == 'kutip':
+            token.append(('nilai', nilai[1:-1]))
+        elif jenis == 'kata' and nilai.lower() in KATA_QUERY:
+            token.append(('logika', KATA_QUERY[nilai.lower()]))
+        else:
+            token.append((jenis, nilai))
+    return token
+
+def parse_query(teks):
+    token = token_query(teks)
+    posisi = 0
+
+    def lihat():
+        return token[posisi] if posisi < len(token) else (None, None)
+
+    def ambil():
+        nonlocal posisi
+        posisi += 1
+        return token[posisi - 1]
+
+    def ekspresi():
+        anak = [suku()]
+        while lihat() == ('logika', 'or'):
+            ambil()
+            anak.append(suku())
+        return anak[0] if len(anak) == 1 else Gabungan('or', anak)
+
+    def suku():
+        anak = [faktor()]
+        while lihat() == ('logika', 'and'):
+            ambil()
+            anak.append(faktor())
+        return anak[0] if len(anak) == 1 else Gabungan('and', anak)
+
+    def faktor():
+        jenis, nilai = lihat()
+        if (jenis, nilai) == ('kurung', '('):
+            ambil()
+            hasil = ekspresi()
+            if ambil_jika('kurung', ')') is None:
+                raise ValueError("Kurung tutup ')' tidak ditemukan")
+            return hasil
+        if jenis != 'kata':
+            raise ValueError("Query harus berbentuk kolom operator nilai")
+        kolom = ambil()[1].lower()
+        jenis, op = lihat()
+        if jenis != 'op':
+            raise ValueError(f"Operator setelah {kolom} tidak ditemukan")
+        ambil()
+        bagian = []
+        while lihat()[0] in ('kata', 'nilai'):
+            bagian.append(ambil()[1])
+        if not bagian:
+            raise ValueError(f"Nilai untuk {kolom} tidak ditemukan")
+        return Predikat(kolom, op, " ".join(bagian))
+
+    def ambil_jika(jenis, nilai):
+        if lihat() == (jenis, nilai):
+            return ambil()
+        return None
+
+    if not token:
+        raise ValueError("Query tidak boleh kosong")
+    hasil = ekspresi()
+    if posisi != len(token):
+        raise ValueError(f"Token '{token[posisi][1]}' tidak terduga")
+    return hasil
+
+def nilai_record(data_mahasiswa, nim, kolom):
+    return nim if kolom == 'nim' else data_mahasiswa.ambil(nim, kolom)
+
+def uji_record(data_mahasiswa, nim, node):
+    if isinstance(node, Predikat):
+        return node.uji(nilai_record(data_mahasiswa, nim, node.kolom))
+    if node.op == 'and':
+        return all(uji_record(data_mahasiswa, nim, anak) for anak in node.anak)
+    return any(uji_record(data_mahasiswa, nim, anak) for anak in node.anak)
+
+def perkiraan(data_mahasiswa, node):
+    total = len(data_mahasiswa)
+    if isinstance(node, Gabungan):
+        nilai = [perkiraan(data_mahasiswa, anak) for anak in node.anak]
+        return min(nilai) if node.op == 'and' else min(total, sum(nilai))
+    if node.op == '!=':
+        return max(0, total - perkiraan(data_mahasiswa, Predikat(node.kolom, '=', node.nilai)))
+    if node.kolom == 'nim' and node.op == '=' and not node.awalan:
+        return 1
+    if node.kolom == 'nim' and node.op != '~':
+        return data_mahasiswa.indeks_nim.hitung(*data_mahasiswa.indeks_nim.rentang(node))
+
+    indeks = data_mahasiswa.indeks
+    if node.kolom in indeks.kategori:
+        postings = indeks.kategori[node.kolom]
+        if node.op == '=':
+            return len(postings.get(node.kunci, ()))
+        if node.op == '~':
+            return sum(len(nims) for kunci, nims in postings.items() if node.kunci in kunci)
+        return sum(len(nims) for kunci, nims in postings.items() if node.uji(int(kunci)))
+    if node.kolom in indeks.teks:
+        grams = ngram(node.kunci)
+        if not grams:
+            return total
+        return min(len(indeks.gram[node.kolom].get(gram, ())) for gram in grams)
+    histogram = [0] * (SKEMA_KOLOM[node.kolom].maksimum + 1)
+    for grup in data_mahasiswa.statistik.grup['jadwal'].values():
+        for skor, jumlah in enumerate(grup[node.kolom]):
+            histogram[skor] += jumlah
+    return sum(jumlah for skor, jumlah in enumerate(histogram) if node.uji(skor))
+
+def himpunan(data_mahasiswa, node):
+    if node.op == '!=':
+        return set(data_mahasiswa) - himpunan(data_mahasiswa, Predikat(node.kolom, '=', node.nilai))
+    if node.kolom == 'nim' and node.op == '=' and not node.awalan:
+        nim = node.nilai.upper()
+        return {nim} if nim in data_mahasiswa else set()
+    if node.kolom == 'nim' and node.op != '~':
+        hasil = set(data_mahasiswa.indeks_nim.potong(*data_mahasiswa.indeks_nim.rentang(node)))
+        hitung("indeks.nim", len(hasil), len(hasil))
+        return hasil
+
+    indeks = data_mahasiswa.indeks
+    if node.kolom in indeks.kategori:
+        postings = indeks.kategori[node.kolom]
+        if node.op == '=':
+            return set(postings.get(node.kunci, ()))
+        if node.op == '~':
+            return indeks.cari(node.kolom, node.kunci)
+        hasil = set()
+        for kunci, nims in postings.items():
+            if node.uji(int(kunci)):
+                hasil |= nims
+        return hasil
+    if node.kolom in indeks.teks:
+        kandidat = indeks.cari(node.kolom, node.kunci)
+        if node.op == '~':
+            return kandidat
+        return {nim for nim in kandidat if indeks.teks[node.kolom][nim] == node.kunci}
+
+    isi = data_mahasiswa.kolom[node.kolom]
+    hitung("query", dipindai=len(data_mahasiswa))
+    if np is not None and node.op != '~':
+        skor = np.frombuffer(isi, dtype=SKEMA_KOLOM[node.kolom].typecode)
+        slots = np.flatnonzero(OPERATOR_QUERY[node.op](skor, node.nilai)).tolist()
+        kosong = data_mahasiswa.slot_kosong
+        return {data_mahasiswa.nims[slot] for slot in slots if slot not in kosong}
+    return {nim for slot, nim in enumerate(data_mahasiswa.nims) if nim is not None and node.uji(isi[slot])}
+
+def evaluasi_query(data_mahasiswa, node, kandidat=None):
+    if isinstance(node, Gabungan):
+        if node.op == 'or':
+            hasil = set()
+            for anak in node.anak:
+                hasil |= evaluasi_query(data_mahasiswa, anak, kandidat)
+            return hasil
+        for anak in sorted(node.anak, key=lambda anak: perkiraan(data_mahasiswa, anak)):
+            kandidat = evaluasi_query(data_mahasiswa, anak, kandidat)
+            if not kandidat:
+                return set()
+        return kandidat
+
+    if kandidat is not None and len(kandidat) <= perkiraan(data_mahasiswa, node):
+        hitung("query", dipindai=len(kandidat))
+        return {nim for nim in kandidat if uji_record(data_mahasiswa, nim, node)}
+    hasil = himpunan(data_mahasiswa, node)
+    return hasil if kandidat is None else kandidat & hasil
+
+def perlu_scan(data_mahasiswa, node):
+    # Rentang NIM dijawab indeks terurut (log N + k), tidak perlu scan shard.
+    if isinstance(node, Predikat) and node.kolom == 'nim' and node.op not in ('~', '!='):
+        return False
+    # Tanpa indeks di memori tidak ada perencana; dengan indeks, shard hanya dipindai jika
+    # perkiraan kandidatnya mendekati scan penuh.
+    if data_mahasiswa._indeks is None:
+        return True
+    return perkiraan(data_mahasiswa, node) >= len(data_mahasiswa) * RASIO_SCAN_PARALEL
+
+def query_memori(data_mahasiswa, node):
+    if data_mahasiswa.baca_saja:
+        return pindai_store(data_mahasiswa, node)
+    if (data_mahasiswa.paralel is not None and len(data_mahasiswa) >= BATAS_PARALEL
+            and perlu_scan(data_mahasiswa, node)):
+        return data_mahasiswa.paralel.query(data_mahasiswa, node)
+    return data_mahasiswa.urutkan(evaluasi_query(data_mahasiswa, node))
+
+def nim_arsip(data_mahasiswa, node):
+    if data_mahasiswa.arsip is None:
+        return []
+    return [nim for _, nims in data_mahasiswa.arsip.query(node) for nim in nims]
+
+@diukur("query", hitung_hasil=True)
+def jalankan_query(data_mahasiswa, node):
+    # Hasil angkatan di memori dulu (urut slot), lalu angkatan arsip per segmen.
+    return query_memori(data_mahasiswa, node) + nim_arsip(data_mahasiswa, node)
+
+def parse_kondisi(teks_kondisi):
+    return [parse_query(teks) for teks in teks_kondisi]
+
+def api_query(data_mahasiswa, kondisi):
+    anak = [Predikat(*node) if isinstance(node, tuple) else node for node in kondisi]
+    if not anak:
+        return list(data_mahasiswa)
+    return jalankan_query(data_mahasiswa, anak[0] if len(anak) == 1 else Gabungan('and', anak))
+
+def pencarian_nama(data_mahasiswa, teks, k=BATAS_FUZZY):
+    # Semua nama yang memuat kata kunci ikut tanpa batas; fuzzy hanya menambah saran di belakangnya.
+    cocok = jalankan_query(data_mahasiswa, Predikat('nama', '~', teks))
+    if len(normalisasi(teks)) < PANJANG_NGRAM:
+        return cocok, []
+    sudah = set(cocok)
+    return cocok, [(nim, skor) for nim, skor in data_mahasiswa.cari_nama(teks, k) if nim not in sudah]
+
+def input_query():
+    print("\nContoh: program = \"Digital Marketing\" AND (modul_2 < 60 OR nama ~ wijaya)")
+    print(f"Kolom: {', '.join(KOLOM_FILE)} | Operator: {' '.join(OPERATOR_QUERY)} | Logika: AND, OR")
+    while True:
+        teks = input("Masukkan query: ").strip()
+        try:
+            return teks, parse_query(teks)
+        except ValueError as e:
+            print(f"{e}!")
+
+def kompilasi_predikat(store, node):
+    if isinstance(node, Gabungan):
+        uji_anak = [kompilasi_predikat(store, anak) for anak in node.anak]
+        gabung = all if node.op == 'and' else any
+        return lambda slot: gabung(uji(slot) for uji in uji_anak)
+    if node.kolom in KOLOM_TEKS:
+        teks = store.nims if node.kolom == 'nim' else store.nama
+        return lambda slot: node.uji(teks[slot])
+    isi = store.kolom[node.kolom]
+    if node.kolom in store.kode:
+        diterima = {nomor for nomor, nilai in enumerate(store.kode[node.kolom]) if node.uji(nilai)}
+    elif node.kolom in KOLOM_NILAI:
+        kolom = SKEMA_KOLOM[node.kolom]
+        diterima = {nilai for nilai in range(kolom.minimum, kolom.maksimum + 1) if node.uji(nilai)}
+    else:
+        return lambda slot: node.uji(isi[slot])
+    return lambda slot: isi[slot] in diterima
+
+def mask_predikat(store, node, awal, akhir, aktif):
+    if isinstance(node, Gabungan):
+        if node.op == 'or':
+            mask = np.zeros(akhir - awal, dtype=bool)
+            for anak in node.anak:
+                mask |= mask_predikat(store, anak, awal, akhir, aktif & ~mask)
+            return mask
+        mask = aktif.copy()
+        # Kolom kode dievaluasi dulu supaya predikat teks hanya mengecek baris yang tersisa.
+        for anak in sorted(node.anak, key=lambda anak: isinstance(anak, Gabungan) or anak.kolom in KOLOM_TEKS):
+            mask &= mask_predikat(store, anak, awal, akhir, mask)
+            if not mask.any():
+                break
+        return mask
+
+    if node.kolom in KOLOM_TEKS:
+        teks = store.nims if node.kolom == 'nim' else store.nama
+        mask = np.zeros(akhir - awal, dtype=bool)
+        for i in np.flatnonzero(aktif).tolist():
+            mask[i] = node.uji(teks[awal + i])
+        return mask
+    isi = np.frombuffer(store.kolom[node.kolom], dtype=SKEMA_KOLOM[node.kolom].typecode)[awal:akhir]
+    if node.kolom in store.kode:
+        diterima = [nomor for nomor, nilai in enumerate(store.kode[node.kolom]) if node.uji(nilai)]
+    else:
+        diterima = [int(nilai) for nilai in np.unique(isi) if node.uji(int(nilai))]
+    tabel = np.zeros(1 << (8 * isi.itemsize), dtype=bool)
+    tabel[diterima] = True
+    return tabel[isi] & aktif
+
+_SNAPSHOT_PEKERJA = {}
+
+def _snapshot_pekerja(path):
+    store = _SNAPSHOT_PEKERJA.get(path)
+    if store is None:
+        _SNAPSHOT_PEKERJA.clear()
+        store, _ = buka_snapshot(path)
+        _SNAPSHOT_PEKERJA[path] = store
+    return store
+
+def pindai_store(store, node, awal=0, akhir=None):
+    akhir = len(store.nims) if akhir is None else akhir
+    if np is not None:
+        slots = (np.flatnonzero(mask_predikat(store, node, awal, akhir, np.ones(akhir - awal, dtype=bool)))
+                 + awal).tolist()
+    else:
+        uji = kompilasi_predikat(store, node)
+        slots = [slot for slot in range(awal, akhir) if uji(slot)]
+    kosong = store.slot_kosong
+    return [store.nims[slot] for slot in slots if slot not in kosong]
+
+def _query_shard(path, node, awal, akhir):
+    return pindai_store(_snapshot_pekerja(path), node, awal, akhir)
+
+def _statistik_shard(path, awal, akhir):
+    return StatistikMahasiswa(_snapshot_pekerja(path), range(awal, akhir)).grup
+
+class PemindaiParalel:
+    def __init__(self, proses):
+        self.proses = proses
+        self._pool = ProcessPoolExecutor(max_workers=proses)
+        self._folder = tempfile.mkdtemp(prefix="mahasiswa-paralel-",
+                                        dir="/dev/shm" if os.path.isdir("/dev/shm") else None)
+        self._path = None
+        self._jumlah = 0
+        self._versi = None
+        self._berubah = set()
+        self._event = 0
+        self._store = None
+        self._kunci = threading.Lock()
+
+    def catat(self, events):
+        with self._kunci:
+            self._event += len(events)
+            self._berubah.update(event[1] for event in events)
+
+    def _snapshot(self, store, tepat=False):
+        # Pekerja membaca snapshot lewat mmap, jadi record tidak pernah di-pickle. Mutasi
+        # sesudahnya hanya dicatat per NIM dan dikoreksi di proses utama; snapshot baru
+        # diekspor jika perubahan sudah banyak, ada mutasi tanpa event (pindah tier,
+        # rollback), atau hasilnya harus tepat (statistik).
+        with self._kunci:
+            if self._store is not store:
+                if self._store is not None:
+                    self._store.pendengar.remove(self.catat)
+                store.pendengar.append(self.catat)
+                self._store = store
+                self._path = None
+            if self._path is not None and (store.versi - self._versi != self._event
+                                           or len(self._berubah) > self._jumlah * RASIO_DELTA_PARALEL
+                                           or (tepat and self._berubah) or not os.path.exists(self._path)):
+                self._path = None
+            if self._path is None:
+                self._ekspor(store)
+            return self._path, self._jumlah, set(self._berubah)
+
+    def _ekspor(self, store):
+        # Snapshot asal dipakai langsung selama store belum berubah sejak dibuka.
+        if store.sumber is not None and store.versi == 0 and os.path.exists(store.sumber):
+            self._path = store.sumber
+        else:
+            self._path = os.path.join(self._folder, f"snapshot-{store.versi}.bin")
+            tulis_snapshot(self._path, store, 0)
+        for nama in os.listdir(self._folder):
+            if nama != os.path.basename(self._path):
+                os.remove(os.path.join(self._folder, nama))
+        self._jumlah = len(store)
+        self._versi = store.versi
+        self._berubah = set()
+        self._event = 0
+        hitung("paralel.ekspor", dipindai=self._jumlah)
+
+    def _shard(self, jumlah):
+        ukuran = max(1, -(-jumlah // (self.proses * SHARD_PER_PROSES)))
+        return [(awal, min(jumlah, awal + ukuran)) for awal in range(0, jumlah, ukuran)]
+
+    @diukur("paralel.query", hitung_hasil=True)
+    def query(self, store, node):
+        path, jumlah, berubah = self._snapshot(store)
+        shard = self._shard(jumlah)
+        hasil = self._pool.map(_query_shard, [path] * len(shard), [node] * len(shard),
+                               *zip(*shard))
+        hitung("paralel.query", dipindai=jumlah)
+        hasil = [nim for bagian in hasil for nim in bagian if nim not in berubah]
+        if not berubah:
+            return hasil
+        # Slot baru selalu di belakang dan pemadatan menjaga urutan, jadi hasil snapshot tetap
+        # urut slot dan cukup digabung dengan NIM yang berubah.
+        cocok = store.urutkan(nim for nim in berubah if nim in store and uji_record(store, nim, node))
+        return list(heapq.merge(hasil, cocok, key=store.posisi.__getitem__))
+
+    @diukur("paralel.statistik")
+    def statistik(self, store):
+        path, jumlah, _ = self._snapshot(store, tepat=True)
+        shard = self._shard(jumlah)
+        return list(self._pool.map(_statistik_shard, [path] * len(shard), *zip(*shard)))
+
+    def tutup(self):
+        if self._store is not None:
+            self._store.pendengar.remove(self.catat)
+            self._store = None
+        self._pool.shutdown()
+        shutil.rmtree(self._folder, ignore_errors=True)
+
+@diukur("ranking", hitung_hasil=True)
+def ranking(data_mahasiswa, kunci, k, terbawah=False, kondisi=None):
+    if kunci not in KUNCI_RANKING:
+        raise ValueError(f"Kunci ranking {kunci} tidak dikenal")
+    if k <= 0:
+        return []
+    anak = [Predikat(*node) if isinstance(node, tuple) else node for node in kondisi or []]
+    node = None if not anak else anak[0] if len(anak) == 1 else Gabungan('and', anak)
+    hasil = _ranking_store(data_mahasiswa, kunci, k, terbawah,
+                           None if node is None else query_memori(data_mahasiswa, node))
+    if data_mahasiswa.arsip is None or not data_mahasiswa.arsip.segmen:
+        return hasil
+
+    # Top-k tiap segmen arsip digabung dengan top-k angkatan di memori; urutan sumber menjaga
+    # urutan nilai seri sama seperti saat semua angkatan di memori.
+    kandidat = [(nim, skor) for nim, skor in zip(hasil, _skor_ranking(data_mahasiswa, kunci, hasil))]
+    for segmen, nims in data_mahasiswa.arsip.query(node):
+        teratas = _ranking_store(segmen, kunci, k, terbawah, None if node is None else nims)
+        kandidat += zip(teratas, _skor_ranking(segmen, kunci, teratas))
+    pilih = heapq.nsmallest if terbawah else heapq.nlargest
+    return [nim for nim, _ in pilih(k, kandidat, key=lambda item: item[1])]
+
+def _skor_ranking(store, kunci, nims):
+    kolom_skor = [store.kolom[kolom] for kolom in (KOLOM_NILAI if kunci == 'rata_rata' else [kunci])]
+    return [sum(isi[store.posisi[nim]] for isi in kolom_skor) for nim in nims]
+
+def _ranking_store(data_mahasiswa, kunci, k, terbawah, nims):
+    daftar_kolom = KOLOM_NILAI if kunci == 'rata_rata' else [kunci]
+    kolom_skor = [data_mahasiswa.kolom[kolom] for kolom in daftar_kolom]
+
+    if nims is not None:
+        slots = [data_mahasiswa.posisi[nim] for nim in nims]
+    elif np is not None:
+        return _ranking_numpy(data_mahasiswa, daftar_kolom, k, terbawah)
+    else:
+        slots = (slot for slot, nim in enumerate(data_mahasiswa.nims) if nim is not None)
+
+    def skor(slot):
+        return sum(isi[slot] for isi in kolom_skor)
+
+    pilih = heapq.nsmallest if terbawah else heapq.nlargest
+    return [data_mahasiswa.nims[slot] for slot in pilih(k, slots, key=skor)]
+
+def _ranking_numpy(data_mahasiswa, daftar_kolom, k, terbawah):
+    skor = sum(np.frombuffer(data_mahasiswa.kolom[kolom], dtype=SKEMA_KOLOM[kolom].typecode).astype(np.int64)
+               for kolom in daftar_kolom)
+    if not terbawah:
+        skor = -skor
+    if data_mahasiswa.slot_kosong:
+        skor[list(data_mahasiswa.slot_kosong)] = np.iinfo(np.int64).max
+    k = min(k, len(data_mahasiswa))
+    if k == 0:
+        return []
+    batas = np.partition(skor, k - 1)[k - 1]
+    kandidat = np.flatnonzero(skor < batas)
+    kandidat = np.concatenate([kandidat, np.flatnonzero(skor == batas)[:k - len(kandidat)]])
+    kandidat = kandidat[np.lexsort((kandidat, skor[kandidat]))]
+    return [data_mahasiswa.nims[int(slot)] for slot in kandidat]
+
+def tampilkan_ranking(data_mahasiswa):
+    pilihan_kunci = {str(i): kunci for i, kunci in enumerate(KUNCI_RANKING, 1)}
+    display_options("Ranking Berdasarkan", {k: v.replace('_', ' ').capitalize() for k, v in pilihan_kunci.items()})
+    pilih = input(f"\nPilih nilai ranking [1-{len(pilihan_kunci)}]: ").strip()
+    if pilih not in pilihan_kunci:
+        print("Pilihan tidak valid!\n")
+        return
+    kunci = pilihan_kunci[pilih]
+    terbawah = input_pilihan("Urutan Ranking:", {'1': "Top (nilai tertinggi)", '2': "Bottom (nilai terendah)"}) \
+        .startswith("Bottom")
+    k = int(input_valid("Jumlah mahasiswa yang ditampilkan (1-1000): ",
+                        partial(validate_digit_range, min_val=1, max_val=1000),
+                        "Masukkan angka 1 sampai 1000"))
+
+    kondisi = []
+    if input_valid("Filter berdasarkan Program? (Y/N): ", validate_yes_no,
+                   "Masukkan Y untuk Ya atau N untuk Tidak").lower() == 'y':
+        kondisi.append(('program', '=', input_kolom('program')))
+    if input_valid("Filter berdasarkan Angkatan? (Y/N): ", validate_yes_no,
+                   "Masukkan Y untuk Ya atau N untuk Tidak").lower() == 'y':
+        kondisi.append(('angkatan', '=', input_kolom('angkatan')))
+
+    hasil_nim = ranking(data_mahasiswa, kunci, k, terbawah, kondisi)
+    tampilkan_data(iter_rows(data_mahasiswa, hasil_nim))
 
 def input_mahasiswa(data_mahasiswa):
     nim = input_valid(
         "Masukkan NIM (unik): ",
-        validate_nim,
-        "NIM tidak boleh kosong atau sudah ada",
-        existing_nims=data_mahasiswa.keys()
-    )
-
-    nama = input_valid(
-    "Masukkan Nama: ",
-    validate_alpha_only,
-    "Nama tidak boleh kosong dan hanya boleh berisi huruf"
-)
-    gender = input_pilihan("Pilih Gender:", GENDER_OPTIONS)
-    program = input_program("")
-    
-    angkatan = int(input_valid(
-        "Masukkan Angkatan (4 digit, contoh 2023): ",
-        validate_four_digits,
-        "Angkatan harus berupa angka 4 digit"
-    ))
-
-    metode_belajar = input_pilihan("Pilih Metode Belajar:", METHOD_OPTIONS)
-    jadwal = input_pilihan("Pilih Jadwal:", SCHEDULE_OPTIONS)
-
-    print("")
-    modul_1 = input_modul(1)
-    modul_2 = input_modul(2)
-    modul_3 = input_modul(3)
-
-    return {
-        "nim": nim,
-        "nama": nama,
-        "gender": gender,
-        "program": program,
-        "angkatan": angkatan,
-        "metode_belajar": metode_belajar,
-        "jadwal": jadwal,
-        "modul_1": modul_1,
-        "modul_2": modul_2,
-        "modul_3": modul_3
-    }
-
+        partial(validate_nim, data_mahasiswa=data_mahasiswa),
+        "NIM tidak boleh kosong atau sudah ada"
+    ).upper()
+    data = {"nim": nim}
+    for kolom in KOLOM_DATA:
+        data[kolom] = input_kolom(kolom)
+    return data
+
+@diukur("menu.report")
 def report_data(data_mahasiswa):
-    kolom_dict = {
-        '1': 'nim',
-        '2': 'nama',
-        '3': 'gender',
-        '4': 'program',
-        '5': 'angkatan',
-        '6': 'metode_belajar',
-        '7': 'jadwal'
-    }
+    kolom_dict = {str(i): kolom for i, kolom in enumerate(KOLOM_TEKS + KOLOM_KATEGORI, 1)}
 
     while True:
         menu_items = [
             "Report Seluruh Data",
             "Report Data Tertentu",
+            "Export Data ke File (CSV/JSONL)",
+            "Statistik Nilai per Kelompok",
+            "Ranking Mahasiswa (Top/Bottom)",
+            "Report Query Lanjutan (AND/OR)",
             "Kembali Ke Menu Utama"
         ]
         display_menu("Menu Report Data Siswa", menu_items)
-        pilihan = input("Silakan Pilih Sub Menu Read Data [1-3]: ").strip()
+        pilihan = input("Silakan Pilih Sub Menu Read Data [1-7]: ").strip()
 
         if pilihan == '1':
-            rows = generate_rows(data_mahasiswa, data_mahasiswa.keys())
+            rows = iter_rows(data_mahasiswa, data_mahasiswa.semua_nim())
             tampilkan_data(rows)
 
         elif pilihan == '2':
-            kolom_options = {k: v.capitalize().replace('_', ' ') for k, v in kolom_dict.items()}
+            kolom_options = {k: HEADERS[0] if v == 'nim' else SKEMA_KOLOM[v].judul for k, v in kolom_dict.items()}
             display_options("Cari Berdasarkan", kolom_options)
-            kolom_pilih = input("\nPilih kolom pencarian [1-7]: ").strip()
+            kolom_pilih = input(f"\nPilih kolom pencarian [1-{len(kolom_dict)}]: ").strip()
 
             if kolom_pilih not in kolom_dict:
                 print("Pilihan kolom tidak valid!\n")
@@ -229,62 +3388,73 @@ def report_data(data_mahasiswa):
             kolom = kolom_dict[kolom_pilih]
             keyword = ""
 
-            if kolom == 'nim' or kolom == 'nama':
-                keyword = input("Masukkan kata kunci pencarian: ").replace(" ", "").lower()
-            
-            elif kolom == 'gender':
-                keyword = input_pilihan("Pilih Gender:", GENDER_OPTIONS)
-                keyword = keyword.replace(" ", "").lower()
-            
-            elif kolom == 'program':
-                keyword = input_program("")
-                keyword = keyword.replace(" ", "").lower()
-            
-            elif kolom == 'angkatan':
-                keyword = input_valid("Masukkan Angkatan (4 digit): ",
-                                      validate_four_digits,
-                                      "Angkatan harus berupa angka 4 digit")
-            
-            elif kolom == 'metode_belajar':
-                keyword = input_pilihan("Pilih Metode Belajar:", METHOD_OPTIONS)
-                keyword = keyword.replace(" ", "").lower()
-            
-            elif kolom == 'jadwal':
-                keyword = input_pilihan("Pilih Jadwal:", SCHEDULE_OPTIONS)
+            if kolom == 'nama':
+                keyword = input("Masukkan kata kunci pencarian: ").strip()
+                cocok, saran = pencarian_nama(data_mahasiswa, keyword)
+                if saran:
+                    tampilkan_kemiripan(data_mahasiswa, saran)
+                tampilkan_data(iter_rows(data_mahasiswa, cocok + [nim for nim, _ in saran]))
+                continue
+
+            elif kolom == 'nim':
+                keyword = input("Masukkan kata kunci pencarian (akhiri dengan * untuk awalan NIM): ")
                 keyword = keyword.replace(" ", "").lower()
+                if keyword.endswith('*'):
+                    tampilkan_data(iter_rows(data_mahasiswa,
+                                             jalankan_query(data_mahasiswa, Predikat('nim', '=', keyword))))
+                    continue
 
-            hasil_nim = []
-            for nim, data in data_mahasiswa.items():
-                if kolom == 'nim':
-                    nilai_cari = nim
-                elif kolom == 'program':
-                    nilai_cari = data["program"]
-                elif kolom == 'angkatan':
-                    nilai_cari = str(data["angkatan"])
-                else:
-                    nilai_cari = str(data.get(kolom, ""))
-    
-                nilai_cari = nilai_cari.replace(" ", "").lower()
-                
-                if keyword in nilai_cari:
-                    hasil_nim.append(nim)
-            rows = generate_rows(data_mahasiswa, hasil_nim)
+            elif SKEMA_KOLOM[kolom].maksimum is not None:
+                # Angka dibandingkan utuh: angkatan "0021" tidak boleh cocok dengan 2021.
+                tampilkan_data(iter_rows(data_mahasiswa, jalankan_query(data_mahasiswa,
+                                                                        Predikat(kolom, '=', input_kolom(kolom)))))
+                continue
+
+            else:
+                keyword = normalisasi(input_kolom(kolom))
+
+            hasil_nim = jalankan_query(data_mahasiswa, Predikat(kolom, '~', keyword))
+            rows = iter_rows(data_mahasiswa, hasil_nim)
             tampilkan_data(rows)
 
         elif pilihan == '3':
+            path = input("Masukkan nama file tujuan (.csv/.jsonl): ").strip()
+            if not path:
+                print("Nama file tidak boleh kosong!\n")
+                continue
+            try:
+                jumlah = export_data(data_mahasiswa, path)
+            except OSError as e:
+                print(f"Gagal menulis file: {e}\n")
+                continue
+            print(f"\n>> {jumlah} data berhasil diekspor ke {path}.\n")
+
+        elif pilihan == '4':
+            tampilkan_statistik(data_mahasiswa)
+
+        elif pilihan == '5':
+            tampilkan_ranking(data_mahasiswa)
+
+        elif pilihan == '6':
+            _, query = input_query()
+            tampilkan_data(iter_rows(data_mahasiswa, jalankan_query(data_mahasiswa, query)))
+
+        elif pilihan == '7':
             print(">> Kembali ke menu utama...\n")
             return
         else:
-            print("Input tidak valid! Silakan masukkan angka 1 hingga 3.\n")
+            print("Input tidak valid! Silakan masukkan angka 1 hingga 7.\n")
 
+@diukur("menu.tambah")
 def add_data(data_mahasiswa):
     while True:
         menu_items = [
             "Tambah Data",
+            "Import Data dari File (CSV/JSONL)",
             "Kembali ke Menu Utama"
         ]
         display_menu("Menu Add Data Siswa", menu_items)
-        pilihan = input("Masukkan pilihan [1-2]: ").strip()
+        pilihan = input("Masukkan pilihan [1-3]: ").strip()
 
         if pilihan == '1':
             print("\n>> Menambahkan Data Siswa...\n")
@@ -296,17 +3466,35 @@ def add_data(data_mahasiswa):
             if input_valid("Konfirmasi tambah data? (Y/N): ",
                            validate_yes_no,
                            "Masukkan Y untuk Ya atau N untuk Tidak").lower() == 'y':
-                data_mahasiswa[data["nim"]] = data
+                transaksi = Transaksi(data_mahasiswa)
+                transaksi.tambah(data["nim"], data)
+                transaksi.commit()
                 print(f"\nData mahasiswa dengan NIM {data['nim']} berhasil ditambahkan.\n")
             else:
                 print("\nPenambahan data dibatalkan.\n")
 
         elif pilihan == '2':
+            path = input("Masukkan nama file (.csv/.jsonl): ").strip()
+            if not os.path.isfile(path):
+                print(f"File {path} tidak ditemukan!\n")
+                continue
+            try:
+                diterima, ditolak, path_tolak = import_data(data_mahasiswa, path)
+            except (OSError, ValueError) as e:
+                print(f"Gagal membaca file: {e}\n")
+                continue
+            print(f"\n>> {diterima} data berhasil diimpor.")
+            if ditolak:
+                print(f">> {ditolak} data ditolak, lihat {path_tolak}.")
+            print("")
+
+        elif pilihan == '3':
             print(">> Kembali ke menu utama...\n")
             return
         else:
-            print("Pilihan tidak valid! Masukkan angka 1 atau 2.\n")
+            print("Pilihan tidak valid! Masukkan angka 1 hingga 3.\n")
 
+@diukur("menu.ubah")
 def update_data(data_mahasiswa):
     while True:
         menu_items = [
@@ -325,12 +3513,12 @@ def update_data(data_mahasiswa):
             continue
 
         nim = input("Masukkan NIM mahasiswa yang ingin diubah: ").upper().strip()
+        data_mahasiswa.muat_nim(nim)
         if nim not in data_mahasiswa:
             print(f"\nData dengan NIM {nim} tidak ditemukan!")
             continue
 
-        student_data = data_mahasiswa[nim]
-        rows = generate_rows(data_mahasiswa, [nim])
+        rows = iter_rows(data_mahasiswa, [nim])
         tampilkan_data(rows)
         if input_valid("\nLanjutkan perubahan? (Y/N): ",
                        validate_yes_no,
@@ -339,17 +3527,7 @@ def update_data(data_mahasiswa):
             continue
 
         print("\nPilih kolom yang ingin diubah:")
-        kolom_options = {
-            '1': ('Nama', 'nama'),
-            '2': ('Gender', 'gender'),
-            '3': ('Program', 'program'),
-            '4': ('Angkatan', 'angkatan'),
-            '5': ('Metode Belajar', 'metode_belajar'),
-            '6': ('Jadwal', 'jadwal'),
-            '7': ('Modul 1', 'modul_1'),
-            '8': ('Modul 2', 'modul_2'),
-            '9': ('Modul 3', 'modul_3')
-        }
+        kolom_options = {str(i): (kolom.judul, kolom.nama) for i, kolom in enumerate(SKEMA, 1)}
         display_options("Pilihan Kolom", [v[0] for v in kolom_options.values()])
         kolom_choice = input("\nMasukkan nomor kolom: ").strip()
         if kolom_choice not in kolom_options:
@@ -359,33 +3537,21 @@ def update_data(data_mahasiswa):
         kolom_name, kolom_key = kolom_options[kolom_choice]
         print(f"\nMengubah {kolom_name}...")
 
-        if kolom_key == 'nama':
-            new_value = input_valid("Masukkan Nama baru: ", validate_not_empty, "Nama tidak boleh kosong")
-        elif kolom_key == 'gender':
-            new_value = input_pilihan("Pilih Gender baru:", GENDER_OPTIONS)
-        elif kolom_key == 'program':
-            new_value = input_program("")
-        elif kolom_key == 'angkatan':
-            new_value = int(input_valid("Masukkan Angkatan baru (4 digit): ",
-                                        validate_four_digits,
-                                        "Angkatan harus berupa angka 4 digit"))
-        elif kolom_key == 'metode_belajar':
-            new_value = input_pilihan("Pilih Metode Belajar baru:", METHOD_OPTIONS)
-        elif kolom_key == 'jadwal':
-            new_value = input_pilihan("Pilih Jadwal baru:", SCHEDULE_OPTIONS)
-        else: 
-            new_value = input_modul(kolom_name.split()[-1])
+        new_value = input_kolom(kolom_key, " baru")
 
         if input_valid(f"Konfirmasi ubah {kolom_name} menjadi '{new_value}'? (Y/N): ",
                        validate_yes_no,
                        "Masukkan Y untuk Ya atau N untuk Tidak").lower() == 'y':
-            student_data[kolom_key] = new_value
+            transaksi = Transaksi(data_mahasiswa)
+            transaksi.ubah(nim, kolom_key, new_value)
+            transaksi.commit()
             print(f"\n>> Data {kolom_name} untuk NIM {nim} berhasil diperbarui.")
-            rows = generate_rows(data_mahasiswa, [nim])
+            rows = iter_rows(data_mahasiswa, [nim])
             tampilkan_data(rows)
         else:
             print(">> Perubahan dibatalkan.\n")
 
+@diukur("menu.hapus")
 def delete_data(data_mahasiswa):
     while True:
         menu_items = [
@@ -407,33 +3573,36 @@ def delete_data(data_mahasiswa):
 
         if choice == '1':
             nim = input("Masukkan NIM mahasiswa: ").upper().strip()
+            data_mahasiswa.muat_nim(nim)
             if nim not in data_mahasiswa:
                 print(f"Data dengan NIM {nim} tidak ditemukan!\n")
                 continue
             
-            rows = generate_rows(data_mahasiswa, [nim])
+            rows = iter_rows(data_mahasiswa, [nim])
             tampilkan_data(rows)
 
             if input_valid("\nKonfirmasi hapus data ini? (Y/N): ",
                            validate_yes_no,
                            "Masukkan Y untuk Ya atau N untuk Tidak").lower() == 'y':
-                del data_mahasiswa[nim]
+                transaksi = Transaksi(data_mahasiswa)
+                transaksi.hapus(nim)
+                transaksi.commit()
                 print(f">> Data dengan NIM {nim} berhasil dihapus.\n")
             else:
                 print(">> Penghapusan dibatalkan.\n")
 
         elif choice == '2':
-            name = input("Masukkan nama mahasiswa: ").strip().lower()
-            matches = []
-            for nim, data in data_mahasiswa.items():
-                if name == data['nama'].lower():
-                    matches.append(nim)
+            name = input("Masukkan nama mahasiswa: ").strip()
+            cocok, saran = pencarian_nama(data_mahasiswa, name)
+            matches = cocok + [nim for nim, _ in saran]
 
             if not matches:
                 print(f"Data dengan Nama {name} tidak ditemukan!\n")
                 continue
             
-            rows = generate_rows(data_mahasiswa, matches)
+            if saran:
+                tampilkan_kemiripan(data_mahasiswa, saran)
+            rows = iter_rows(data_mahasiswa, matches)
             tampilkan_data(rows)
 
             if len(matches) == 1:
@@ -445,148 +3614,373 @@ def delete_data(data_mahasiswa):
                     continue
 
             if input_valid("\nKonfirmasi hapus data ini? (Y/N): ", validate_yes_no, "Masukkan Y atau N").lower() == 'y':
-                del data_mahasiswa[nim_to_del]
+                transaksi = Transaksi(data_mahasiswa)
+                transaksi.hapus(nim_to_del)
+                transaksi.commit()
                 print(f"\n>> Data dengan NIM {nim_to_del} berhasil dihapus.\n")
             else:
                 print(">> Penghapusan dibatalkan.\n")
 
         else:  
-            kriteria_options = {
-                '1': "Gender",
-                '2': "Program",
-                '3': "Angkatan",
-                '4': "Metode Belajar",
-                '5': "Jadwal"
-            }
+            key_map = {SKEMA_KOLOM[kolom].judul: kolom for kolom in KOLOM_KATEGORI}
+            kriteria_options = {str(i): judul for i, judul in enumerate(list(key_map) + ["Query Lanjutan (AND/OR)"], 1)}
             display_options("Kriteria Penghapusan", kriteria_options)
             kriteria_choice = input("\nMasukkan nomor kriteria: ").strip()
             if kriteria_choice not in kriteria_options:
-                print("Pilihan tidak valid! Masukkan anggka 1 hingga 5.\n")
+                print(f"Pilihan tidak valid! Masukkan anggka 1 hingga {len(kriteria_options)}.\n")
                 continue
 
             kriteria_name = kriteria_options[kriteria_choice]
-            key_map = {
-                "Gender": 'gender',
-                "Program": 'program',
-                "Angkatan": 'angkatan',
-                "Metode Belajar": 'metode_belajar',
-                "Jadwal": 'jadwal'
-            }
-            key = key_map[kriteria_name]
-
-            if kriteria_name == "Gender":
-                value = input_pilihan(f"Pilih {kriteria_name}:", GENDER_OPTIONS)
-            elif kriteria_name == "Program":
-                value = input_program(f"Masukkan nomor {kriteria_name}: ")
-            elif kriteria_name == "Angkatan":
-                value = int(input_valid(f"Masukkan {kriteria_name} (4 digit): ",
-                                        validate_four_digits,
-                                        "Harus angka 4 digit"))
-            elif kriteria_name == "Metode Belajar":
-                value = input_pilihan(f"Pilih {kriteria_name}:", METHOD_OPTIONS)
+            if kriteria_name in key_map:
+                value = input_kolom(key_map[kriteria_name])
+                query = Predikat(key_map[kriteria_name], '=', value)
+                kriteria_name = f"{kriteria_name} = '{value}'"
             else:
-                value = input_pilihan(f"Pilih {kriteria_name}:", SCHEDULE_OPTIONS)
-
-            to_delete = []
-            for nim, data in data_mahasiswa.items():
-                if data[key] == value:
-                    to_delete.append(nim)
+                kriteria_name, query = input_query()
+            to_delete = jalankan_query(data_mahasiswa, query)
 
             if not to_delete:
-                print(f"\nTidak ditemukan data dengan {kriteria_name} = '{value}'!\n")
+                print(f"\nTidak ditemukan data dengan {kriteria_name}!\n")
                 continue
 
-            print(f"\nDitemukan {len(to_delete)} data dengan {kriteria_name} = '{value}':")
-            rows = generate_rows(data_mahasiswa, to_delete)
+            print(f"\nDitemukan {len(to_delete)} data dengan {kriteria_name}:")
+            rows = iter_rows(data_mahasiswa, to_delete)
             tampilkan_data(rows)
 
             if input_valid("\nKonfirmasi hapus semua data di atas? (Y/N): ",
                            validate_yes_no,
                            "Masukkan Y untuk Ya atau N untuk Tidak").lower() == 'y':
+                transaksi = Transaksi(data_mahasiswa)
                 for nim in to_delete:
-                    del data_mahasiswa[nim]
+                    transaksi.hapus(nim)
+                transaksi.commit()
                 print(f">> {len(to_delete)} data berhasil dihapus.\n")
             else:
                 print(">> Penghapusan dibatalkan.\n")
 
-def main_menu():
-    data_mahasiswa = {
-        "MH001": {
-            "nama": "Andi Wijaya", "gender": "Laki - Laki", "program": "Data Science & Machine Learning",
-            "angkatan": 2021, "metode_belajar": "Online", "jadwal": "After Hours",
-            "modul_1": 85, "modul_2": 90, "modul_3": 88
-        },
-        "MH002": {
-            "nama": "Budi Sutresno", "gender": "Laki - Laki", "program": "Business & Data Analyst",
-            "angkatan": 2022, "metode_belajar": "On Campus", "jadwal": "Office Hours",
-            "modul_1": 78, "modul_2": 80, "modul_3": 75
-        },
-        "MH003": {
-            "nama": "Citra Hati", "gender": "Perempuan", "program": "Product Management",
-            "angkatan": 2020, "metode_belajar": "Online", "jadwal": "After Hours",
-            "modul_1": 88, "modul_2": 92, "modul_3": 90
-        },
-        "MH004": {
-            "nama": "Dewi Pertiwi", "gender": "Perempuan", "program": "Digital Marketing",
-            "angkatan": 2023, "metode_belajar": "On Campus", "jadwal": "Office Hours",
-            "modul_1": 70, "modul_2": 72, "modul_3": 68
-        },
-        "MH005": {
-            "nama": "Eka Gunting", "gender": "Laki - Laki", "program": "Fullstack Web Development",
-            "angkatan": 2024, "metode_belajar": "Online", "jadwal": "After Hours",
-            "modul_1": 90, "modul_2": 85, "modul_3": 87
-        },
-        "MH006": {
-            "nama": "Fajar Baru", "gender": "Laki - Laki", "program": "Visual & UI/UX Design",
-            "angkatan": 2021, "metode_belajar": "On Campus", "jadwal": "Office Hours",
-            "modul_1": 60, "modul_2": 65, "modul_3": 70
-        },
-        "MH007": {
-            "nama": "Gita Bandung", "gender": "Perempuan", "program": "3D & Animation",
-            "angkatan": 2025, "metode_belajar": "Online", "jadwal": "After Hours",
-            "modul_1": 95, "modul_2": 93, "modul_3": 97
-        },
-        "MH008": {
-            "nama": "Hari Pustaka", "gender": "Laki - Laki", "program": "UI/UX & Front End Development",
-            "angkatan": 2022, "metode_belajar": "On Campus", "jadwal": "Office Hours",
-            "modul_1": 75, "modul_2": 78, "modul_3": 74
-        },
-        "MH009": {
-            "nama": "Indah Wijaya", "gender": "Perempuan", "program": "Digital Marketing",
-            "angkatan": 2020, "metode_belajar": "Online", "jadwal": "After Hours",
-            "modul_1": 82, "modul_2": 88, "modul_3": 85
-        },
-        "MH010": {
-            "nama": "Joko Widodo", "gender": "Laki - Laki", "program": "Business & Data Analyst",
-            "angkatan": 2023, "metode_belajar": "On Campus", "jadwal": "Office Hours",
-            "modul_1": 68, "modul_2": 70, "modul_3": 65
-        }
-    }
-
-    while True:
-        menu_items = [
-            "Report Data Siswa",
-            "Menambahkan Data Siswa",
-            "Mengubah Data Siswa",
-            "Menghapus Data Siswa",
-            "Exit"
-        ]
-        display_menu("Data Record Siswa Purwadhika", menu_items)
-        pilihan = input("Silakan Pilih Main_Menu [1-5] : ")
+@diukur("menu.undo")
+def undo_data(data_mahasiswa):
+    if not data_mahasiswa.jurnal:
+        print(">> Tidak ada perubahan yang bisa dibatalkan.\n")
+        return
+    nims = [nim for nim, _ in data_mahasiswa.jurnal[-1]]
+    print(f"\nPerubahan terakhir mengenai {len(nims)} data: {', '.join(nims[:10])}"
+          + (" ..." if len(nims) > 10 else ""))
+    if input_valid("Konfirmasi batalkan perubahan ini? (Y/N): ",
+                   validate_yes_no,
+                   "Masukkan Y untuk Ya atau N untuk Tidak").lower() == 'y':
+        jumlah = data_mahasiswa.undo()
+        print(f">> {jumlah} data dikembalikan ke kondisi sebelumnya.\n")
+    else:
+        print(">> Undo dibatalkan.\n")
+
+def pasang_paralel(data_mahasiswa, proses):
+    if proses > 1:
+        data_mahasiswa.paralel = PemindaiParalel(proses)
+    return data_mahasiswa
+
+def lepas_paralel(data_mahasiswa):
+    if data_mahasiswa.paralel is not None:
+        data_mahasiswa.paralel.tutup()
+        data_mahasiswa.paralel = None
+
+def main_menu(proses=PROSES_DEFAULT, angkatan_panas=ANGKATAN_PANAS_DEFAULT, arsip_dimuat=ARSIP_DIMUAT_DEFAULT):
+    penyimpanan = PenyimpananMahasiswa(angkatan_panas=angkatan_panas, arsip_dimuat=arsip_dimuat)
+    data_mahasiswa = pasang_paralel(penyimpanan.muat(DATA_AWAL), proses)
+
+    try:
+        while True:
+            menu_items = [
+                "Report Data Siswa",
+                "Menambahkan Data Siswa",
+                "Mengubah Data Siswa",
+                "Menghapus Data Siswa",
+                "Undo Perubahan Terakhir",
+                "Exit"
+            ]
+            display_menu("Data Record Siswa Purwadhika", menu_items)
+            pilihan = input("Silakan Pilih Main_Menu [1-6] : ")
+
+            if pilihan == '1':
+                report_data(data_mahasiswa)
+            elif pilihan == '2':
+                add_data(data_mahasiswa)
+            elif pilihan == '3':
+                update_data(data_mahasiswa)
+            elif pilihan == '4':
+                delete_data(data_mahasiswa)
+            elif pilihan == '5':
+                undo_data(data_mahasiswa)
+            elif pilihan == '6':
+                print(">> Keluar dari program. Terima kasih!")
+                break
+            else:
+                print("Input tidak valid! Silakan masukkan angka antara 1 hingga 6.\n")
+    finally:
+        lepas_paralel(data_mahasiswa)
+        penyimpanan.tutup()
+
+def parse_pasangan(pasangan):
+    hasil = {}
+    for teks in pasangan:
+        kolom, sep, nilai = teks.partition("=")
+        if not sep or not kolom.strip():
+            raise ValueError(f"Format '{teks}' harus kolom=nilai")
+        hasil[kolom.strip()] = nilai.strip()
+    return hasil
+
+def buat_parser():
+    parser = argparse.ArgumentParser(prog="data_nilai_mahasiswa.py",
+                                     description="Data Record Siswa Purwadhika tanpa menu interaktif")
+    sub = parser.add_subparsers(dest="perintah", required=True)
+
+    p = sub.add_parser("add", help="Tambah satu mahasiswa")
+    p.add_argument("nilai", nargs="+", metavar="kolom=nilai")
+
+    p = sub.add_parser("update", help="Ubah kolom mahasiswa berdasarkan NIM")
+    p.add_argument("nim")
+    p.add_argument("nilai", nargs="+", metavar="kolom=nilai")
+
+    p = sub.add_parser("delete", help="Hapus berdasarkan NIM atau kondisi")
+    p.add_argument("nim", nargs="*")
+    p.add_argument("--where", action="append", default=[], metavar="kolom=nilai|kolom~kata")
+
+    p = sub.add_parser("query", help="Tampilkan data sesuai kondisi")
+    p.add_argument("--where", action="append", default=[], metavar="kolom=nilai|kolom~kata")
+    p.add_argument("--format", choices=["table", "csv", "jsonl"], default="table")
+    p.add_argument("--partisi", metavar="FOLDER", help="Query shard hasil perintah split, bukan data utama")
+
+    p = sub.add_parser("split", help="Bagi data menjadi shard berdasarkan rentang NIM")
+    p.add_argument("folder")
+    p.add_argument("--batas", nargs="+", required=True, metavar="NIM", help="NIM/awalan awal setiap shard baru")
+
+    p = sub.add_parser("stats", help="Statistik nilai per kelompok")
+    p.add_argument("--by", choices=DIMENSI_STATISTIK, default="program")
+
+    p = sub.add_parser("rank", help="Top/bottom K mahasiswa berdasarkan nilai")
+    p.add_argument("--by", choices=KUNCI_RANKING, default="rata_rata")
+    p.add_argument("--top", type=int, default=10, help="Jumlah mahasiswa (K)")
+    p.add_argument("--bottom", action="store_true", help="Ambil nilai terendah")
+    p.add_argument("--where", action="append", default=[], metavar="kolom=nilai|kolom~kata")
+    p.add_argument("--format", choices=["table", "csv", "jsonl"], default="table")
+
+    p = sub.add_parser("import", help="Import file CSV/JSONL")
+    p.add_argument("file")
+    p.add_argument("--tolak", help="File untuk baris yang ditolak")
+
+    p = sub.add_parser("export", help="Export data ke file CSV/JSONL")
+    p.add_argument("file")
+    p.add_argument("--where", action="append", default=[], metavar="kolom=nilai|kolom~kata")
+
+    p = sub.add_parser("view", help="Roster per program atau mahasiswa berisiko (diperbarui inkremental)")
+    p.add_argument("jenis", choices=sorted(TAMPILAN))
+    p.add_argument("--program", help="Tampilkan anggota satu program (roster)")
+    p.add_argument("--ambang", type=int, default=NILAI_LULUS, help="Batas nilai modul (berisiko)")
+    p.add_argument("--format", choices=["table", "csv", "jsonl"], default="table")
+
+    p = sub.add_parser("changes", help="Tampilkan event perubahan setelah nomor urut tertentu")
+    p.add_argument("--dari", type=int, default=0, metavar="SEQ")
+    p.add_argument("--batas", type=int, help="Jumlah event maksimum")
+
+    p = sub.add_parser("sync", help="Sinkronkan dengan instance lain (server_mahasiswa.py) lewat pohon Merkle")
+    p.add_argument("alamat", metavar="HOST:PORT")
+    p.add_argument("--arah", choices=ARAH_SYNC, default="gabung",
+                   help="gabung: tukar record yang hanya ada di satu sisi, tarik/dorong: samakan lokal/remote")
+
+    p = sub.add_parser("arsip", help="Pindahkan angkatan lama ke arsip sesuai --angkatan-panas dan tampilkan tier")
+
+    p = sub.add_parser("batch", help="Jalankan banyak perintah dari file, satu perintah per baris")
+    p.add_argument("file")
+    return parser
+
+def jalankan_perintah(data_mahasiswa, args, parser, keluaran=sys.stdout):
+    if args.perintah == 'add':
+        nim = api_tambah(data_mahasiswa, parse_pasangan(args.nilai))
+        print(f"Data mahasiswa dengan NIM {nim} berhasil ditambahkan.", file=keluaran)
+
+    elif args.perintah == 'update':
+        nim = api_ubah(data_mahasiswa, args.nim, parse_pasangan(args.nilai))
+        print(f"Data untuk NIM {nim} berhasil diperbarui.", file=keluaran)
+
+    elif args.perintah == 'delete':
+        if not args.nim and not args.where:
+            raise ValueError("Masukkan NIM atau minimal satu --where")
+        nims = list(args.nim)
+        if args.where:
+            nims += api_query(data_mahasiswa, parse_kondisi(args.where))
+        jumlah = api_hapus(data_mahasiswa, list(dict.fromkeys(nim.upper() for nim in nims)))
+        print(f"{jumlah} data berhasil dihapus.", file=keluaran)
+
+    elif args.perintah == 'query' and args.partisi:
+        hasil = list(query_partisi(args.partisi, parse_kondisi(args.where)))
+        if args.format == 'csv':
+            penulis_csv = csv.writer(keluaran)
+            penulis_csv.writerow(KOLOM_FILE)
+            for store, nims in hasil:
+                penulis_csv.writerows(store.iter_baris(nims))
+        elif args.format == 'jsonl':
+            for store, nims in hasil:
+                for baris in store.iter_baris(nims):
+                    print(json.dumps(dict(zip(KOLOM_DATA, baris[1:]), nim=baris[0]), ensure_ascii=False), file=keluaran)
+        elif not hasil:
+            print("Data tidak ditemukan berdasarkan kriteria pencarian!", file=keluaran)
+        else:
+            rows = [row for store, nims in hasil for row in generate_rows(store, nims)]
+            print(format_grid(rows, lebar_kolom_awal()), file=keluaran)
+
+    elif args.perintah == 'split':
+        if data_mahasiswa.arsip is not None and data_mahasiswa.arsip.segmen:
+            raise ValueError("Split membutuhkan semua angkatan di memori, jalankan dengan --angkatan-panas 0")
+        partisi = PartisiNim(args.batas)
+        shards = partisi.bagi(data_mahasiswa)
+        partisi.simpan(args.folder, shards)
+        for nomor, shard in enumerate(shards):
+            bawah, atas = partisi.rentang(nomor)
+            print(f"{partisi.path(args.folder, nomor)}: {bawah or '-'} .. {atas or '-'} ({len(shard)} data)",
+                  file=keluaran)
+
+    elif args.perintah in ('query', 'rank'):
+        if args.perintah == 'query':
+            nims = api_query(data_mahasiswa, parse_kondisi(args.where))
+        else:
+            nims = ranking(data_mahasiswa, args.by, args.top, args.bottom, parse_kondisi(args.where))
+        if args.format != 'table':
+            tulis_data(data_mahasiswa, keluaran, args.format, nims)
+        elif not nims:
+            print("Data tidak ditemukan berdasarkan kriteria pencarian!", file=keluaran)
+        else:
+            print(format_grid(generate_rows(data_mahasiswa, nims), lebar_kolom_awal()), file=keluaran)
+
+    elif args.perintah == 'stats':
+        rows = data_mahasiswa.statistik.ringkasan(args.by)
+        print(tabulate(rows, headers=header_statistik(args.by), tablefmt="grid"), file=keluaran)
+
+    elif args.perintah == 'import':
+        diterima, ditolak, path_tolak = import_data(data_mahasiswa, args.file, args.tolak)
+        print(f"{diterima} data berhasil diimpor.", file=keluaran)
+        if ditolak:
+            print(f"{ditolak} data ditolak, lihat {path_tolak}.", file=keluaran)
+
+    elif args.perintah == 'export':
+        nims = api_query(data_mahasiswa, parse_kondisi(args.where)) if args.where else None
+        jumlah = export_data(data_mahasiswa, args.file, nims)
+        print(f"{jumlah} data berhasil diekspor ke {args.file}.", file=keluaran)
+
+    elif args.perintah == 'view' and args.jenis == 'roster' and args.program is None:
+        rows = data_mahasiswa.tampilan('roster').ringkasan()
+        if args.format == 'table':
+            print(tabulate(rows, headers=["Program", "Jumlah"], tablefmt="grid"), file=keluaran)
+        elif args.format == 'csv':
+            csv.writer(keluaran).writerows([['program', 'jumlah']] + rows)
+        else:
+            for program, jumlah in rows:
+                print(json.dumps({'program': program, 'jumlah': jumlah}, ensure_ascii=False), file=keluaran)
 
-        if pilihan == '1':
-            report_data(data_mahasiswa)
-        elif pilihan == '2':
-            add_data(data_mahasiswa)
-        elif pilihan == '3':
-            update_data(data_mahasiswa)
-        elif pilihan == '4':
-            delete_data(data_mahasiswa)
-        elif pilihan == '5':
-            print(">> Keluar dari program. Terima kasih!")
-            break
+    elif args.perintah == 'view':
+        if args.jenis == 'roster':
+            nims = data_mahasiswa.tampilan('roster').daftar(args.program)
         else:
-            print("Input tidak valid! Silakan masukkan angka antara 1 hingga 5.\n")
+            nims = data_mahasiswa.tampilan('berisiko', ambang=args.ambang).daftar()
+        if args.format != 'table':
+            tulis_data(data_mahasiswa, keluaran, args.format, nims)
+        elif not nims:
+            print("Data tidak ditemukan!", file=keluaran)
+        else:
+            print(format_grid(generate_rows(data_mahasiswa, nims), lebar_kolom_awal()), file=keluaran)
+
+    elif args.perintah == 'changes':
+        if data_mahasiswa.aliran is None or data_mahasiswa.aliran.path is None:
+            raise ValueError("File perubahan tidak aktif")
+        for perubahan in islice(baca_perubahan(data_mahasiswa.aliran.path, args.dari), args.batas):
+            print(json.dumps(perubahan, ensure_ascii=False), file=keluaran)
+
+    elif args.perintah == 'sync':
+        host, _, port = args.alamat.rpartition(":")
+        if not port.isdigit():
+            raise ValueError("Alamat harus berbentuk HOST:PORT")
+        peer = PeerRemote(host or "127.0.0.1", int(port))
+        try:
+            laporan = sinkronkan(data_mahasiswa, peer, args.arah)
+        finally:
+            peer.tutup()
+        print(f"{laporan['berbeda']} record berbeda, {laporan['diterima']} diterima, {laporan['dikirim']} dikirim "
+              f"({laporan['putaran']} putaran, {laporan['simpul']} simpul, {peer.byte} byte).", file=keluaran)
+        if laporan["konflik"]:
+            print("Konflik nilai modul:", file=keluaran)
+            print(tabulate(laporan["konflik"], headers=["NIM", "Kolom", "Lokal", "Remote"], tablefmt="grid"),
+                  file=keluaran)
+
+    elif args.perintah == 'arsip':
+        if data_mahasiswa.arsip is None:
+            raise ValueError("Arsip angkatan tidak aktif, gunakan --angkatan-panas N")
+        data_mahasiswa.arsip.rapikan()
+        print(tabulate(data_mahasiswa.arsip.ringkasan(), headers=["Angkatan", "Tier", "Jumlah", "Ukuran (byte)"],
+                       tablefmt="grid"), file=keluaran)
+
+    elif args.perintah == 'batch':
+        jalankan_batch(data_mahasiswa, args.file, parser, keluaran)
+
+def jalankan_batch(data_mahasiswa, path, parser, keluaran=sys.stdout):
+    berhasil = 0
+    gagal = 0
+    with open(path, encoding="utf-8") as f:
+        for nomor, baris in enumerate(f, 1):
+            baris = baris.strip()
+            if not baris or baris.startswith("#"):
+                continue
+            try:
+                args = parser.parse_args(shlex.split(baris))
+                if args.perintah == 'batch':
+                    raise ValueError("Perintah batch tidak boleh bersarang")
+                jalankan_perintah(data_mahasiswa, args, parser, keluaran)
+                berhasil += 1
+            except (ValueError, OSError) as e:
+                gagal += 1
+                print(f"Baris {nomor}: {e}", file=sys.stderr)
+            except SystemExit:
+                gagal += 1
+                print(f"Baris {nomor}: perintah tidak valid", file=sys.stderr)
+    print(f"Batch selesai: {berhasil} perintah berhasil, {gagal} gagal.", file=keluaran)
+
+def parse_opsi_global(argv):
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--proses", type=int, default=PROSES_DEFAULT)
+    parser.add_argument("--angkatan-panas", type=int, default=ANGKATAN_PANAS_DEFAULT)
+    parser.add_argument("--arsip-dimuat", type=int, default=ARSIP_DIMUAT_DEFAULT)
+    parser.add_argument("--profil", default=PROFIL_DEFAULT)
+    parser.add_argument("--profil-file", default=FILE_PROFIL_DEFAULT)
+    parser.add_argument("--profil-interval", type=float, default=INTERVAL_PROFIL_DEFAULT)
+    return parser.parse_known_args(argv)
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    opsi, argv = parse_opsi_global(argv)
+    try:
+        aktifkan_instrumen(opsi.profil, opsi.profil_file, opsi.profil_interval)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    try:
+        if not argv:
+            main_menu(opsi.proses, opsi.angkatan_panas, opsi.arsip_dimuat)
+            return 0
+
+        parser = buat_parser()
+        args = parser.parse_args(argv)
+        penyimpanan = PenyimpananMahasiswa(angkatan_panas=opsi.angkatan_panas, arsip_dimuat=opsi.arsip_dimuat)
+        data_mahasiswa = pasang_paralel(penyimpanan.muat(DATA_AWAL), opsi.proses)
+        try:
+            jalankan_perintah(data_mahasiswa, args, parser)
+        except (ValueError, OSError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        finally:
+            lepas_paralel(data_mahasiswa)
+            penyimpanan.tutup()
+        return 0
+    finally:
+        matikan_instrumen()
 
 if __name__ == "__main__":
-    main_menu()
+    sys.exit(main())
@@ -0,0 +1,232 @@
+import argparse
+import asyncio
+import io
+import json
+import shlex
+import sys
+from contextlib import asynccontextmanager
+
+from data_nilai_mahasiswa import (
+    ANGKATAN_PANAS_DEFAULT, ARSIP_DIMUAT_DEFAULT, DATA_AWAL, TAMPILAN, PeerLokal, PenyimpananMahasiswa,
+    aktifkan_instrumen, api_hapus, api_query, buat_parser, jalankan_perintah, lepas_paralel, matikan_instrumen,
+    parse_kondisi, parse_opsi_global, pasang_paralel, uji_record
+)
+
+HOST_DEFAULT = "127.0.0.1"
+PORT_DEFAULT = 8765
+BATAS_BARIS = 1 << 28
+PERINTAH_BACA = {'query', 'rank', 'stats', 'export', 'view', 'changes'}
+PERINTAH_TULIS = {'add', 'update', 'delete', 'import', 'arsip'}
+PERINTAH_SALINAN = {'query', 'rank', 'stats', 'export', 'view'}
+PERINTAH_PANJANG = {'import', 'arsip'}
+# Delete --where dengan kandidat sebanyak ini atau lebih dianggap writer panjang dan dilayani dengan salinan.
+BATAS_HAPUS_SALINAN = 10_000
+AKSI_MERKLE = {'info', 'simpul', 'bucket', 'ambil', 'terapkan'}
+AKSI_MERKLE_TULIS = {'terapkan'}
+
+class KunciBacaTulis:
+    def __init__(self):
+        self._kondisi = asyncio.Condition()
+        self._pembaca = 0
+        self._penulis = False
+        self._antre_tulis = 0
+        self.commit = 0
+
+    def sibuk(self):
+        return self._penulis or self._antre_tulis > 0
+
+    @asynccontextmanager
+    async def baca(self):
+        async with self._kondisi:
+            await self._kondisi.wait_for(lambda: not self._penulis and not self._antre_tulis)
+            self._pembaca += 1
+        try:
+            yield
+        finally:
+            async with self._kondisi:
+                self._pembaca -= 1
+                if not self._pembaca:
+                    self._kondisi.notify_all()
+
+    @asynccontextmanager
+    async def tulis(self):
+        async with self._kondisi:
+            self._antre_tulis += 1
+            try:
+                await self._kondisi.wait_for(lambda: not self._penulis and not self._pembaca)
+            finally:
+                self._antre_tulis -= 1
+            self._penulis = True
+        try:
+            yield
+        finally:
+            async with self._kondisi:
+                self._penulis = False
+                self.commit += 1
+                self._kondisi.notify_all()
+
+class ServerMahasiswa:
+    def __init__(self, data_mahasiswa):
+        self.data_mahasiswa = data_mahasiswa
+        self.kunci = KunciBacaTulis()
+        self.parser = buat_parser()
+        self._salinan = None
+        # Server berjalan lama: posisi NIM, indeks, statistik, dan tampilan bawaan dibangun sekarang
+        # supaya pembaca paralel tidak membangunnya bersamaan dan lookup tidak lagi lewat mmap.
+        data_mahasiswa.muat_posisi()
+        data_mahasiswa.indeks
+        data_mahasiswa.statistik
+        for jenis in TAMPILAN:
+            data_mahasiswa.tampilan(jenis)
+
+    def _jalankan(self, args, data_mahasiswa=None):
+        keluaran = io.StringIO()
+        jalankan_perintah(data_mahasiswa or self.data_mahasiswa, args, self.parser, keluaran)
+        return keluaran.getvalue()
+
+    def _perbarui_salinan(self, commit):
+        # Dipanggil dengan lock baca sebelum writer panjang mengantre. Pembaca yang datang selama
+        # writer itu antre atau berjalan dilayani dari salinan ini, bukan menunggu di belakangnya.
+        if self._salinan is None or self._salinan[0] != commit:
+            self._salinan = (commit, self.data_mahasiswa.salin())
+
+    def _lepas_salinan(self):
+        if self._salinan is not None and self._salinan[0] != self.kunci.commit:
+            self._salinan = None
+
+    def _salinan_berlaku(self, args):
+        salinan = self._salinan
+        if (args.perintah in PERINTAH_SALINAN and self.kunci.sibuk() and salinan is not None
+                and salinan[0] == self.kunci.commit):
+            return salinan[1]
+        return None
+
+    def _merkle(self, aksi, data):
+        try:
+            hasil = getattr(PeerLokal(self.data_mahasiswa), aksi)(**json.loads(data or "{}"))
+        except (TypeError, KeyError, IndexError, AttributeError) as e:
+            raise ValueError(f"Permintaan merkle tidak valid: {e}") from None
+        return json.dumps(hasil, ensure_ascii=False)
+
+    def _kandidat_hapus(self, args):
+        kondisi = parse_kondisi(args.where)
+        nims = api_query(self.data_mahasiswa, kondisi) if kondisi else []
+        return kondisi, nims
+
+    def _hapus(self, args, kondisi, nims):
+        # Data bisa berubah antara pencarian dan commit, jadi kandidat dicek ulang.
+        # Kandidat di angkatan arsip dicek langsung dari segmennya tanpa memuat angkatan itu.
+        data_mahasiswa = self.data_mahasiswa
+        nims = [nim for store, grup in data_mahasiswa.kelompok_nim([nim for nim in nims if data_mahasiswa.ada(nim)])
+                for nim in grup if all(uji_record(store, nim, node) for node in kondisi)]
+        nims = list(dict.fromkeys([nim.upper() for nim in args.nim] + nims))
+        jumlah = api_hapus(data_mahasiswa, nims)
+        return f"{jumlah} data berhasil dihapus.\n"
+
+    async def proses(self, baris):
+        perintah, _, sisa = baris.partition(" ")
+        loop = asyncio.get_running_loop()
+        if perintah == 'merkle':
+            # Protokol internal perintah sync, bukan bagian dari CLI. Payload-nya JSON mentah
+            # dan bisa berukuran MB, jadi tidak lewat shlex dan argparse.
+            aksi, _, data = sisa.partition(" ")
+            if aksi not in AKSI_MERKLE:
+                return {"ok": False, "error": "perintah tidak valid"}
+            try:
+                async with self.kunci.tulis() if aksi in AKSI_MERKLE_TULIS else self.kunci.baca():
+                    hasil = await loop.run_in_executor(None, self._merkle, aksi, data)
+            except (ValueError, OSError) as e:
+                return {"ok": False, "error": str(e)}
+            return {"ok": True, "keluaran": hasil}
+
+        try:
+            args = self.parser.parse_args(shlex.split(baris))
+        except SystemExit:
+            return {"ok": False, "error": "perintah tidak valid"}
+        except ValueError as e:
+            return {"ok": False, "error": str(e)}
+
+        try:
+            if args.perintah in PERINTAH_BACA:
+                # Angkatan arsip dibaca langsung dari segmennya, jadi query tidak pernah mengubah store.
+                salinan = self._salinan_berlaku(args)
+                if salinan is not None:
+                    hasil = await loop.run_in_executor(None, self._jalankan, args, salinan)
+                else:
+                    async with self.kunci.baca():
+                        hasil = await loop.run_in_executor(None, self._jalankan, args)
+            elif args.perintah == 'delete':
+                if not args.nim and not args.where:
+                    raise ValueError("Masukkan NIM atau minimal satu --where")
+                async with self.kunci.baca():
+                    kondisi, nims = await loop.run_in_executor(None, self._kandidat_hapus, args)
+                    # Salinan berbiaya O(n); delete kecil cukup memegang lock tulis sebentar.
+                    if args.where and len(nims) >= BATAS_HAPUS_SALINAN:
+                        await loop.run_in_executor(None, self._perbarui_salinan, self.kunci.commit)
+                async with self.kunci.tulis():
+                    hasil = await loop.run_in_executor(None, self._hapus, args, kondisi, nims)
+                self._lepas_salinan()
+            elif args.perintah in PERINTAH_TULIS:
+                if args.perintah in PERINTAH_PANJANG:
+                    async with self.kunci.baca():
+                        await loop.run_in_executor(None, self._perbarui_salinan, self.kunci.commit)
+                async with self.kunci.tulis():
+                    hasil = await loop.run_in_executor(None, self._jalankan, args)
+                self._lepas_salinan()
+            else:
+                raise ValueError(f"Perintah {args.perintah} tidak tersedia di server")
+        except (ValueError, OSError) as e:
+            return {"ok": False, "error": str(e)}
+        return {"ok": True, "keluaran": hasil}
+
+    async def layani(self, reader, writer):
+        try:
+            while baris := await reader.readline():
+                baris = baris.decode("utf-8").strip()
+                if not baris:
+                    continue
+                jawaban = await self.proses(baris)
+                writer.write((json.dumps(jawaban, ensure_ascii=False) + "\n").encode("utf-8"))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+async def minta(reader, writer, baris):
+    writer.write((baris.strip() + "\n").encode("utf-8"))
+    await writer.drain()
+    return json.loads(await reader.readline())
+
+async def jalankan_server(host, port, proses=1, angkatan_panas=ANGKATAN_PANAS_DEFAULT,
+                          arsip_dimuat=ARSIP_DIMUAT_DEFAULT):
+    penyimpanan = PenyimpananMahasiswa(angkatan_panas=angkatan_panas, arsip_dimuat=arsip_dimuat)
+    data_mahasiswa = pasang_paralel(penyimpanan.muat(DATA_AWAL), proses)
+    try:
+        server_mahasiswa = ServerMahasiswa(data_mahasiswa)
+        server = await asyncio.start_server(server_mahasiswa.layani, host, port, limit=BATAS_BARIS)
+        alamat = server.sockets[0].getsockname()
+        print(f"Server berjalan di {alamat[0]}:{alamat[1]}", flush=True)
+        async with server:
+            await server.serve_forever()
+    finally:
+        lepas_paralel(data_mahasiswa)
+        penyimpanan.tutup()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Server data nilai mahasiswa untuk banyak klien")
+    parser.add_argument("--host", default=HOST_DEFAULT)
+    parser.add_argument("--port", type=int, default=PORT_DEFAULT)
+    opsi, argv = parse_opsi_global(sys.argv[1:] if argv is None else argv)
+    args = parser.parse_args(argv)
+    aktifkan_instrumen(opsi.profil, opsi.profil_file, opsi.profil_interval)
+    try:
+        asyncio.run(jalankan_server(args.host, args.port, opsi.proses, opsi.angkatan_panas, opsi.arsip_dimuat))
+    except KeyboardInterrupt:
+        print(">> Server dihentikan.")
+    finally:
+        matikan_instrumen()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+import io
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import data_nilai_mahasiswa as dm
+
+NAMA = ["Andi Wijaya", "Budi Sutresno", "Citra Hati", "Dewi Pertiwi", "Eka Gunting", "Fajar Baru",
+        "Gita Bandung", "Hari Pustaka", "Indah Wijaya", "Joko Widodo", "Tri Lestari", "Putri Ayu"]
+
+
+def buat_record(rng, angkatan=None):
+    return {
+        "nama": rng.choice(NAMA),
+        "gender": rng.choice(list(dm.GENDER_OPTIONS.values())),
+        "program": rng.choice(dm.PROGRAM_LIST),
+        "angkatan": angkatan if angkatan is not None else rng.randint(2018, 2025),
+        "metode_belajar": rng.choice(list(dm.METHOD_OPTIONS.values())),
+        "jadwal": rng.choice(list(dm.SCHEDULE_OPTIONS.values())),
+        "modul_1": rng.randint(0, 100),
+        "modul_2": rng.randint(0, 100),
+        "modul_3": rng.randint(0, 100),
+    }
+
+
+def buat_roster(jumlah, seed=0):
+    rng = random.Random(seed)
+    return {f"MH{i:06d}": buat_record(rng) for i in range(jumlah)}
+
+
+def isi_store(jumlah, seed=0):
+    data_mahasiswa = dm.DataMahasiswa()
+    for nim, data in buat_roster(jumlah, seed).items():
+        data_mahasiswa[nim] = data
+    return data_mahasiswa
+
+
+def jalankan(data_mahasiswa, *argv):
+    parser = dm.buat_parser()
+    keluaran = io.StringIO()
+    dm.jalankan_perintah(data_mahasiswa, parser.parse_args(list(argv)), parser, keluaran)
+    return keluaran.getvalue()
+
+
+def isi(data_mahasiswa):
+    return {nim: dict(data_mahasiswa[nim]) for nim in data_mahasiswa}
+
+
+@pytest.fixture
+def roster():
+    return buat_roster(300)
+
+
+@pytest.fixture
+def store():
+    return isi_store(300)
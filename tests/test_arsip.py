@@ -0,0 +1,131 @@
+import asyncio
+import csv
+
+import pytest
+
+from conftest import buat_roster, isi, isi_store, jalankan
+import data_nilai_mahasiswa as dm
+from server_mahasiswa import ServerMahasiswa
+
+JUMLAH = 2000
+
+
+def dimuat(arsip):
+    return len(arsip.dimuat) + len(arsip._cache)
+
+
+@pytest.fixture
+def penyimpanan(tmp_path):
+    penyimpanan = dm.PenyimpananMahasiswa(str(tmp_path), angkatan_panas=2, arsip_dimuat=1)
+    data_mahasiswa = penyimpanan.muat(buat_roster(JUMLAH))
+    yield penyimpanan, data_mahasiswa
+    penyimpanan.tutup()
+
+
+@pytest.fixture
+def acuan():
+    return isi_store(JUMLAH)
+
+
+def test_rapikan_memindahkan_angkatan_lama(penyimpanan):
+    _, data_mahasiswa = penyimpanan
+    arsip = data_mahasiswa.arsip
+    assert len(arsip.segmen) == 6
+    assert len(data_mahasiswa) < JUMLAH
+    assert len(data_mahasiswa) + sum(entri["jumlah"] for entri in arsip.segmen.values()) == JUMLAH
+
+
+@pytest.mark.parametrize("teks", ["program = \"Digital Marketing\"", "nim = MH00000*", "modul_1 >= 90 and jadwal = "
+                                  "\"After Hours\"", "angkatan = 2019 or nama ~ lestari", "nim > MH001990"])
+def test_query_melihat_semua_angkatan(penyimpanan, acuan, teks):
+    _, data_mahasiswa = penyimpanan
+    node = dm.parse_query(teks)
+    hasil = dm.jalankan_query(data_mahasiswa, node)
+    assert sorted(hasil) == sorted(dm.jalankan_query(acuan, node))
+    assert len(hasil) == len(set(hasil))
+    assert dimuat(data_mahasiswa.arsip) <= 1
+    assert len(data_mahasiswa) < JUMLAH
+
+
+def test_export_dan_report_lengkap(penyimpanan, acuan, tmp_path):
+    _, data_mahasiswa = penyimpanan
+    path = str(tmp_path / "semua.csv")
+    assert f"{JUMLAH} data" in jalankan(data_mahasiswa, "export", path)
+    with open(path, encoding="utf-8", newline="") as f:
+        baris = list(csv.reader(f))[1:]
+    assert sorted(baris) == sorted([[str(nilai) for nilai in row] for row in acuan.iter_baris(list(acuan))])
+
+    rows = dm.generate_rows(data_mahasiswa, list(data_mahasiswa.semua_nim()))
+    assert sorted(rows) == sorted(dm.generate_rows(acuan, list(acuan)))
+    assert dimuat(data_mahasiswa.arsip) <= 1
+
+
+def test_ranking_dan_tampilan(penyimpanan, acuan):
+    _, data_mahasiswa = penyimpanan
+
+    def skor(nims):
+        return [sum(acuan[nim][kolom] for kolom in dm.KOLOM_NILAI) for nim in nims]
+
+    for kondisi in (None, [dm.parse_query("program = \"Digital Marketing\"")]):
+        for terbawah in (False, True):
+            hasil = dm.ranking(data_mahasiswa, 'rata_rata', 15, terbawah, kondisi)
+            harapan = dm.ranking(acuan, 'rata_rata', 15, terbawah, kondisi)
+            assert skor(hasil) == skor(harapan)
+
+    assert data_mahasiswa.tampilan('roster').ringkasan() == acuan.tampilan('roster').ringkasan()
+    assert (sorted(data_mahasiswa.tampilan('roster').daftar("Digital Marketing"))
+            == sorted(acuan.tampilan('roster').daftar("Digital Marketing")))
+    assert (sorted(data_mahasiswa.tampilan('berisiko', ambang=30).daftar())
+            == sorted(acuan.tampilan('berisiko', ambang=30).daftar()))
+
+
+def test_delete_where_menghapus_angkatan_arsip(penyimpanan, acuan, tmp_path):
+    penyimpanan, data_mahasiswa = penyimpanan
+    harapan = set(dm.jalankan_query(acuan, dm.parse_query("program = \"Digital Marketing\"")))
+    assert f"{len(harapan)} data" in jalankan(data_mahasiswa, "delete", "--where", "program = \"Digital Marketing\"")
+    assert dimuat(data_mahasiswa.arsip) <= 1
+    assert not dm.jalankan_query(data_mahasiswa, dm.parse_query("program = \"Digital Marketing\""))
+    penyimpanan.tutup()
+
+    penyimpanan = dm.PenyimpananMahasiswa(str(tmp_path), angkatan_panas=0)
+    try:
+        data_mahasiswa = penyimpanan.muat()
+        assert set(isi(data_mahasiswa)) == set(acuan) - harapan
+    finally:
+        penyimpanan.tutup()
+
+
+def test_mutasi_memuat_angkatan_lalu_kembali_ke_batas(penyimpanan):
+    _, data_mahasiswa = penyimpanan
+    arsip = data_mahasiswa.arsip
+    nims = [next(iter(entri["nims"])) for entri in arsip.segmen.values()]
+    transaksi = dm.Transaksi(data_mahasiswa)
+    for nim in nims:
+        transaksi.ubah(nim, 'modul_1', 100)
+    transaksi.commit()
+    assert len(arsip.dimuat) <= 1
+    assert [data_mahasiswa.ada(nim) for nim in nims] == [True] * len(nims)
+    hasil = dm.jalankan_query(data_mahasiswa, dm.parse_query("modul_1 = 100"))
+    assert set(nims) <= set(hasil)
+
+
+def test_split_menolak_saat_ada_arsip(penyimpanan, tmp_path):
+    _, data_mahasiswa = penyimpanan
+    with pytest.raises(ValueError, match="angkatan-panas 0"):
+        jalankan(data_mahasiswa, "split", str(tmp_path / "partisi"), "--batas", "MH001000")
+
+
+def test_server_membaca_arsip_dengan_lock_baca(penyimpanan, acuan):
+    _, data_mahasiswa = penyimpanan
+    server = ServerMahasiswa(data_mahasiswa)
+    harapan = dm.jalankan_query(acuan, dm.parse_query("nim = MH00000*"))
+
+    async def skenario():
+        query = await server.proses("query --where 'nim = MH00000*' --format csv")
+        hapus = await server.proses("delete --where 'nim = MH00000*'")
+        return query, hapus
+
+    query, hapus = asyncio.run(skenario())
+    assert sorted(baris.split(",")[0] for baris in query["keluaran"].splitlines()[1:]) == sorted(harapan)
+    assert hapus["keluaran"] == f"{len(harapan)} data berhasil dihapus.\n"
+    assert not any(data_mahasiswa.ada(nim) for nim in harapan)
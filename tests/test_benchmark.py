@@ -0,0 +1,28 @@
+import json
+
+import benchmark_mahasiswa as bench
+import data_nilai_mahasiswa as dm
+
+
+def test_roster_sintetis_deterministik_dan_valid():
+    roster = list(bench.buat_roster(500, seed=3))
+    assert roster == list(bench.buat_roster(500, seed=3))
+    assert roster != list(bench.buat_roster(500, seed=4))
+    assert [nim for nim, _ in roster[:2]] == ["MH0000001", "MH0000002"]
+    for nim, data in roster:
+        assert dm.validasi_record(nim, data) == data
+
+
+def test_suite_menulis_json_dan_membandingkan(tmp_path, capsys):
+    lama = tmp_path / "lama.json"
+    baru = tmp_path / "baru.json"
+    laporan = bench.jalankan_suite([300], 2, str(lama))
+    operasi = laporan["hasil"]["300"]["operasi"]
+    assert {"bangun_store", "query_lanjutan", "tambah", "hapus_kriteria", "export_csv"} <= set(operasi)
+    assert all(ukuran["median_ms"] >= ukuran["min_ms"] >= 0 for ukuran in operasi.values())
+    assert json.loads(lama.read_text(encoding="utf-8"))["hasil"]["300"]["operasi"].keys() == operasi.keys()
+
+    capsys.readouterr()
+    bench.jalankan_suite([300], 2, str(baru), str(lama))
+    assert "vs lama (x)" in capsys.readouterr().out
+    assert baru.exists()
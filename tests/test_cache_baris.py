@@ -0,0 +1,89 @@
+import contextlib
+import io
+import random
+
+import pytest
+
+from conftest import buat_record, buat_roster, isi_store
+import data_nilai_mahasiswa as dm
+
+
+def acuan(data_mahasiswa, nims):
+    return [(nim, *(str(data_mahasiswa[nim][kolom]) for kolom in dm.KOLOM_DATA)) for nim in nims]
+
+
+def test_baris_tetap_benar_setelah_mutasi():
+    rng = random.Random(0)
+    data_mahasiswa = isi_store(200)
+    nims = list(data_mahasiswa)[:50]
+    assert dm.generate_rows(data_mahasiswa, nims) == acuan(data_mahasiswa, nims)
+
+    transaksi = dm.Transaksi(data_mahasiswa)
+    transaksi.ubah(nims[0], 'modul_1', 7)
+    transaksi.ubah(nims[1], 'nama', "Nama Baru")
+    transaksi.commit()
+    data_mahasiswa[nims[2]] = buat_record(rng)
+    del data_mahasiswa[nims[3]]
+    data_mahasiswa[nims[3]] = buat_record(rng)
+    del data_mahasiswa[nims[4]]
+    data_mahasiswa["MH900000"] = buat_record(rng)
+    nims = [nim for nim in nims if nim in data_mahasiswa] + ["MH900000"]
+    assert dm.generate_rows(data_mahasiswa, nims) == acuan(data_mahasiswa, nims)
+
+
+def test_halaman_yang_sama_dilayani_dari_cache():
+    data_mahasiswa = isi_store(100)
+    cache = data_mahasiswa.cache_baris
+    halaman = list(data_mahasiswa)[:20]
+    dm.generate_rows(data_mahasiswa, halaman)
+    assert (cache.kena, cache.meleset) == (0, 20)
+    dm.generate_rows(data_mahasiswa, halaman)
+    assert (cache.kena, cache.meleset) == (20, 20)
+    data_mahasiswa[halaman[0]] = dict(data_mahasiswa[halaman[0]], modul_2=1)
+    dm.generate_rows(data_mahasiswa, halaman)
+    assert (cache.kena, cache.meleset) == (39, 21)
+
+
+def test_cache_dibatasi_lru():
+    data_mahasiswa = isi_store(100)
+    cache = data_mahasiswa._cache_baris = dm.CacheBaris(data_mahasiswa, batas=10)
+    nims = list(data_mahasiswa)
+    dm.generate_rows(data_mahasiswa, nims[:10])
+    dm.generate_rows(data_mahasiswa, nims[:1])
+    dm.generate_rows(data_mahasiswa, nims[10:15])
+    assert list(cache.baris) == nims[6:10] + nims[:1] + nims[10:15]
+
+    # Hasil yang lebih besar dari batas tidak mengusir isi cache.
+    assert dm.generate_rows(data_mahasiswa, nims[20:]) == acuan(data_mahasiswa, nims[20:])
+    assert list(cache.baris) == nims[6:10] + nims[:1] + nims[10:15]
+
+
+def test_format_grid_sama_dengan_tanpa_cache(monkeypatch):
+    data_mahasiswa = isi_store(30)
+    rows = dm.generate_rows(data_mahasiswa, list(data_mahasiswa))
+    hasil = dm.format_grid(rows, dm.lebar_kolom_awal())
+    assert dm.format_grid(rows, dm.lebar_kolom_awal()) == hasil
+    monkeypatch.setattr(dm, "format_baris", dm.format_baris.__wrapped__)
+    assert dm.format_grid(rows, dm.lebar_kolom_awal()) == hasil
+
+
+@pytest.mark.parametrize("arsip", [False, True])
+def test_scan_seluruh_data_tidak_mengusir_cache(tmp_path, monkeypatch, arsip):
+    if arsip:
+        penyimpanan = dm.PenyimpananMahasiswa(str(tmp_path), angkatan_panas=2, arsip_dimuat=1)
+        data_mahasiswa = penyimpanan.muat(buat_roster(400))
+    else:
+        data_mahasiswa = isi_store(400)
+    cache = data_mahasiswa._cache_baris = dm.CacheBaris(data_mahasiswa, batas=50)
+    panas = list(data_mahasiswa)[:10]
+    dm.generate_rows(data_mahasiswa, panas)
+
+    semua = dm.generate_rows(data_mahasiswa, data_mahasiswa.semua_nim())
+    assert len(semua) == 400
+    jawaban = iter(['1', 'q', '7'])
+    monkeypatch.setattr('builtins.input', lambda prompt="": next(jawaban))
+    with contextlib.redirect_stdout(io.StringIO()):
+        dm.report_data(data_mahasiswa)
+    assert list(cache.baris) == panas
+    if arsip:
+        penyimpanan.tutup()
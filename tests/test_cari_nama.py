@@ -0,0 +1,74 @@
+import contextlib
+import io
+
+import data_nilai_mahasiswa as dm
+from conftest import isi_store
+
+
+def test_fuzzy_toleran_salah_ketik_dan_urutan():
+    data_mahasiswa = dm.DataMahasiswa(dm.DATA_AWAL)
+    data_mahasiswa["MH011"] = dict(dm.DATA_AWAL["MH002"], nama="Budi Sutrisno")
+    assert [nim for nim, _ in data_mahasiswa.cari_nama("sutresno")][:2] == ["MH002", "MH011"]
+    assert data_mahasiswa.cari_nama("wijaya indah")[0][0] == "MH009"
+    assert data_mahasiswa.cari_nama("zzzzzz") == []
+
+
+def test_indeks_nama_mengikuti_mutasi():
+    data_mahasiswa = dm.DataMahasiswa(dm.DATA_AWAL)
+    data_mahasiswa.cari_nama("andi")
+    data_mahasiswa["MH001"]["nama"] = "Kurniawan"
+    dm.api_hapus(data_mahasiswa, ["MH002"])
+    assert "MH001" not in [nim for nim, _ in data_mahasiswa.cari_nama("andi wijaya", k=50)]
+    assert data_mahasiswa.cari_nama("kurniawan")[0][0] == "MH001"
+    assert "MH002" not in [nim for nim, _ in data_mahasiswa.cari_nama("budi")]
+    data_mahasiswa.undo()
+    assert data_mahasiswa.cari_nama("budi")[0][0] == "MH002"
+
+
+def test_hasil_substring_tidak_dibatasi():
+    data_mahasiswa = isi_store(600)
+    harapan = [nim for nim in data_mahasiswa if "tri" in data_mahasiswa[nim]["nama"].lower()]
+    assert len(harapan) > dm.BATAS_FUZZY
+    cocok, saran = dm.pencarian_nama(data_mahasiswa, "tri")
+    assert cocok == harapan
+    assert not set(cocok) & {nim for nim, _ in saran}
+
+    cocok, saran = dm.pencarian_nama(data_mahasiswa, "wijaya")
+    assert len(cocok) == sum("wijaya" in data_mahasiswa[nim]["nama"].lower() for nim in data_mahasiswa)
+    assert len(cocok) > dm.BATAS_FUZZY
+
+
+def test_saran_fuzzy_di_belakang_hasil_substring():
+    data_mahasiswa = dm.DataMahasiswa(dm.DATA_AWAL)
+    data_mahasiswa["MH011"] = dict(dm.DATA_AWAL["MH001"], nama="Andi Wijaja")
+    cocok, saran = dm.pencarian_nama(data_mahasiswa, "wijaya")
+    assert cocok == ["MH001", "MH009"]
+    assert [nim for nim, _ in saran] == ["MH011"]
+    assert dm.pencarian_nama(data_mahasiswa, "wi") == (["MH001", "MH004", "MH009", "MH010", "MH011"], [])
+
+
+def test_menu_report_menampilkan_semua_hasil(monkeypatch):
+    data_mahasiswa = isi_store(600)
+    jumlah = sum("tri" in data_mahasiswa[nim]["nama"].lower() for nim in data_mahasiswa)
+    jawaban = iter(['2', '2', 'tri'] + ['n'] * (jumlah // dm.UKURAN_HALAMAN + 1) + ['q', '7'])
+    monkeypatch.setattr('builtins.input', lambda prompt="": next(jawaban))
+    keluaran = io.StringIO()
+    with contextlib.redirect_stdout(keluaran):
+        dm.report_data(data_mahasiswa)
+    assert f"dari {-(-jumlah // dm.UKURAN_HALAMAN)}" in keluaran.getvalue()
+
+
+def test_menu_report_angkatan_dibandingkan_sebagai_angka(monkeypatch):
+    data_mahasiswa = dm.DataMahasiswa(dm.DATA_AWAL)
+
+    def cari(angkatan):
+        jawaban = iter(['2', '5', angkatan, 'q', '7'])
+        monkeypatch.setattr('builtins.input', lambda prompt="": next(jawaban))
+        keluaran = io.StringIO()
+        with contextlib.redirect_stdout(keluaran):
+            dm.report_data(data_mahasiswa)
+        return keluaran.getvalue()
+
+    assert "Data tidak ditemukan" in cari("0021")
+    keluaran = cari("2021")
+    assert all((f"| {nim} " in keluaran) == (dm.DATA_AWAL[nim]["angkatan"] == 2021) for nim in dm.DATA_AWAL)
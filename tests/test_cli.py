@@ -0,0 +1,75 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from conftest import isi, jalankan
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TAMBAH = ["nim=mh900000", "nama=Sari Dewi", "gender=Perempuan", "program=Product Management", "angkatan=2024",
+          "metode_belajar=Online", "jadwal=After Hours", "modul_1=80", "modul_2=75", "modul_3=90"]
+
+
+def test_add_update_delete(store):
+    assert "MH900000 berhasil ditambahkan" in jalankan(store, "add", *TAMBAH)
+    assert store["MH900000"]["program"] == "Product Management"
+    jalankan(store, "update", "mh900000", "modul_1=55", "nama=Sari Dewi Putri")
+    assert (store["MH900000"]["modul_1"], store["MH900000"]["nama"]) == (55, "Sari Dewi Putri")
+    assert jalankan(store, "delete", "MH900000") == "1 data berhasil dihapus.\n"
+    assert "MH900000" not in store
+
+
+@pytest.mark.parametrize("argv, pesan", [
+    (["add"] + TAMBAH[:1] + ["modul_1=120"], None),
+    (["update", "MH999999", "modul_1=50"], "tidak ditemukan"),
+    (["update", "MH000001", "modul_1"], "kolom=nilai"),
+    (["delete"], "--where"),
+])
+def test_perintah_tidak_valid(store, argv, pesan):
+    sebelum = isi(store)
+    with pytest.raises(ValueError, match=pesan):
+        jalankan(store, *argv)
+    assert isi(store) == sebelum
+
+
+def test_query_jsonl_dan_delete_where(store):
+    baris = jalankan(store, "query", "--where", "program = \"Product Management\"", "--where", "modul_1 >= 50",
+                     "--format", "jsonl").splitlines()
+    harapan = [nim for nim in store if store[nim]["program"] == "Product Management" and store[nim]["modul_1"] >= 50]
+    assert [json.loads(teks)["nim"] for teks in baris] == harapan
+    assert jalankan(store, "delete", "--where", "program = \"Product Management\"",
+                    "--where", "modul_1 >= 50") == f"{len(harapan)} data berhasil dihapus.\n"
+    assert not any(nim in store for nim in harapan)
+
+
+def test_batch_melanjutkan_setelah_baris_gagal(store, tmp_path, capsys):
+    path = tmp_path / "perintah.txt"
+    path.write_text("# komentar\n"
+                    f"add {' '.join(repr(teks) for teks in TAMBAH)}\n"
+                    "update MH999999 modul_1=1\n"
+                    "\n"
+                    "update MH900000 modul_3=10\n"
+                    "batch lain.txt\n", encoding="utf-8")
+    keluaran = jalankan(store, "batch", str(path))
+    assert store["MH900000"]["modul_3"] == 10
+    galat = capsys.readouterr().err
+    assert "Baris 3:" in galat and "Baris 6:" in galat and "Baris 5:" not in galat
+    assert "2 perintah berhasil, 2 gagal" in keluaran
+
+
+def test_main_menyimpan_antar_proses(tmp_path):
+    env = dict(os.environ, DATA_MAHASISWA_DIR=str(tmp_path), DATA_MAHASISWA_ANGKATAN_PANAS="0")
+
+    def cli(*argv):
+        return subprocess.run([sys.executable, os.path.join(ROOT, "data_nilai_mahasiswa.py"), *argv], env=env,
+                              capture_output=True, text=True, timeout=60)
+
+    assert cli("add", *TAMBAH).returncode == 0
+    hasil = cli("query", "--where", "nim = MH900000", "--format", "csv")
+    assert hasil.returncode == 0
+    assert hasil.stdout.splitlines()[1].startswith("MH900000,Sari Dewi,")
+    gagal = cli("add", *TAMBAH)
+    assert gagal.returncode == 1
+    assert gagal.stderr.startswith("Error:")
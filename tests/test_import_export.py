@@ -0,0 +1,94 @@
+import csv
+import json
+
+import pytest
+
+from conftest import isi, jalankan
+import data_nilai_mahasiswa as dm
+
+
+def tulis_csv(path, rows):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        penulis = csv.DictWriter(f, fieldnames=dm.KOLOM_FILE)
+        penulis.writeheader()
+        penulis.writerows(rows)
+
+
+def baris(store, asal, **ubah):
+    return {**store[asal], "nim": asal, **ubah}
+
+
+@pytest.mark.parametrize("format_data", ["csv", "jsonl"])
+def test_export_lalu_import_kembali(store, tmp_path, format_data):
+    path = str(tmp_path / f"roster.{format_data}")
+    assert dm.export_data(store, path) == len(store)
+    baru = dm.DataMahasiswa()
+    diterima, ditolak, _ = dm.import_data(baru, path)
+    assert (diterima, ditolak) == (len(store), 0)
+    assert isi(baru) == isi(store)
+
+
+def test_import_menolak_baris_tidak_valid(store, tmp_path):
+    path = str(tmp_path / "masuk.csv")
+    rows = [
+        baris(store, "MH000000", nim="mh900001"),
+        baris(store, "MH000001", nim="MH900002", modul_1="101"),
+        baris(store, "MH000002", nim="MH900003", program="Program Palsu"),
+        baris(store, "MH000003", nim="MH900001"),
+        baris(store, "MH000004"),
+        baris(store, "MH000005", nim="MH900004", angkatan="20x1"),
+        baris(store, "MH000006", nim="MH900005"),
+    ]
+    tulis_csv(path, rows)
+    jumlah = len(store)
+    diterima, ditolak, path_tolak = dm.import_data(store, path)
+    assert (diterima, ditolak) == (2, 5)
+    assert len(store) == jumlah + 2
+    assert store["MH900001"]["nama"] == store["MH000000"]["nama"]
+    with open(path_tolak, encoding="utf-8", newline="") as f:
+        tolak = list(csv.DictReader(f))
+    assert [row["nim"] for row in tolak] == ["MH900002", "MH900003", "MH900001", "MH000004", "MH900004"]
+    assert all(row["alasan"] for row in tolak)
+
+
+def test_import_jsonl_tanpa_tolakan_tidak_meninggalkan_file(store, tmp_path):
+    path = tmp_path / "masuk.jsonl"
+    path.write_text(json.dumps(baris(store, "MH000010", nim="MH900010")) + "\n\n", encoding="utf-8")
+    assert dm.import_data(store, str(path))[:2] == (1, 0)
+    assert not (tmp_path / "masuk_tolak.jsonl").exists()
+
+
+
+def test_import_jsonl_menolak_baris_rusak(store, tmp_path):
+    path = tmp_path / "masuk.jsonl"
+    isi_file = [json.dumps(baris(store, "MH000011", nim="MH900011")), '{"nim": "MH900012", "nama": ', "[1, 2]",
+                "null", '"teks"', json.dumps(baris(store, "MH000013", nim="MH900013"))]
+    path.write_text("\n".join(isi_file) + "\n", encoding="utf-8")
+    diterima, ditolak, path_tolak = dm.import_data(store, str(path))
+    assert (diterima, ditolak) == (2, 4)
+    assert dm.jalankan_query(store, dm.parse_query("nim = MH90001*")) == ["MH900011", "MH900013"]
+    with open(path_tolak, encoding="utf-8") as f:
+        tolak = [json.loads(baris) for baris in f]
+    assert [row["baris"] for row in tolak] == isi_file[1:5]
+    assert all(row["alasan"] == "Baris bukan objek JSON yang valid" for row in tolak)
+
+
+def test_import_cli_jsonl_rusak_ke_file_tolak(store, tmp_path):
+    path = tmp_path / "masuk.jsonl"
+    path.write_text("[1, 2]\n{rusak\n" + json.dumps(baris(store, "MH000020", nim="MH900020")) + "\n",
+                    encoding="utf-8")
+    tolak = tmp_path / "tolak.csv"
+    keluaran = jalankan(store, "import", str(path), "--tolak", str(tolak))
+    assert "2 data ditolak" in keluaran
+    assert store.ada("MH900020")
+    with open(tolak, encoding="utf-8", newline="") as f:
+        assert [row["alasan"] for row in csv.DictReader(f)] == ["Baris bukan objek JSON yang valid"] * 2
+
+def test_export_subset_mengikuti_urutan(store, tmp_path):
+    path = str(tmp_path / "subset.jsonl")
+    nims = ["MH000020", "MH000003", "MH000011"]
+    assert dm.export_data(store, path, nims) == 3
+    with open(path, encoding="utf-8") as f:
+        hasil = [json.loads(row) for row in f]
+    assert [row.pop("nim") for row in hasil] == nims
+    assert hasil == [dict(store[nim]) for nim in nims]
@@ -0,0 +1,77 @@
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import data_nilai_mahasiswa as dm
+
+NAMA = ["Andi Wijaya", "Budi Sutresno", "Citra Hati", "Dewi Pertiwi", "Eka Gunting", "Tri Lestari", "Putri Ayu"]
+KEYWORD = {
+    'nim': ["mh", "mh00012", "0012", "7", "mh000199", "xyz"],
+    'nama': ["wija", "an", "a", "tri lestari", "putriayu", "zzz"],
+    'gender': ["laki", "perempuan", "-"],
+    'program': ["data", "design", "digitalmarketing", "&"],
+    'angkatan': ["2021", "202", "1", "2030"],
+    'metode_belajar': ["online", "on", "campus"],
+    'jadwal': ["afterhours", "hours", "office"],
+}
+
+
+def buat_record(rng):
+    return {
+        "nama": rng.choice(NAMA),
+        "gender": rng.choice(list(dm.GENDER_OPTIONS.values())),
+        "program": rng.choice(dm.PROGRAM_LIST),
+        "angkatan": rng.randint(2018, 2025),
+        "metode_belajar": rng.choice(list(dm.METHOD_OPTIONS.values())),
+        "jadwal": rng.choice(list(dm.SCHEDULE_OPTIONS.values())),
+        "modul_1": rng.randint(0, 100),
+        "modul_2": rng.randint(0, 100),
+        "modul_3": rng.randint(0, 100),
+    }
+
+
+def scan_linear(data_mahasiswa, kolom, keyword):
+    hasil = []
+    for nim in data_mahasiswa:
+        nilai = nim if kolom == 'nim' else str(data_mahasiswa[nim][kolom])
+        if keyword in nilai.replace(" ", "").lower():
+            hasil.append(nim)
+    return hasil
+
+
+@pytest.fixture
+def data_mahasiswa():
+    rng = random.Random(0)
+    return dm.DataMahasiswa({f"MH{i:06d}": buat_record(rng) for i in range(200)})
+
+
+def cocok_semua(data_mahasiswa):
+    for kolom, daftar in KEYWORD.items():
+        for keyword in daftar:
+            keyword = dm.normalisasi(keyword)
+            assert data_mahasiswa.cari(kolom, keyword) == scan_linear(data_mahasiswa, kolom, keyword), (kolom, keyword)
+
+
+def test_indeks_sama_dengan_scan_linear(data_mahasiswa):
+    cocok_semua(data_mahasiswa)
+
+
+def test_indeks_mengikuti_tambah_ubah_hapus(data_mahasiswa):
+    rng = random.Random(1)
+    for i in range(100):
+        nim = rng.choice(list(data_mahasiswa))
+        pilihan = rng.random()
+        if pilihan < 0.3:
+            del data_mahasiswa[nim]
+        elif pilihan < 0.5:
+            data_mahasiswa[f"MH{300 + i:06d}"] = buat_record(rng)
+        elif pilihan < 0.6:
+            data_mahasiswa[nim] = buat_record(rng)
+        else:
+            kolom = rng.choice(['nama', 'program', 'angkatan', 'jadwal'])
+            data_mahasiswa.ubah(nim, kolom, buat_record(rng)[kolom])
+    cocok_semua(data_mahasiswa)
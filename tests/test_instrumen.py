@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+from conftest import isi_store
+import data_nilai_mahasiswa as dm
+
+
+@pytest.fixture
+def laporan(tmp_path, monkeypatch):
+    monkeypatch.setattr(dm, "INSTRUMEN", None)
+    path = tmp_path / "profil.json"
+
+    def baca():
+        return {row["nama"]: row for row in json.loads(path.read_text(encoding="utf-8"))["operasi"]}
+
+    yield str(path), baca
+    dm.matikan_instrumen()
+
+
+def test_tanpa_instrumen_tidak_mencatat(store, monkeypatch):
+    monkeypatch.setattr(dm, "INSTRUMEN", None)
+    assert dm.aktifkan_instrumen("") is None
+    dm.jalankan_query(store, dm.parse_query("modul_1 >= 50"))
+    assert dm.INSTRUMEN is None
+
+
+def test_waktu_mencatat_panggilan_dan_hasil(laporan, capsys):
+    path, baca = laporan
+    data_mahasiswa = isi_store(200)
+    instrumen = dm.aktifkan_instrumen("1", path, 0)
+    assert instrumen.mode == {"waktu"}
+    hasil = dm.jalankan_query(data_mahasiswa, dm.parse_query("modul_1 >= 50"))
+    dm.jalankan_query(data_mahasiswa, dm.parse_query("program = \"Product Management\""))
+    dm.ranking(data_mahasiswa, "rata_rata", 5)
+    dm.matikan_instrumen()
+    assert dm.INSTRUMEN is None
+
+    operasi = baca()
+    assert operasi["query"]["panggil"] == 2
+    assert operasi["query"]["hasil"] >= len(hasil)
+    assert operasi["query"]["dipindai"] >= len(data_mahasiswa)
+    assert (operasi["ranking"]["panggil"], operasi["ranking"]["hasil"]) == (1, 5)
+    assert all(row["total_ms"] >= 0 for row in operasi.values())
+    assert f"Profil disimpan di {path}" in capsys.readouterr().err
+
+
+def test_cprofile_menulis_pstats(laporan, tmp_path):
+    path, baca = laporan
+    dm.aktifkan_instrumen("waktu, cProfile", path, 0)
+    dm.ranking(isi_store(50), "modul_1", 3)
+    dm.matikan_instrumen()
+    assert "ranking" in baca()
+    assert (tmp_path / "profil.pstats").exists()
+
+
+def test_mode_tidak_dikenal(monkeypatch):
+    monkeypatch.setattr(dm, "INSTRUMEN", None)
+    with pytest.raises(ValueError, match="flamegraph"):
+        dm.aktifkan_instrumen("waktu,flamegraph")
+    assert dm.INSTRUMEN is None
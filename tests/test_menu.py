@@ -0,0 +1,30 @@
+from tabulate import tabulate
+
+import data_nilai_mahasiswa as dm
+
+
+def test_menu_sama_dengan_render_langsung(capsys):
+    dm.display_menu("Menu Uji", ["Satu", "Dua Panjang Sekali"])
+    tabel = tabulate([(1, "Satu"), (2, "Dua Panjang Sekali")], headers=["No.", "Pilihan"], tablefmt="grid",
+                     colalign=("center", "center"))
+    lebar = max(len(baris) for baris in tabel.splitlines())
+    harapan = "\n".join(["\n" + "===== Menu Uji =====".center(lebar), tabel, "=" * lebar])
+    assert capsys.readouterr().out == harapan + "\n"
+
+
+def test_menu_yang_sama_diambil_dari_cache(capsys):
+    dm.render_menu.cache_clear()
+    for _ in range(3):
+        dm.display_menu("Menu Cache", ["A", "B"])
+        dm.display_options("Opsi Cache", {'1': "Laki - Laki", '2': "Perempuan"})
+    info = dm.render_menu.cache_info()
+    assert (info.misses, info.hits) == (2, 4)
+    keluaran = capsys.readouterr().out
+    assert keluaran.count("Menu Cache") == 3
+
+
+def test_isi_menu_berbeda_tidak_memakai_cache_lama(capsys):
+    dm.display_options("Opsi", ["Online", "On Campus"])
+    dm.display_options("Opsi", ["Online", "Hybrid"])
+    keluaran = capsys.readouterr().out
+    assert "On Campus" in keluaran and "Hybrid" in keluaran
@@ -0,0 +1,94 @@
+import pytest
+
+import data_nilai_mahasiswa as dm
+from conftest import buat_roster, isi_store
+
+QUERY = ["modul_1 < 50", "program = \"Digital Marketing\" AND modul_2 >= 70", "nama ~ wijaya OR angkatan = 2020",
+         "nim = MH0001* AND gender = Perempuan", "jadwal != \"Office Hours\""]
+
+
+@pytest.fixture
+def store_paralel(monkeypatch):
+    monkeypatch.setattr(dm, "BATAS_PARALEL", 100)
+    data_mahasiswa = isi_store(2000)
+    data_mahasiswa.paralel = dm.PemindaiParalel(2)
+    yield data_mahasiswa
+    data_mahasiswa.paralel.tutup()
+    data_mahasiswa.paralel = None
+
+
+def lokal(data_mahasiswa, node):
+    return [nim for nim in data_mahasiswa if dm.uji_record(data_mahasiswa, nim, node)]
+
+
+def test_hasil_shard_sama_dengan_lokal(store_paralel):
+    for teks in QUERY:
+        node = dm.parse_query(teks)
+        assert dm.jalankan_query(store_paralel, node) == lokal(store_paralel, node)
+
+
+def test_mutasi_dikoreksi_tanpa_ekspor_ulang(store_paralel):
+    data_mahasiswa = store_paralel
+    node = dm.parse_query(QUERY[1])
+    dm.jalankan_query(data_mahasiswa, node)
+    path = data_mahasiswa.paralel._path
+
+    dm.api_hapus(data_mahasiswa, [nim for nim in list(data_mahasiswa)[:5]])
+    for nim in list(data_mahasiswa)[10:20]:
+        data_mahasiswa[nim]["program"] = "Digital Marketing"
+        data_mahasiswa[nim]["modul_2"] = 90
+    data_mahasiswa.terapkan_batch({f"MH9{i:05d}": dict(data, program="Digital Marketing", modul_2=75)
+                                   for i, data in enumerate(buat_roster(5, seed=7).values())})
+    for teks in QUERY:
+        node = dm.parse_query(teks)
+        assert dm.jalankan_query(data_mahasiswa, node) == lokal(data_mahasiswa, node)
+    assert data_mahasiswa.paralel._path == path
+
+
+def test_ekspor_ulang_jika_perubahan_banyak_atau_tanpa_event(store_paralel):
+    data_mahasiswa = store_paralel
+    node = dm.parse_query(QUERY[0])
+    dm.jalankan_query(data_mahasiswa, node)
+    path = data_mahasiswa.paralel._path
+    for nim in list(data_mahasiswa)[:100]:
+        data_mahasiswa[nim]["modul_1"] = 10
+    assert dm.jalankan_query(data_mahasiswa, node) == lokal(data_mahasiswa, node)
+    assert data_mahasiswa.paralel._path != path
+
+    path = data_mahasiswa.paralel._path
+    pendengar, data_mahasiswa.pendengar = data_mahasiswa.pendengar, []
+    data_mahasiswa["MH000500"]["modul_1"] = 1
+    data_mahasiswa.pendengar = pendengar
+    assert "MH000500" in dm.jalankan_query(data_mahasiswa, node)
+    assert data_mahasiswa.paralel._path != path
+
+
+def test_perencana_menentukan_fan_out(store_paralel, monkeypatch):
+    data_mahasiswa = store_paralel
+    data_mahasiswa.indeks
+    dipanggil = []
+    asli = data_mahasiswa.paralel.query
+    monkeypatch.setattr(data_mahasiswa.paralel, "query",
+                        lambda store, node: dipanggil.append(node) or asli(store, node))
+
+    for teks in ["nim = MH000123", "angkatan = 2020 AND modul_2 > 95", "nama ~ lestari AND modul_1 < 5",
+                 "nim >= MH00012 AND nim < MH00015"]:
+        node = dm.parse_query(teks)
+        assert dm.jalankan_query(data_mahasiswa, node) == lokal(data_mahasiswa, node)
+    assert dipanggil == []
+
+    node = dm.parse_query("modul_1 >= 0")
+    assert dm.jalankan_query(data_mahasiswa, node) == list(data_mahasiswa)
+    assert len(dipanggil) == 1
+
+
+def test_statistik_shard_sama_dengan_lokal(store_paralel):
+    data_mahasiswa = store_paralel
+    dm.jalankan_query(data_mahasiswa, dm.parse_query(QUERY[0]))
+    data_mahasiswa["MH000001"]["modul_3"] = 3
+    gabungan = dm.StatistikMahasiswa(data_mahasiswa).grup
+    paralel, data_mahasiswa.paralel = data_mahasiswa.paralel, None
+    try:
+        assert dm.StatistikMahasiswa(data_mahasiswa).grup == gabungan
+    finally:
+        data_mahasiswa.paralel = paralel
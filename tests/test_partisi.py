@@ -0,0 +1,74 @@
+import json
+import random
+
+from conftest import isi, isi_store, jalankan
+import data_nilai_mahasiswa as dm
+
+QUERY = ["nim = MH0001*", "nim >= MH000150 and nim < MH000420", "nim <= MH000099 and modul_1 > 50",
+         "nim = MH000333", "program = \"Digital Marketing\"", "nim > MH000250 or nim < MH000010"]
+
+
+def brute(nims, node):
+    return sorted(nim for nim in nims if node.uji(nim))
+
+
+def test_indeks_nim_sama_dengan_list_terurut(monkeypatch):
+    monkeypatch.setattr(dm, "UKURAN_BLOK_NIM", 4)
+    rng = random.Random(0)
+    nims = {f"MH{rng.randint(0, 999):06d}" for _ in range(200)}
+    indeks = dm.IndeksNim(nims)
+    for _ in range(300):
+        nim = f"MH{rng.randint(0, 999):06d}"
+        if nim in nims:
+            nims.remove(nim)
+            indeks.hapus(nim)
+        else:
+            nims.add(nim)
+            indeks.tambah(nim)
+    assert list(indeks) == sorted(nims) and len(indeks) == len(nims)
+    assert max(map(len, indeks.blok)) <= 8
+
+    for teks in ["nim = MH0001*", "nim = MH000500", "nim < MH000300", "nim <= MH000300", "nim > MH000700",
+                 "nim >= MH000700", "nim = MH9*", "nim >= MH000000"]:
+        node = dm.parse_query(teks)
+        rentang = indeks.rentang(node)
+        assert list(indeks.potong(*rentang)) == brute(nims, node)
+        assert indeks.hitung(*rentang) == len(brute(nims, node))
+    assert indeks.awalan("MH00002") == [nim for nim in sorted(nims) if nim.startswith("MH00002")]
+
+
+def test_partisi_memangkas_shard():
+    partisi = dm.PartisiNim(["mh000300", "MH000100", "MH000200 "])
+    assert partisi.batas == ["MH000100", "MH000200", "MH000300"]
+    assert [partisi.nomor(nim) for nim in ["MH000000", "MH000100", "MH000299", "MH999999"]] == [0, 1, 2, 3]
+    assert list(partisi.cocok(dm.parse_query("nim = MH00015*"))) == [1]
+    assert list(partisi.cocok(dm.parse_query("nim >= MH000150 and nim < MH000250"))) == [1, 2]
+    assert list(partisi.cocok(dm.parse_query("modul_1 > 3"))) == [0, 1, 2, 3]
+
+
+def test_split_lalu_query_partisi(tmp_path):
+    data_mahasiswa = isi_store(500)
+    folder = str(tmp_path / "partisi")
+    keluaran = jalankan(data_mahasiswa, "split", folder, "--batas", "MH000100", "MH000250", "MH000400")
+    assert "(150 data)" in keluaran and "shard-0003.bin" in keluaran
+
+    partisi = dm.muat_partisi(folder)
+    shards = [partisi.buka(folder, nomor) for nomor in range(len(partisi))]
+    assert [len(shard) for shard in shards] == [100, 150, 150, 100]
+    assert {nim: data for shard in shards for nim, data in isi(shard).items()} == isi(data_mahasiswa)
+
+    for teks in QUERY:
+        node = dm.parse_query(teks)
+        hasil = [nim for _, nims in dm.query_partisi(folder, [node]) for nim in nims]
+        assert sorted(hasil) == sorted(dm.jalankan_query(data_mahasiswa, node))
+
+    keluaran = jalankan(data_mahasiswa, "query", "--partisi", folder, "--where", QUERY[1], "--format", "jsonl")
+    assert [json.loads(baris)["nim"] for baris in keluaran.splitlines()] == [f"MH{i:06d}" for i in range(150, 420)]
+
+
+def test_split_ulang_menghapus_shard_lama(tmp_path):
+    data_mahasiswa = isi_store(100)
+    folder = tmp_path / "partisi"
+    jalankan(data_mahasiswa, "split", str(folder), "--batas", "MH000020", "MH000040", "MH000060")
+    jalankan(data_mahasiswa, "split", str(folder), "--batas", "MH000050")
+    assert sorted(path.name for path in folder.glob("shard-*.bin")) == ["shard-0000.bin", "shard-0001.bin"]
@@ -0,0 +1,150 @@
+import mmap
+import os
+import types
+
+import pytest
+
+import data_nilai_mahasiswa as dm
+from conftest import buat_roster, isi
+
+
+def daftar(folder, jenis):
+    return sorted(nama for nama in os.listdir(folder) if nama.startswith(jenis + "-"))
+
+
+def test_data_bertahan_setelah_tutup(tmp_path):
+    penyimpanan = dm.PenyimpananMahasiswa(str(tmp_path))
+    data_mahasiswa = penyimpanan.muat(dm.DATA_AWAL)
+    data_mahasiswa["MH011"] = dict(dm.DATA_AWAL["MH001"], nama="Rina Ayu")
+    data_mahasiswa["MH002"]["modul_3"] = 11
+    del data_mahasiswa["MH003"]
+    harapan = isi(data_mahasiswa)
+    penyimpanan.tutup()
+
+    penyimpanan = dm.PenyimpananMahasiswa(str(tmp_path))
+    assert isi(penyimpanan.muat()) == harapan
+    penyimpanan.tutup()
+
+
+def test_wal_diputar_ulang_setelah_crash(tmp_path):
+    penyimpanan = dm.PenyimpananMahasiswa(str(tmp_path))
+    data_mahasiswa = penyimpanan.muat(dm.DATA_AWAL)
+    data_mahasiswa.terapkan_batch(buat_roster(50))
+    data_mahasiswa["MH001"]["nama"] = "Andi Baru"
+    harapan = isi(data_mahasiswa)
+    # Tanpa tutup(): isi WAL sudah di-flush per commit.
+    penyimpanan._berhenti.set()
+
+    penyimpanan = dm.PenyimpananMahasiswa(str(tmp_path))
+    assert isi(penyimpanan.muat()) == harapan
+    penyimpanan.tutup()
+
+
+def test_baris_wal_terpotong_diabaikan(tmp_path):
+    penyimpanan = dm.PenyimpananMahasiswa(str(tmp_path))
+    data_mahasiswa = penyimpanan.muat(dm.DATA_AWAL)
+    data_mahasiswa["MH002"]["modul_1"] = 1
+    penyimpanan.tutup()
+    wal = os.path.join(tmp_path, daftar(tmp_path, "wal")[-1])
+    with open(wal, "a", encoding="utf-8") as f:
+        f.write('["tambah", "MH099", null, null, {"nama": "Pot')
+
+    penyimpanan = dm.PenyimpananMahasiswa(str(tmp_path))
+    data_mahasiswa = penyimpanan.muat()
+    assert data_mahasiswa["MH002"]["modul_1"] == 1
+    assert "MH099" not in data_mahasiswa
+    penyimpanan.tutup()
+
+
+def test_rotasi_dan_kompaksi(tmp_path):
+    penyimpanan = dm.PenyimpananMahasiswa(str(tmp_path), batas_kompaksi=10)
+    data_mahasiswa = penyimpanan.muat(dm.DATA_AWAL)
+    for nim, data in buat_roster(35).items():
+        data_mahasiswa[nim] = data
+    harapan = isi(data_mahasiswa)
+    penyimpanan.tutup()
+    assert len(daftar(tmp_path, "snapshot")) == 1
+    assert len(daftar(tmp_path, "wal")) <= 2
+
+    penyimpanan = dm.PenyimpananMahasiswa(str(tmp_path))
+    assert isi(penyimpanan.muat()) == harapan
+    penyimpanan.tutup()
+
+
+def test_segmen_wal_tidak_menumpuk_antar_proses(tmp_path):
+    harapan = None
+    for i in range(30):
+        penyimpanan = dm.PenyimpananMahasiswa(str(tmp_path), batas_segmen=8)
+        data_mahasiswa = penyimpanan.muat(dm.DATA_AWAL)
+        data_mahasiswa[f"MH{100 + i}"] = dict(dm.DATA_AWAL["MH001"])
+        harapan = isi(data_mahasiswa)
+        penyimpanan.tutup()
+        assert len(daftar(tmp_path, "wal")) <= 8
+    assert len(daftar(tmp_path, "snapshot")) == 1
+
+    penyimpanan = dm.PenyimpananMahasiswa(str(tmp_path))
+    assert isi(penyimpanan.muat()) == harapan
+    penyimpanan.tutup()
+
+
+def test_event_yang_diputar_ulang_dihitung(tmp_path):
+    for i in range(12):
+        penyimpanan = dm.PenyimpananMahasiswa(str(tmp_path), batas_kompaksi=20, batas_segmen=1000)
+        data_mahasiswa = penyimpanan.muat(dm.DATA_AWAL)
+        data_mahasiswa.terapkan_batch({f"MH{100 + i}": dict(dm.DATA_AWAL["MH001"])})
+        data_mahasiswa["MH002"]["modul_1"] = i
+        data_mahasiswa["MH003"]["modul_1"] = i
+        penyimpanan.tutup()
+        assert penyimpanan._sejak_snapshot < 20 + 3
+    assert len(daftar(tmp_path, "wal")) < 12
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="butuh /proc untuk mencatat file yang di-mmap")
+def test_kompaksi_dua_kali_tanpa_menghapus_file_yang_di_mmap(tmp_path, monkeypatch):
+    # Meniru Windows: file yang masih di-mmap tidak boleh dihapus.
+    dipetakan = {}
+
+    class MmapTercatat(mmap.mmap):
+        def __new__(cls, fileno, *args, **kwargs):
+            peta = super().__new__(cls, fileno, *args, **kwargs)
+            dipetakan[id(peta)] = os.readlink(f"/proc/self/fd/{fileno}")
+            return peta
+
+        def close(self):
+            dipetakan.pop(id(self), None)
+            super().close()
+
+    hapus = os.remove
+
+    def hapus_ala_windows(path):
+        if os.path.realpath(path) in map(os.path.realpath, dipetakan.values()):
+            raise PermissionError(f"{path} masih di-mmap")
+        hapus(path)
+
+    penyimpanan = dm.PenyimpananMahasiswa(str(tmp_path))
+    penyimpanan.muat(dm.DATA_AWAL)
+    penyimpanan.tutup()
+
+    monkeypatch.setattr(dm, "mmap", types.SimpleNamespace(mmap=MmapTercatat, ACCESS_COPY=mmap.ACCESS_COPY))
+    monkeypatch.setattr(os, "remove", hapus_ala_windows)
+    penyimpanan = dm.PenyimpananMahasiswa(str(tmp_path), batas_kompaksi=10, batas_segmen=1000)
+    data_mahasiswa = penyimpanan.muat()
+    awal = daftar(tmp_path, "snapshot")
+    for putaran in range(2):
+        for i in range(10):
+            data_mahasiswa[f"MH{200 + putaran * 10 + i}"] = dict(dm.DATA_AWAL["MH001"])
+        penyimpanan._kompaksi.join()
+        # Snapshot sementara kompaksi sudah ditutup; yang tersisa hanya snapshot milik store aktif.
+        assert len(dipetakan) == 1
+        assert daftar(tmp_path, "snapshot")[0] == awal[0]
+        assert len(daftar(tmp_path, "snapshot")) == 2
+    assert data_mahasiswa["MH001"]["nama"] == dm.DATA_AWAL["MH001"]["nama"]
+    harapan = isi(data_mahasiswa)
+    penyimpanan.tutup()
+
+    # Proses berikutnya: mmap lama sudah hilang, snapshot yang ditunda dihapus saat folder dibuka.
+    dipetakan.clear()
+    penyimpanan = dm.PenyimpananMahasiswa(str(tmp_path))
+    assert isi(penyimpanan.muat()) == harapan
+    assert len(daftar(tmp_path, "snapshot")) == 1
+    penyimpanan.tutup()
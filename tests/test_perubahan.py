@@ -0,0 +1,88 @@
+import json
+import random
+
+import pytest
+
+from conftest import buat_record, isi_store, jalankan
+import data_nilai_mahasiswa as dm
+
+
+@pytest.fixture
+def aliran(tmp_path):
+    data_mahasiswa = isi_store(200)
+    aliran = dm.pasang_aliran(data_mahasiswa, str(tmp_path / "perubahan.jsonl"))
+    yield data_mahasiswa, aliran
+    aliran.tutup()
+
+
+def mutasi_acak(data_mahasiswa, jumlah, seed=0):
+    rng = random.Random(seed)
+    for i in range(jumlah):
+        nim = rng.choice(list(data_mahasiswa))
+        pilihan = rng.random()
+        if pilihan < 0.2:
+            del data_mahasiswa[nim]
+        elif pilihan < 0.4:
+            data_mahasiswa[f"MB{i:06d}"] = buat_record(rng)
+        else:
+            transaksi = dm.Transaksi(data_mahasiswa)
+            transaksi.ubah(nim, 'program', rng.choice(dm.PROGRAM_LIST))
+            transaksi.ubah(nim, rng.choice(dm.KOLOM_NILAI), rng.randint(0, 100))
+            transaksi.commit()
+
+
+def test_seq_berurutan_dan_baca_dari_tengah(aliran):
+    data_mahasiswa, aliran = aliran
+    mutasi_acak(data_mahasiswa, 60)
+    semua = list(dm.baca_perubahan(aliran.path))
+    assert [isi["seq"] for isi in semua] == list(range(1, aliran.seq + 1))
+    assert {isi["op"] for isi in semua} == {'tambah', 'hapus', 'ubah'}
+    for dari in (0, 1, 37, aliran.seq - 1, aliran.seq):
+        assert list(dm.baca_perubahan(aliran.path, dari)) == semua[dari:]
+
+
+def test_baris_terpotong_dibuang_saat_dibuka_lagi(aliran):
+    data_mahasiswa, aliran = aliran
+    mutasi_acak(data_mahasiswa, 10)
+    seq, path = aliran.seq, aliran.path
+    aliran.tutup()
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"seq": %d, "op": "ub' % (seq + 1))
+
+    data_mahasiswa.aliran = None
+    aliran = dm.pasang_aliran(data_mahasiswa, path)
+    try:
+        assert aliran.seq == seq
+        del data_mahasiswa["MH000010"]
+        assert [isi["seq"] for isi in dm.baca_perubahan(path, seq - 1)] == [seq, seq + 1]
+    finally:
+        aliran.tutup()
+
+
+@pytest.mark.parametrize("numpy", [True, False])
+def test_tampilan_inkremental_sama_dengan_bangun_ulang(monkeypatch, numpy):
+    if not numpy:
+        monkeypatch.setattr(dm, "np", None)
+    data_mahasiswa = isi_store(300)
+    roster = data_mahasiswa.tampilan('roster')
+    berisiko = data_mahasiswa.tampilan('berisiko', ambang=40)
+    assert data_mahasiswa.tampilan('berisiko', ambang=40) is berisiko
+    mutasi_acak(data_mahasiswa, 150, seed=1)
+
+    ulang = dm.RosterProgram(data_mahasiswa)
+    assert roster.ringkasan() == ulang.ringkasan()
+    assert roster.program == ulang.program
+    assert berisiko.modul == dm.MahasiswaBerisiko(data_mahasiswa, 40).modul
+    harapan = [nim for nim in data_mahasiswa if min(data_mahasiswa[nim][kolom] for kolom in dm.KOLOM_NILAI) < 40]
+    assert sorted(berisiko.daftar()) == sorted(harapan)
+
+
+def test_perintah_changes(aliran):
+    data_mahasiswa, aliran = aliran
+    mutasi_acak(data_mahasiswa, 20)
+    keluaran = jalankan(data_mahasiswa, "changes", "--dari", "5", "--batas", "3")
+    assert [json.loads(baris)["seq"] for baris in keluaran.splitlines()] == [6, 7, 8]
+
+    data_mahasiswa = isi_store(10)
+    with pytest.raises(ValueError, match="tidak aktif"):
+        jalankan(data_mahasiswa, "changes")
@@ -0,0 +1,70 @@
+import pytest
+
+from conftest import isi_store
+import data_nilai_mahasiswa as dm
+
+QUERY = [
+    "program = \"Digital Marketing\"",
+    "program != \"Digital Marketing\"",
+    "angkatan >= 2023 and modul_1 < 40",
+    "modul_2 = 100 or modul_3 = 0",
+    "nama ~ wija",
+    "nama = \"tri lestari\"",
+    "nim = MH0001*",
+    "nim != MH0001*",
+    "nim >= MH000250 and nim < MH000300",
+    "nim = mh000042",
+    "(jadwal = \"After Hours\" or metode_belajar = Online) and gender = Perempuan",
+    "program ~ design and (modul_1 > 50 or angkatan <= 2019)",
+]
+
+
+def brute(data_mahasiswa, node):
+    return {nim for nim in data_mahasiswa if dm.uji_record(data_mahasiswa, nim, node)}
+
+
+@pytest.fixture(params=["numpy", "python"])
+def data_mahasiswa(request, monkeypatch):
+    if request.param == "python":
+        monkeypatch.setattr(dm, "np", None)
+    return isi_store(600)
+
+
+@pytest.mark.parametrize("teks", QUERY)
+def test_query_sama_dengan_scan_penuh(data_mahasiswa, teks):
+    node = dm.parse_query(teks)
+    hasil = dm.jalankan_query(data_mahasiswa, node)
+    assert len(hasil) == len(set(hasil))
+    assert set(hasil) == brute(data_mahasiswa, node)
+
+
+def test_indeks_mengikuti_perubahan(data_mahasiswa):
+    node = dm.parse_query("nama ~ wija or program = \"3D & Animation\" or nim = MH0007*")
+    dm.jalankan_query(data_mahasiswa, node)
+    del data_mahasiswa["MH000003"]
+    data_mahasiswa["MH000700"] = dict(data_mahasiswa["MH000004"], nama="Wija Baru", program="3D & Animation")
+    data_mahasiswa["MH000005"] = dict(data_mahasiswa["MH000005"], nama="Tanpa Cocok", program="Product Management")
+    assert set(dm.jalankan_query(data_mahasiswa, node)) == brute(data_mahasiswa, node)
+
+
+def test_predikat_angka_dan_nim():
+    assert dm.parse_query("modul_1 >= 70").nilai == 70
+    assert dm.parse_query("nim = mh2023*").nilai == "MH2023*"
+    node = dm.parse_query("angkatan = 2020 and (nama ~ x or nim = MH1)")
+    assert node.op == "and" and [anak.op for anak in node.anak[1].anak] == ["~", "="]
+
+
+@pytest.mark.parametrize("teks, pesan", [
+    ("", "kosong"),
+    ("modul_1 >", "tidak ditemukan"),
+    ("umur = 3", "tidak dikenal"),
+    ("modul_1 = tinggi", "harus berupa angka"),
+    ("nama > budi", "hanya untuk"),
+    ("(modul_1 = 3", "Kurung tutup"),
+    ("modul_1 = 3)", "tidak terduga"),
+    ("and modul_1 = 3", "kolom operator nilai"),
+    ("modul_1", "Operator setelah"),
+])
+def test_query_tidak_valid(teks, pesan):
+    with pytest.raises(ValueError, match=pesan):
+        dm.parse_query(teks)
@@ -0,0 +1,47 @@
+import pytest
+
+from conftest import isi_store
+import data_nilai_mahasiswa as dm
+
+
+def skor(data_mahasiswa, nim, kunci):
+    if kunci == 'rata_rata':
+        return sum(data_mahasiswa[nim][kolom] for kolom in dm.KOLOM_NILAI)
+    return data_mahasiswa[nim][kunci]
+
+
+def brute(data_mahasiswa, kunci, k, terbawah, nims=None):
+    nims = list(data_mahasiswa) if nims is None else nims
+    urut = sorted(nims, key=lambda nim: skor(data_mahasiswa, nim, kunci) * (1 if terbawah else -1))
+    return urut[:k]
+
+
+@pytest.fixture(params=["numpy", "python"])
+def data_mahasiswa(request, monkeypatch):
+    if request.param == "python":
+        monkeypatch.setattr(dm, "np", None)
+    data_mahasiswa = isi_store(500)
+    for i in range(0, 500, 7):
+        del data_mahasiswa[f"MH{i:06d}"]
+    return data_mahasiswa
+
+
+@pytest.mark.parametrize("kunci", dm.KUNCI_RANKING)
+@pytest.mark.parametrize("terbawah", [False, True])
+def test_ranking_sama_dengan_sort_penuh(data_mahasiswa, kunci, terbawah):
+    for k in (1, 10, 1000):
+        assert dm.ranking(data_mahasiswa, kunci, k, terbawah) == brute(data_mahasiswa, kunci, k, terbawah)
+
+
+def test_ranking_dengan_kondisi(data_mahasiswa):
+    kondisi = [dm.parse_query("program = \"Digital Marketing\" or angkatan >= 2024")]
+    nims = dm.api_query(data_mahasiswa, kondisi)
+    harapan = brute(data_mahasiswa, 'modul_1', 15, False, nims)
+    assert dm.ranking(data_mahasiswa, 'modul_1', 15, False, kondisi) == harapan
+    assert dm.ranking(data_mahasiswa, 'modul_1', 15, False, [dm.parse_query("nim = MH999999")]) == []
+
+
+def test_ranking_tidak_valid(data_mahasiswa):
+    assert dm.ranking(data_mahasiswa, 'rata_rata', 0) == []
+    with pytest.raises(ValueError, match="tidak dikenal"):
+        dm.ranking(data_mahasiswa, 'nama', 5)
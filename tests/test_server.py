@@ -0,0 +1,106 @@
+import asyncio
+import threading
+
+from conftest import isi_store
+import data_nilai_mahasiswa as dm
+import server_mahasiswa
+from server_mahasiswa import ServerMahasiswa
+
+QUERY = "query --where 'program = \"Digital Marketing\"' --format csv"
+
+
+def nim_csv(jawaban):
+    assert jawaban["ok"], jawaban
+    return sorted(baris.split(",")[0] for baris in jawaban["keluaran"].splitlines()[1:])
+
+
+def test_salinan_sama_dengan_store():
+    data_mahasiswa = isi_store(300)
+    data_mahasiswa.statistik
+    salinan = data_mahasiswa.salin()
+    for teks in ("program = \"Digital Marketing\"", "nama ~ wijaya and modul_1 >= 50", "nim = MH0001*"):
+        node = dm.parse_query(teks)
+        assert dm.jalankan_query(salinan, node) == dm.jalankan_query(data_mahasiswa, node)
+    assert salinan.statistik.ringkasan('program') == data_mahasiswa.statistik.ringkasan('program')
+    assert dm.ranking(salinan, 'rata_rata', 10) == dm.ranking(data_mahasiswa, 'rata_rata', 10)
+
+    asal = dict(data_mahasiswa["MH000001"])
+    del data_mahasiswa["MH000000"]
+    data_mahasiswa["MH000001"] = dict(asal, modul_1=(asal["modul_1"] + 1) % 101)
+    assert "MH000000" in salinan
+    assert dict(salinan["MH000001"]) == asal
+
+
+def test_pembaca_tidak_menunggu_bulk_delete(monkeypatch):
+    monkeypatch.setattr(server_mahasiswa, "BATAS_HAPUS_SALINAN", 10)
+    data_mahasiswa = isi_store(300)
+    server = ServerMahasiswa(data_mahasiswa)
+    sebelum = nim_csv(asyncio.run(server.proses(QUERY)))
+    mulai = threading.Event()
+    lanjut = threading.Event()
+    hapus = server._hapus
+
+    def hapus_lambat(*args):
+        mulai.set()
+        lanjut.wait(10)
+        return hapus(*args)
+    server._hapus = hapus_lambat
+
+    async def skenario():
+        loop = asyncio.get_running_loop()
+        tugas = asyncio.create_task(server.proses("delete --where 'program = \"Digital Marketing\"'"))
+        await loop.run_in_executor(None, mulai.wait, 10)
+        # Writer sedang memegang lock tulis; query tetap dijawab dari salinan sebelum delete.
+        selama = await asyncio.wait_for(server.proses(QUERY), 5)
+        statistik = await asyncio.wait_for(server.proses("stats --by program"), 5)
+        lanjut.set()
+        return selama, statistik, await tugas, await server.proses(QUERY)
+
+    selama, statistik, hasil_hapus, sesudah = asyncio.run(skenario())
+    assert nim_csv(selama) == sebelum
+    assert "Digital Marketing" in statistik["keluaran"]
+    assert hasil_hapus["keluaran"] == f"{len(sebelum)} data berhasil dihapus.\n"
+    assert nim_csv(sesudah) == []
+    assert server._salinan is None
+
+
+def test_pembaca_menunggu_jika_tidak_ada_salinan():
+    data_mahasiswa = isi_store(50)
+    server = ServerMahasiswa(data_mahasiswa)
+
+    async def skenario():
+        lepas = asyncio.Event()
+
+        async def tahan():
+            async with server.kunci.tulis():
+                await lepas.wait()
+        penulis = asyncio.create_task(tahan())
+        await asyncio.sleep(0)
+        pembaca = asyncio.create_task(server.proses(QUERY))
+        await asyncio.sleep(0.05)
+        menunggu = not pembaca.done()
+        lepas.set()
+        await penulis
+        return menunggu, await pembaca
+
+    menunggu, jawaban = asyncio.run(skenario())
+    assert menunggu
+    assert jawaban["ok"]
+
+
+def test_delete_kecil_tidak_menyalin_store(monkeypatch):
+    monkeypatch.setattr(server_mahasiswa, "BATAS_HAPUS_SALINAN", 10)
+    data_mahasiswa = isi_store(300)
+    server = ServerMahasiswa(data_mahasiswa)
+    salin = []
+    monkeypatch.setattr(data_mahasiswa, "salin", lambda: salin.append(1) or dm.DataMahasiswa.salin(data_mahasiswa))
+
+    jawaban = asyncio.run(server.proses("delete --where 'nim = MH00000*'"))
+    assert jawaban["keluaran"] == "10 data berhasil dihapus.\n"
+    assert salin == [1]
+    harapan = len(dm.jalankan_query(data_mahasiswa, dm.parse_query("nim = MH00001* and modul_1 >= 50")))
+    assert harapan < 10
+    jawaban = asyncio.run(server.proses("delete --where 'nim = MH00001*' --where 'modul_1 >= 50'"))
+    assert jawaban["keluaran"] == f"{harapan} data berhasil dihapus.\n"
+    assert salin == [1]
+    assert server._salinan is None
@@ -0,0 +1,133 @@
+import random
+import types
+
+import pytest
+
+import data_nilai_mahasiswa as dm
+from conftest import buat_record, isi_store
+
+KOLOM_MODUL_3 = '    Kolom(\'modul_3\', "Modul 3", minimum=0, maksimum=100, nilai=True)\n]'
+
+
+def salin_modul(nama, kolom_baru):
+    # Salinan modul dengan satu kolom tambahan di SKEMA, seperti setelah skema diperluas.
+    with open(dm.__file__, encoding="utf-8") as f:
+        sumber = f.read().replace("\r\n", "\n")
+    assert KOLOM_MODUL_3 in sumber
+    sumber = sumber.replace(KOLOM_MODUL_3, KOLOM_MODUL_3[:-2] + f",\n    {kolom_baru}\n]")
+    modul = types.ModuleType(nama)
+    modul.__file__ = dm.__file__
+    exec(compile(sumber, dm.__file__, "exec"), modul.__dict__)
+    return modul
+
+
+@pytest.fixture(scope="module")
+def dm4():
+    return salin_modul("data_nilai_mahasiswa_modul4",
+                       'Kolom(\'modul_4\', "Modul 4", minimum=0, maksimum=100, nilai=True)')
+
+
+@pytest.fixture(scope="module")
+def dm_lebar():
+    return salin_modul("data_nilai_mahasiswa_lebar",
+                       'Kolom(\'modul_4\', "Modul 4", minimum=0, maksimum=1000, nilai=True)')
+
+
+def test_kolom_dari_skema():
+    assert dm.HEADERS[0] == "NIM"
+    assert dm.KOLOM_DATA == [kolom.nama for kolom in dm.SKEMA]
+    assert dm.SKEMA_KOLOM['gender'].parse(" Perempuan ") == "Perempuan"
+    assert dm.SKEMA_KOLOM['angkatan'].parse("2021") == 2021
+    assert dm.SKEMA_KOLOM['modul_1'].parse_banyak(["100", "101", " 7", "x"]) == [100, None, 7, None]
+    for kolom, teks in (('gender', "Alien"), ('angkatan', "21"), ('nama', "R2D2")):
+        with pytest.raises(ValueError):
+            dm.parse_kolom(kolom, teks)
+    with pytest.raises(ValueError):
+        dm.parse_kolom('tidak_ada', "1")
+
+
+def test_default_kolom():
+    assert dm.SKEMA_KOLOM['gender'].default == "Laki - Laki"
+    assert dm.SKEMA_KOLOM['modul_1'].default == 0
+    assert dm.Kolom('semester', "Semester", minimum=1, maksimum=14).default == 1
+    assert dm.lengkapi_record({'nama': "Andi"})['jadwal'] == dm.SKEMA_KOLOM['jadwal'].pilihan[0]
+
+
+def test_validasi_chunk_per_kolom():
+    data_mahasiswa = isi_store(3)
+    baris = [dict(dict(data_mahasiswa["MH000001"]), nim="mh1"), dict(dict(data_mahasiswa["MH000001"]), nim="MH000002"),
+             dict(dict(data_mahasiswa["MH000001"]), nim="MH2", modul_2="200"), {"nim": "MH3"}]
+    hasil = dm.validasi_chunk(baris, data_mahasiswa, set())
+    assert hasil[0][0][0] == "MH1"
+    assert hasil[1] == (None, "NIM kosong atau sudah ada")
+    assert hasil[2] == (None, dm.SKEMA_KOLOM['modul_2'].pesan)
+    assert hasil[3][0] is None
+
+
+def test_folder_baru_dengan_kolom_tambahan(dm4, tmp_path):
+    penyimpanan = dm4.PenyimpananMahasiswa(str(tmp_path))
+    data_mahasiswa = penyimpanan.muat(dm.DATA_AWAL)
+    assert data_mahasiswa["MH001"]["modul_4"] == 0
+    assert dm4.DATA_AWAL["MH001"]["modul_4"] == 0
+    data_mahasiswa["MH011"] = dict(dm.DATA_AWAL["MH001"])
+    penyimpanan.tutup()
+
+
+def test_snapshot_dan_wal_lama_dengan_kolom_tambahan(dm4, tmp_path):
+    penyimpanan = dm.PenyimpananMahasiswa(str(tmp_path))
+    data_mahasiswa = penyimpanan.muat(dm.DATA_AWAL)
+    data_mahasiswa["MH011"] = dict(dm.DATA_AWAL["MH002"], nama="Kiki Lama")
+    data_mahasiswa["MH001"]["modul_1"] = 40
+    dm.api_hapus(data_mahasiswa, ["MH003"])
+    penyimpanan.tutup()
+
+    penyimpanan = dm4.PenyimpananMahasiswa(str(tmp_path))
+    data_mahasiswa = penyimpanan.muat()
+    assert data_mahasiswa["MH011"]["nama"] == "Kiki Lama"
+    assert data_mahasiswa["MH011"]["modul_4"] == 0
+    assert data_mahasiswa["MH001"]["modul_1"] == 40
+    assert data_mahasiswa["MH005"]["modul_4"] == 0
+    assert "MH003" not in data_mahasiswa
+    data_mahasiswa["MH005"]["modul_4"] = 77
+    penyimpanan.tutup()
+
+    # Kolom yang dibuang dari skema dilewati saat WAL diputar ulang.
+    penyimpanan = dm.PenyimpananMahasiswa(str(tmp_path))
+    data_mahasiswa = penyimpanan.muat()
+    assert dict(data_mahasiswa["MH005"]) == dm.DATA_AWAL["MH005"]
+    penyimpanan.tutup()
+
+
+@pytest.mark.parametrize("numpy", [True, False])
+def test_kolom_nilai_lebih_dari_satu_byte(dm_lebar, monkeypatch, numpy):
+    if not numpy:
+        monkeypatch.setattr(dm_lebar, "np", None)
+    assert dm_lebar.SKEMA_KOLOM['modul_4'].typecode == 'H'
+    rng = random.Random(0)
+    data_mahasiswa = dm_lebar.DataMahasiswa()
+    for i in range(300):
+        data_mahasiswa[f"MH{i:06d}"] = dict(buat_record(rng), modul_4=rng.choice([0, 7, 255, 256, 999, 1000]))
+    del data_mahasiswa["MH000005"]
+    nims = list(data_mahasiswa)
+
+    terbesar = sorted(nims, key=lambda nim: -data_mahasiswa[nim]['modul_4'])[:20]
+    assert dm_lebar.ranking(data_mahasiswa, 'modul_4', 20) == terbesar
+    rata_rata = sorted(nims, key=lambda nim: sum(data_mahasiswa[nim][kolom] for kolom in dm_lebar.KOLOM_NILAI))
+    assert dm_lebar.ranking(data_mahasiswa, 'rata_rata', 20, terbawah=True) == rata_rata[:20]
+
+    for teks in ["modul_4 > 500", "modul_4 = 256", "modul_4 <= 255 and modul_1 >= 50"]:
+        node = dm_lebar.parse_query(teks)
+        harapan = [nim for nim in nims if dm_lebar.uji_record(data_mahasiswa, nim, node)]
+        assert sorted(dm_lebar.jalankan_query(data_mahasiswa, node)) == sorted(harapan)
+        assert dm_lebar.pindai_store(data_mahasiswa, node) == harapan
+
+    inkremental = data_mahasiswa.statistik
+    transaksi = dm_lebar.Transaksi(data_mahasiswa)
+    transaksi.ubah("MH000001", 'modul_4', 777)
+    transaksi.commit()
+    statistik = dm_lebar.StatistikMahasiswa(data_mahasiswa)
+    assert inkremental.grup == statistik.grup
+    histogram = [0] * 1001
+    for nim in data_mahasiswa:
+        histogram[data_mahasiswa[nim]['modul_4']] += 1
+    assert [sum(grup['modul_4'][i] for grup in statistik.grup['jadwal'].values()) for i in range(1001)] == histogram
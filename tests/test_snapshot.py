@@ -0,0 +1,63 @@
+import pytest
+
+from conftest import isi, isi_store
+import data_nilai_mahasiswa as dm
+
+
+@pytest.fixture
+def path_snapshot(tmp_path):
+    return str(tmp_path / "snapshot.bin")
+
+
+def test_snapshot_bolak_balik(store, path_snapshot):
+    dm.tulis_snapshot(path_snapshot, store, 7)
+    dibuka, generasi = dm.buka_snapshot(path_snapshot)
+    assert generasi == 7
+    assert dibuka.sumber == path_snapshot
+    assert isinstance(dibuka.kolom['modul_1'], memoryview)
+    assert list(dibuka) == list(store)
+    assert isi(dibuka) == isi(store)
+
+
+def test_snapshot_melewati_slot_kosong(path_snapshot):
+    data_mahasiswa = isi_store(100)
+    for i in range(0, 100, 4):
+        del data_mahasiswa[f"MH{i:06d}"]
+    dm.tulis_snapshot(path_snapshot, data_mahasiswa, 0)
+    dibuka, _ = dm.buka_snapshot(path_snapshot)
+    assert len(dibuka) == 75
+    assert isi(dibuka) == isi(data_mahasiswa)
+    assert "MH000000" not in dibuka
+
+
+def test_mutasi_setelah_dibuka_tidak_menyentuh_file(store, path_snapshot):
+    dm.tulis_snapshot(path_snapshot, store, 0)
+    dibuka, _ = dm.buka_snapshot(path_snapshot)
+    acuan = isi(store)
+
+    dibuka["MH000001"]["modul_2"] = acuan["MH000001"]["modul_2"] = 100
+    dibuka["MH000002"] = acuan["MH000002"] = dict(acuan["MH000002"], nama="Nama Baru Sekali")
+    del dibuka["MH000003"], acuan["MH000003"]
+    dibuka["MH900000"] = acuan["MH900000"] = dict(acuan["MH000004"])
+    assert isi(dibuka) == acuan
+
+    ulang, _ = dm.buka_snapshot(path_snapshot)
+    assert isi(ulang) == isi(store)
+
+
+def test_lookup_nim_tanpa_membangun_dict(store, path_snapshot):
+    dm.tulis_snapshot(path_snapshot, store, 0)
+    dibuka, _ = dm.buka_snapshot(path_snapshot)
+    assert isinstance(dibuka.posisi, dm.PosisiNim)
+    assert dibuka["MH000150"]["nama"] == store["MH000150"]["nama"]
+    assert "MH000150" in dibuka and "MH000150X" not in dibuka
+    dibuka.muat_posisi()
+    assert isinstance(dibuka.posisi, dict)
+    assert isi(dibuka) == isi(store)
+
+
+def test_file_bukan_snapshot_ditolak(path_snapshot):
+    with open(path_snapshot, "wb") as f:
+        f.write(b"BUKANSNAP" + bytes(64))
+    with pytest.raises(ValueError, match="bukan file snapshot"):
+        dm.buka_snapshot(path_snapshot)
@@ -0,0 +1,49 @@
+import random
+
+from conftest import buat_record, isi_store
+import data_nilai_mahasiswa as dm
+
+
+def test_ringkasan_sama_dengan_hitungan_langsung(store):
+    rows = store.statistik.ringkasan('program')
+    for program in dm.PROGRAM_LIST:
+        skor = [store[nim]['modul_2'] for nim in store if store[nim]['program'] == program]
+        if not skor:
+            continue
+        row = next(row for row in rows if row[0] == program and row[1] == "Modul 2")
+        assert row[2:7] == [len(skor), round(sum(skor) / len(skor), 2), min(skor), max(skor),
+                            round(sum(nilai >= dm.NILAI_LULUS for nilai in skor) * 100 / len(skor), 1)]
+        assert row[7:] == [sum(awal <= nilai <= akhir for nilai in skor) for awal, akhir in dm.RENTANG_DISTRIBUSI]
+
+
+def test_statistik_inkremental_sama_dengan_bangun_ulang():
+    rng = random.Random(5)
+    data_mahasiswa = isi_store(400)
+    statistik = data_mahasiswa.statistik
+    for _ in range(300):
+        nim = f"MH{rng.randrange(450):06d}"
+        aksi = rng.random()
+        if nim in data_mahasiswa and aksi < 0.3:
+            del data_mahasiswa[nim]
+        elif nim in data_mahasiswa and aksi < 0.7:
+            kolom = rng.choice(dm.KOLOM_NILAI + ['program', 'angkatan', 'jadwal'])
+            data_mahasiswa[nim][kolom] = buat_record(rng)[kolom]
+        else:
+            data_mahasiswa[nim] = buat_record(rng)
+    transaksi = dm.Transaksi(data_mahasiswa)
+    for nim in list(data_mahasiswa)[:20]:
+        transaksi.hapus(nim)
+    transaksi.commit()
+    data_mahasiswa.undo()
+
+    baru = dm.StatistikMahasiswa(data_mahasiswa)
+    for dimensi in dm.DIMENSI_STATISTIK:
+        assert statistik.ringkasan(dimensi) == baru.ringkasan(dimensi)
+
+
+def test_grup_kosong_tidak_ditampilkan():
+    data_mahasiswa = isi_store(50)
+    data_mahasiswa.statistik
+    for nim in [nim for nim in data_mahasiswa if data_mahasiswa[nim]['program'] == "Digital Marketing"]:
+        del data_mahasiswa[nim]
+    assert all(row[0] != "Digital Marketing" for row in data_mahasiswa.statistik.ringkasan('program'))
@@ -0,0 +1,64 @@
+import random
+
+import pytest
+
+from conftest import buat_record, isi, isi_store
+import data_nilai_mahasiswa as dm
+
+
+def test_store_berperilaku_seperti_dict(roster):
+    data_mahasiswa = dm.DataMahasiswa(roster)
+    assert len(data_mahasiswa) == len(roster)
+    assert list(data_mahasiswa) == list(roster)
+    assert isi(data_mahasiswa) == roster
+    assert "MH999999" not in data_mahasiswa
+    with pytest.raises(KeyError):
+        data_mahasiswa["MH999999"]
+
+
+def test_kolom_bertipe_dan_kode_kategori(store):
+    for kolom in dm.KOLOM_ARRAY:
+        assert store.kolom[kolom].typecode == dm.SKEMA_KOLOM[kolom].typecode
+        assert len(store.kolom[kolom]) == len(store.nims)
+    program = store.kode['program']
+    for nim in list(store)[:20]:
+        assert program[store.kolom['program'][store.posisi[nim]]] == store[nim]['program']
+
+
+def test_ubah_dan_hapus_mengikuti_acuan():
+    rng = random.Random(3)
+    data_mahasiswa = isi_store(200)
+    acuan = isi(data_mahasiswa)
+    for i in range(600):
+        nim = f"MH{rng.randrange(300):06d}"
+        aksi = rng.random()
+        if aksi < 0.4 and nim in acuan:
+            del data_mahasiswa[nim]
+            del acuan[nim]
+        elif aksi < 0.7 and nim in acuan:
+            kolom = rng.choice(dm.KOLOM_NILAI)
+            data_mahasiswa[nim][kolom] = acuan[nim][kolom] = rng.randint(0, 100)
+        else:
+            acuan[nim] = buat_record(rng)
+            data_mahasiswa[nim] = acuan[nim]
+    assert isi(data_mahasiswa) == acuan
+    assert len(data_mahasiswa) == len(acuan)
+
+
+def test_pemadatan_slot_kosong_menjaga_urutan():
+    data_mahasiswa = isi_store(3000)
+    dihapus = [f"MH{i:06d}" for i in range(0, 3000, 3)] + [f"MH{i:06d}" for i in range(1, 3000, 3)]
+    for nim in dihapus:
+        del data_mahasiswa[nim]
+    sisa = [f"MH{i:06d}" for i in range(2, 3000, 3)]
+    assert list(data_mahasiswa) == sisa
+    assert len(data_mahasiswa.nims) < 3000
+    assert [data_mahasiswa.posisi[nim] for nim in sisa] == sorted(data_mahasiswa.posisi[nim] for nim in sisa)
+
+
+def test_nilai_di_luar_tipe_kolom_ditolak(store):
+    sebelum = isi(store)
+    with pytest.raises((OverflowError, TypeError, ValueError)):
+        store["MH999999"] = dict(store["MH000000"], modul_1=-1)
+    assert isi(store) == sebelum
+    assert len(store.nims) == len(store.kolom['modul_1'])
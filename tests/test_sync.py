@@ -0,0 +1,92 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from conftest import isi, isi_store
+import data_nilai_mahasiswa as dm
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def pasangan():
+    lokal = isi_store(200)
+    remote = isi_store(200)
+    del lokal["MH000001"]
+    del remote["MH000002"]
+    remote["MH000003"] = dict(remote["MH000003"], modul_1=(remote["MH000003"]["modul_1"] + 1) % 101)
+    return lokal, remote
+
+
+@pytest.mark.parametrize("arah", ["tarik", "dorong", "gabung"])
+def test_sinkronkan_lokal(arah):
+    lokal, remote = pasangan()
+    laporan = dm.sinkronkan(lokal, dm.PeerLokal(remote), arah)
+    assert laporan["berbeda"] == 3
+    assert [konflik[:2] for konflik in laporan["konflik"]] == [["MH000003", "modul_1"]]
+    if arah == "gabung":
+        # Konflik hanya dilaporkan, record lain saling dilengkapi.
+        assert isi(lokal).keys() == isi(remote).keys()
+        assert lokal["MH000003"]["modul_1"] != remote["MH000003"]["modul_1"]
+    else:
+        assert isi(lokal) == isi(remote)
+        assert dm.sinkronkan(lokal, dm.PeerLokal(remote), arah)["berbeda"] == 0
+
+
+def test_terapkan_menolak_batch_tidak_valid(store):
+    sebelum = isi(store)
+    kode = {kolom: list(nilai) for kolom, nilai in store.kode.items()}
+    perubahan = {
+        "MH999998": dict(store["MH000000"]),
+        "MH999999": dict(store["MH000000"], program="Program Palsu"),
+    }
+    with pytest.raises(ValueError):
+        dm.PeerLokal(store).terapkan(perubahan)
+    with pytest.raises(ValueError):
+        dm.PeerLokal(store).terapkan({"mh000010": dict(store["MH000000"])})
+    assert isi(store) == sebelum
+    assert {kolom: list(nilai) for kolom, nilai in store.kode.items()} == kode
+
+
+def test_tarik_record_tidak_valid_tidak_diterapkan():
+    lokal, remote = pasangan()
+    sebelum = isi(lokal)
+
+    class PeerRusak(dm.PeerLokal):
+        def ambil(self, nims):
+            return {nim: dict(data, modul_2=1000) for nim, data in super().ambil(nims).items()}
+
+    with pytest.raises(ValueError):
+        dm.sinkronkan(lokal, PeerRusak(remote), "tarik")
+    assert isi(lokal) == sebelum
+
+
+def test_sinkronkan_dua_proses(tmp_path):
+    env = dict(os.environ, DATA_MAHASISWA_DIR=str(tmp_path), DATA_MAHASISWA_ANGKATAN_PANAS="0")
+    server = subprocess.Popen([sys.executable, os.path.join(ROOT, "server_mahasiswa.py"), "--host", "127.0.0.1",
+                               "--port", "0"], env=env, cwd=ROOT, stdout=subprocess.PIPE, text=True)
+    try:
+        baris = server.stdout.readline()
+        assert baris.startswith("Server berjalan di"), baris
+        host, port = baris.split()[-1].rsplit(":", 1)
+
+        lokal = isi_store(150)
+        peer = dm.PeerRemote(host, int(port))
+        try:
+            laporan = dm.sinkronkan(lokal, peer, "dorong")
+            assert laporan["berbeda"] > 0
+            assert dm.sinkronkan(lokal, peer, "dorong")["berbeda"] == 0
+            assert peer.ambil(["MH000007"])["MH000007"] == dict(lokal["MH000007"])
+
+            with pytest.raises(ValueError, match="menolak"):
+                peer.terapkan({"MH000007": dict(lokal["MH000007"], gender="X")})
+            with pytest.raises(ValueError, match="menolak"):
+                peer._minta("hapus_semua")
+            assert peer.ambil(["MH000007"])["MH000007"] == dict(lokal["MH000007"])
+        finally:
+            peer.tutup()
+    finally:
+        server.terminate()
+        server.wait(10)
+        server.stdout.close()
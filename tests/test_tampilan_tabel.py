@@ -0,0 +1,52 @@
+import contextlib
+import io
+
+from tabulate import tabulate
+
+import data_nilai_mahasiswa as dm
+from conftest import isi_store
+
+
+def tabel_tabulate(rows):
+    return tabulate(rows, headers=dm.HEADERS, tablefmt="grid", colalign=['center'] * len(dm.HEADERS))
+
+
+def test_satu_halaman_sama_dengan_tabulate():
+    for jumlah in (1, 4, dm.UKURAN_HALAMAN):
+        data_mahasiswa = isi_store(jumlah, seed=jumlah)
+        rows = dm.generate_rows(data_mahasiswa, list(data_mahasiswa))
+        keluaran = io.StringIO()
+        with contextlib.redirect_stdout(keluaran):
+            dm.tampilkan_data(iter(rows))
+        tabel = tabel_tabulate(rows)
+        assert tabel in keluaran.getvalue()
+        assert "===== Data Mahasiswa =====".center(len(tabel.splitlines()[0])) in keluaran.getvalue()
+
+
+def test_format_grid_sama_dengan_tabulate():
+    data_mahasiswa = isi_store(50, seed=3)
+    rows = dm.generate_rows(data_mahasiswa, list(data_mahasiswa))
+    assert dm.format_grid(rows, dm.lebar_header()) == tabel_tabulate(rows)
+
+
+def test_halaman_dinavigasi(monkeypatch):
+    data_mahasiswa = isi_store(45)
+    jawaban = iter(['n', 'n', 'n', 'p', 'x', 'q'])
+    monkeypatch.setattr('builtins.input', lambda prompt="": next(jawaban))
+    keluaran = io.StringIO()
+    with contextlib.redirect_stdout(keluaran):
+        dm.tampilkan_data(dm.iter_rows(data_mahasiswa, list(data_mahasiswa)))
+    teks = keluaran.getvalue()
+    assert "Halaman 1" in teks
+    assert "Halaman 3 dari 3" in teks
+    assert "Sudah di halaman terakhir." in teks
+    assert "Pilihan tidak valid!" in teks
+    lebar = {len(baris) for baris in teks.splitlines() if baris.startswith("+")}
+    assert len(lebar) == 1
+
+
+def test_data_kosong():
+    keluaran = io.StringIO()
+    with contextlib.redirect_stdout(keluaran):
+        dm.tampilkan_data(iter([]))
+    assert "Data tidak ditemukan" in keluaran.getvalue()
@@ -0,0 +1,75 @@
+import pytest
+
+import data_nilai_mahasiswa as dm
+from conftest import isi, isi_store
+
+
+def test_commit_menerapkan_semua_perubahan():
+    data_mahasiswa = isi_store(20)
+    transaksi = dm.Transaksi(data_mahasiswa)
+    transaksi.ubah("MH000001", "modul_1", 99)
+    transaksi.hapus("MH000002")
+    transaksi.tambah("MH900000", dict(data_mahasiswa["MH000003"]))
+    assert "MH900000" not in data_mahasiswa
+    assert transaksi.commit() == 3
+    assert data_mahasiswa["MH000001"]["modul_1"] == 99
+    assert "MH000002" not in data_mahasiswa
+    assert data_mahasiswa["MH900000"]["nama"] == data_mahasiswa["MH000003"]["nama"]
+
+
+def test_batch_gagal_dikembalikan_utuh():
+    data_mahasiswa = isi_store(20)
+    sebelum = isi(data_mahasiswa)
+    rusak = dict(data_mahasiswa["MH000005"], modul_1=300)
+    with pytest.raises((OverflowError, ValueError)):
+        data_mahasiswa.terapkan_batch({"MH000001": None, "MH900001": dict(rusak, modul_1=50), "MH000005": rusak})
+    assert isi(data_mahasiswa) == sebelum
+    assert not data_mahasiswa.jurnal
+
+
+def test_undo_membatalkan_batch_terakhir():
+    data_mahasiswa = isi_store(20)
+    sebelum = isi(data_mahasiswa)
+    dm.api_hapus(data_mahasiswa, ["MH000001", "mh000002"])
+    dm.api_ubah(data_mahasiswa, "MH000003", {"modul_2": "12"})
+    assert data_mahasiswa.undo() == 1
+    assert data_mahasiswa.undo() == 2
+    assert isi(data_mahasiswa) == sebelum
+    assert data_mahasiswa.undo() == 0
+
+
+def test_transaksi_menolak_nim_tidak_ada():
+    data_mahasiswa = isi_store(5)
+    transaksi = dm.Transaksi(data_mahasiswa)
+    with pytest.raises(ValueError):
+        transaksi.hapus("MH999999")
+    with pytest.raises(ValueError):
+        transaksi.tambah("MH000001", dict(data_mahasiswa["MH000001"]))
+    with pytest.raises(ValueError):
+        transaksi.ubah("MH000001", "tidak_ada", 1)
+
+
+@pytest.fixture
+def store_snapshot(tmp_path):
+    penyimpanan = dm.PenyimpananMahasiswa(str(tmp_path))
+    penyimpanan.muat(dm.DATA_AWAL).pendengar.remove(penyimpanan.catat)
+    penyimpanan.tutup()
+    penyimpanan = dm.PenyimpananMahasiswa(str(tmp_path))
+    data_mahasiswa = penyimpanan.muat()
+    assert isinstance(data_mahasiswa.kolom['modul_1'], memoryview)
+    yield data_mahasiswa
+    penyimpanan.tutup()
+
+
+def test_nilai_di_luar_rentang_pada_kolom_mmap(store_snapshot):
+    data_mahasiswa = store_snapshot
+    data_mahasiswa.indeks
+    sebelum = dict(data_mahasiswa["MH002"])
+    with pytest.raises(ValueError):
+        data_mahasiswa["MH002"] = dict(sebelum, modul_1=300)
+    with pytest.raises(ValueError):
+        data_mahasiswa.ubah("MH002", "modul_2", 300)
+    assert dict(data_mahasiswa["MH002"]) == sebelum
+    assert "MH002" in data_mahasiswa.cari("gender", dm.normalisasi("Laki - Laki"))
+    assert "MH002" in data_mahasiswa.cari("program", dm.normalisasi(sebelum["program"]))
+    assert "MH002" in [nim for nim, _ in data_mahasiswa.cari_nama("budi")]